@@ -74,7 +74,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',  # DEBE estar PRIMERO
     'whitenoise.middleware.WhiteNoiseMiddleware',     # SEGUNDO (archivos estáticos)
-    'corsheaders.middleware.CorsMiddleware',          # TERCERO (CORS)
+    'core.middleware.CompresionMiddleware',           # Antes de todo lo que lea o modifique el cuerpo
+    'corsheaders.middleware.CorsMiddleware',          # CORS
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -217,9 +218,9 @@ REST_FRAMEWORK = {
     # Schema para documentación automática (Swagger/OpenAPI)
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 
-    # Autenticación: JWT (primario) + Session (para browsable API)
+    # Autenticación: JWT (primario, carga usuario y rol en una consulta) + Session (para browsable API)
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.JWTAuthenticationConRol',
         #'rest_framework.authentication.SessionAuthentication',
     ],
 
@@ -228,8 +229,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
 
-    # Paginación: 20 items por página
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Paginación: 20 items por página (el cliente puede pedir hasta API_MAX_PAGE_SIZE con ?page_size=)
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.PaginacionEstandar',
     'PAGE_SIZE': 20,
 
     # Filtros: Búsqueda y ordenamiento
@@ -239,6 +240,80 @@ REST_FRAMEWORK = {
     ],
 }
 
+# ==============================================================================
+# PAGINACIÓN
+# ==============================================================================
+
+# Máximo de filas por página que un cliente puede pedir con ?page_size=
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '1000'))
+
+# Filas estimadas (pg_class.reltuples) a partir de las cuales los listados sin
+# filtros informan un conteo aproximado en lugar de ejecutar COUNT(*)
+API_CONTEO_ESTIMADO_MINIMO = int(os.environ.get('API_CONTEO_ESTIMADO_MINIMO', '100000'))
+
+# ==============================================================================
+# CACHÉ
+# ==============================================================================
+
+# Con REDIS_URL la caché es compartida por todos los workers de gunicorn
+# (las invalidaciones se ven de inmediato en todos). Sin REDIS_URL se usa
+# memoria local de cada proceso. Las marcas de cambio (core.versiones) viven en
+# la base de datos, así que catálogos, ETags y datos derivados se mantienen al
+# día en todos los workers en ambos casos.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sca-hospital',
+        }
+    }
+
+# Segundos que se guarda el resumen de los dashboards (/api/dashboard/)
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', '30'))
+
+# Vida máxima (segundos) de la foto de inventario por ubicación usada al escanear
+# códigos LOC-. Se invalida al crear, editar, movilizar o eliminar activos.
+INVENTARIO_UBICACION_CACHE_TTL = int(os.environ.get('INVENTARIO_UBICACION_CACHE_TTL', '300'))
+
+# Vida máxima (segundos) del perfil en caché de cada usuario (autenticación JWT y
+# /api/usuarios/me/). Se invalida al guardar o eliminar el usuario y al editar roles
+# (Usuario.objects.update() debe llamar a core.perfil.invalidar_perfil). Solo se
+# usa con REDIS_URL, y entonces un perfil vigente no consulta la base. Con caché
+# local no hay perfil: el usuario y su rol se leen en una consulta por petición.
+PERFIL_USUARIO_CACHE_TTL = int(os.environ.get('PERFIL_USUARIO_CACHE_TTL', '300'))
+
+# ==============================================================================
+# POOL DE CÓDIGOS (INV- / LOC-)
+# ==============================================================================
+
+# Activo.save() y Ubicacion.save() toman su código de un pool pregenerado
+# (core.codigos). Al quedar menos de CODIGOS_POOL_UMBRAL disponibles se agregan
+# CODIGOS_POOL_RECARGA; el nivel se revisa como máximo cada CODIGOS_POOL_INTERVALO
+# segundos. Para llenarlo por adelantado: python manage.py llenar_pool_codigos
+# En producción conviene recargarlo con un cron o worker
+# (python manage.py llenar_pool_codigos --si-hace-falta) y desactivar la recarga
+# dentro de las peticiones con CODIGOS_POOL_RECARGA_EN_PETICION=False.
+CODIGOS_POOL_UMBRAL = int(os.environ.get('CODIGOS_POOL_UMBRAL', '100'))
+CODIGOS_POOL_RECARGA = int(os.environ.get('CODIGOS_POOL_RECARGA', '500'))
+CODIGOS_POOL_INTERVALO = int(os.environ.get('CODIGOS_POOL_INTERVALO', '60'))
+CODIGOS_POOL_RECARGA_EN_PETICION = os.environ.get('CODIGOS_POOL_RECARGA_EN_PETICION', 'True') == 'True'
+
+# ==============================================================================
+# COMPRESIÓN
+# ==============================================================================
+
+# Respuestas de texto desde este tamaño (bytes) se comprimen con gzip, o con
+# brotli si el paquete `brotli` está instalado (core.middleware.CompresionMiddleware).
+# Las exportaciones en streaming se comprimen siempre, bloque a bloque.
+COMPRESION_TAMANO_MINIMO = int(os.environ.get('COMPRESION_TAMANO_MINIMO', '1024'))
+
 # ==============================================================================
 # JWT CONFIGURATION (Simple JWT)
 # ==============================================================================
@@ -302,4 +377,8 @@ SPECTACULAR_SETTINGS = {
             }
         }
     ],
-}
\ No newline at end of file
+}
+
+# Carpeta del esquema OpenAPI pregenerado (python manage.py generar_esquema).
+# /api/schema/ lo sirve desde ahí y lo regenera si falta o si cambió el código.
+OPENAPI_SCHEMA_DIR = os.environ.get('OPENAPI_SCHEMA_DIR', os.path.join(BASE_DIR, 'openapi'))
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Alta de activos en lote para el SCA Hospital.
+
+Cada activo nuevo era un POST aparte: una entrega de 500
+monitores costaba 500 peticiones. registrar_activos() crea todo el lote en
+una transacción:
+1. Códigos de inventario para todo el lote (del pool, o del contador en una consulta)
+2. bulk_create de los activos (core.codigos.crear_con_codigos)
+
+La validación (filas, numero_serie único, ubicaciones) la hace antes
+ActivoLoteInputSerializer con una consulta por regla, no por fila.
+
+bulk_create() no dispara señales: las cachés (marca de cambio, dashboard y
+fotos de inventario de las ubicaciones) se actualizan con
+core.signals.notificar_cambio_masivo().
+
+Uso:
+    activos = registrar_activos(serializer.validated_data['activos'])
+"""
+
+from django.db import transaction
+
+from .codigos import crear_con_codigos, tomar_codigos_inventario
+from .models import Activo
+from .signals import notificar_cambio_masivo
+
+
+def registrar_activos(filas):
+    """
+    Crea los activos del lote en una sola transacción.
+
+    Args:
+        filas (list): Filas validadas por ActivoLoteSerializer
+
+    Returns:
+        list: Instancias de Activo creadas (con ID y código), en el orden de las filas
+    """
+    with transaction.atomic():
+        activos = crear_con_codigos(
+            Activo, [Activo(**fila) for fila in filas], 'codigo_inventario', tomar_codigos_inventario
+        )
+        notificar_cambio_masivo(Activo, ids_ubicacion={activo.ubicacion_actual_id for activo in activos})
+    return activos
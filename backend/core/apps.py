@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Registrar señales (invalidación de cachés)
+        from . import signals  # noqa: F401
+
+        # Cada vista del router debe tener entrada en POLITICA_ACCESO
+        from .permissions import comprobar_politica_vistas
+        checks.register(comprobar_politica_vistas, checks.Tags.security)
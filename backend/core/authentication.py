@@ -0,0 +1,64 @@
+"""
+Autenticación JWT para la API REST del Sistema de Control de Activos (SCA) Hospital.
+
+JWTAuthentication de simplejwt carga el Usuario sin su rol, y todos los
+permisos de core.permissions leen request.user.rol.nombre_rol: cada petición
+pagaba dos consultas (usuario + rol). Esta clase toma el usuario y su rol del
+perfil en caché (core.perfil, solo con caché compartida); si no está los
+carga en una consulta (JOIN con select_related).
+
+Configuración (config/settings.py):
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = [
+        'core.authentication.JWTAuthenticationConRol',
+    ]
+"""
+
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .perfil import obtener_usuario_con_perfil
+
+
+class JWTAuthenticationConRol(JWTAuthentication):
+    """
+    JWTAuthentication que obtiene el usuario junto con su rol desde la caché
+    (o en una consulta si no está).
+
+    Mantiene las mismas validaciones que simplejwt (usuario inexistente,
+    inactivo o con contraseña cambiada).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        # USER_ID_FIELD es 'id' (config/settings.py): el perfil se busca por clave primaria
+        user, perfil = obtener_usuario_con_perfil(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            huella_password = (
+                perfil['huella_password'] if perfil is not None else get_md5_hash_password(user.password)
+            )
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != huella_password:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class JWTAuthenticationConRolScheme(SimpleJWTScheme):
+    """Documenta JWTAuthenticationConRol en OpenAPI igual que JWTAuthentication (Bearer JWT)."""
+
+    target_class = 'core.authentication.JWTAuthenticationConRol'
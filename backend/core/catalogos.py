@@ -0,0 +1,91 @@
+"""
+Caché en memoria de los catálogos maestros (Rol, Departamento, TipoEquipo, EstadoActivo).
+
+Estas tablas casi nunca cambian, pero todas las vistas del frontend las cargan
+y cada alta o edición de activos las consulta para validar los IDs. Cada worker
+guarda en memoria las filas de cada catálogo junto con el número de versión con
+que las leyó; la versión vigente es la marca de cambio del modelo
+(core.versiones), que se actualiza al guardar o eliminar un registro.
+
+Características:
+- Cada lectura compara la versión local con la de la base de datos (una
+  consulta por petición, compartida con las demás marcas que se lean)
+- Si la versión cambió, el catálogo se recarga con una sola consulta
+- Listados, detalle y validación de IDs (PrimaryKeyRelatedField) sin leer las filas
+- Todos los workers de gunicorn ven el cambio en su siguiente petición, con o
+  sin REDIS_URL
+
+Uso:
+    catalogo = obtener_catalogo(TipoEquipo)
+    catalogo.instancias        # lista en el orden de Meta.ordering
+    catalogo.por_pk[3]         # instancia con ID 3
+"""
+
+import threading
+
+from .models import Rol, Departamento, TipoEquipo, EstadoActivo
+from .versiones import version_modelo
+
+
+MODELOS_CATALOGO = (Rol, Departamento, TipoEquipo, EstadoActivo)
+
+# Catálogos cargados por este proceso: modelo -> Catalogo
+_catalogos = {}
+_bloqueo = threading.Lock()
+
+
+class Catalogo:
+    """
+    Contenido de un catálogo leído en una versión dada.
+
+    Atributos:
+    - version: Versión compartida vigente al momento de la lectura
+    - instancias: Lista de instancias en el orden por defecto del modelo
+    - por_pk: Diccionario ID -> instancia
+    """
+
+    def __init__(self, version, instancias):
+        self.version = version
+        self.instancias = instancias
+        self.por_pk = {instancia.pk: instancia for instancia in instancias}
+        self._representaciones = {}
+
+    def representacion(self, serializer_class):
+        """
+        Retorna (lista, por_pk) con los datos serializados por serializer_class.
+
+        Se calcula una sola vez por versión; las peticiones siguientes reutilizan
+        los mismos diccionarios.
+        """
+        datos = self._representaciones.get(serializer_class)
+        if datos is None:
+            lista = list(serializer_class(self.instancias, many=True).data)
+            datos = (lista, {instancia.pk: fila for instancia, fila in zip(self.instancias, lista)})
+            self._representaciones[serializer_class] = datos
+        return datos
+
+
+def obtener_catalogo(modelo):
+    """
+    Retorna el Catalogo vigente del modelo, recargándolo si la versión cambió.
+
+    Args:
+        modelo: Uno de MODELOS_CATALOGO
+
+    Returns:
+        Catalogo
+    """
+    version = version_modelo(modelo)
+    catalogo = _catalogos.get(modelo)
+    if catalogo is not None and catalogo.version == version:
+        return catalogo
+
+    with _bloqueo:
+        catalogo = _catalogos.get(modelo)
+        if catalogo is None or catalogo.version != version:
+            # La versión se leyó antes que las filas: si alguien escribe entre
+            # medio, la próxima lectura verá una versión nueva y recargará.
+            catalogo = Catalogo(version, list(modelo.objects.all()))
+            _catalogos[modelo] = catalogo
+    return catalogo
+
@@ -0,0 +1,358 @@
+"""
+Generación de códigos de inventario (INV-YY-XXXXXX) y de ubicación (LOC-XXXXXX).
+
+Antes cada código era aleatorio (3 bytes) y se verificaba con exists() en un
+bucle de hasta 100 intentos: una consulta extra por candidato, más colisiones
+a medida que crece la tabla y dos guardados simultáneos podían elegir el mismo
+código y fallar con IntegrityError.
+
+Ahora cada código sale de un contador en la base de datos (Tbl_Secuencias_Codigo)
+pasado por una permutación de 24 bits:
+- Reservar N valores cuesta un UPDATE ... RETURNING, sin importar N (altas en lote)
+- El UPDATE bloquea la fila del contador: dos workers nunca reciben el mismo valor
+- La permutación es biyectiva (red de Feistel): valores distintos dan códigos
+  distintos, pero consecutivos no se ven correlativos en las etiquetas
+- Sin consulta previa: el código no puede repetir uno generado por el contador
+
+Los códigos aleatorios antiguos sí pueden coincidir con uno nuevo. Solo en ese
+caso el INSERT falla por la restricción UNIQUE y se reintenta con el valor
+siguiente; como el contador no retrocede, cada código antiguo choca a lo sumo
+una vez.
+
+Pool de códigos (Tbl_Pool_Codigos):
+Códigos ya generados y verificados contra los antiguos, listos para usar.
+Activo.save() y Ubicacion.save() toman el suyo con SELECT ... FOR UPDATE SKIP
+LOCKED (dos guardados simultáneos nunca esperan por la misma fila). Si está
+vacío se generan directamente desde el contador. Se llena por adelantado con
+`python manage.py llenar_pool_codigos` (ej: antes de imprimir etiquetas).
+
+Recarga:
+- Programada (recomendada en producción): cron o worker con
+  `python manage.py llenar_pool_codigos --si-hace-falta` y
+  CODIGOS_POOL_RECARGA_EN_PETICION=False; las peticiones nunca recargan
+- En la petición (por defecto): al confirmarse la transacción, si el pool
+  quedó bajo el umbral. Si la recarga falla se registra en el log y el
+  guardado, ya confirmado, responde igual
+
+Configuración (config/settings.py):
+- CODIGOS_POOL_UMBRAL: códigos disponibles bajo los cuales se recarga
+- CODIGOS_POOL_RECARGA: códigos que agrega cada recarga
+- CODIGOS_POOL_INTERVALO: segundos mínimos entre verificaciones del nivel en las peticiones
+- CODIGOS_POOL_RECARGA_EN_PETICION: False si la recarga la hace un cron o worker
+
+Uso:
+    codigos = generar_codigos_inventario(500)
+    codigo, = tomar_codigos_inventario(1)
+    guardar_con_codigo(activo, 'codigo_inventario', tomar_codigos_inventario, guardar)
+    crear_con_codigos(Activo, activos, 'codigo_inventario', tomar_codigos_inventario)
+    llenar_pool(SECUENCIA_UBICACION, 5000)
+"""
+
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+TABLA_SECUENCIAS = 'Tbl_Secuencias_Codigo'
+
+SECUENCIA_INVENTARIO = 'codigo_inventario'
+SECUENCIA_UBICACION = 'codigo_qr'
+
+# 6 caracteres hexadecimales = 24 bits (16.777.216 códigos por secuencia)
+BITS_CODIGO = 24
+MAX_VALOR_SECUENCIA = (1 << BITS_CODIGO) - 1
+_MASCARA_MITAD = (1 << (BITS_CODIGO // 2)) - 1
+
+# Claves de las rondas de la permutación. NO CAMBIAR: cambiarían los códigos
+# que generan los valores futuros y podrían repetir etiquetas ya impresas.
+CLAVES_PERMUTACION = {
+    SECUENCIA_INVENTARIO: (0x5A3, 0xC71, 0x2E9, 0x94D),
+    SECUENCIA_UBICACION: (0x3B6, 0x8D2, 0xF14, 0x61A),
+}
+
+# Filas por INSERT / consulta al llenar el pool
+TAMANO_LOTE_POOL = 1000
+
+# Reintentos por choques con códigos aleatorios antiguos
+MAX_INTENTOS_CODIGO = 10
+
+
+def permutar(valor, claves):
+    """
+    Permutación de 24 bits: red de Feistel de 4 rondas sobre mitades de 12 bits.
+
+    Cada ronda es invertible sea cual sea la función de mezcla, por lo que el
+    resultado es una biyección de [0, 2^24) en sí mismo.
+    """
+    izquierda, derecha = valor >> (BITS_CODIGO // 2), valor & _MASCARA_MITAD
+    for clave in claves:
+        mezcla = ((derecha * 0x9E5 + clave) ^ (derecha >> 3)) & _MASCARA_MITAD
+        izquierda, derecha = derecha, izquierda ^ mezcla
+    return (izquierda << (BITS_CODIGO // 2)) | derecha
+
+
+def reservar_valores(secuencia, cantidad):
+    """
+    Reserva `cantidad` valores consecutivos del contador con una sola consulta.
+
+    Dentro de una transacción la fila del contador queda bloqueada hasta el
+    COMMIT, así que otro worker que reserve a la vez espera y recibe los
+    valores siguientes.
+
+    Returns:
+        range: Valores reservados
+    """
+    tabla = connection.ops.quote_name(TABLA_SECUENCIAS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {tabla} SET ultimo_valor = ultimo_valor + %s WHERE nombre = %s RETURNING ultimo_valor',
+            [cantidad, secuencia]
+        )
+        fila = cursor.fetchone()
+
+    if fila is None:
+        # El contador se crea en la migración 0005; si falta (ej: tabla vaciada) se crea en 0
+        from .models import SecuenciaCodigo
+        SecuenciaCodigo.objects.get_or_create(nombre=secuencia)
+        return reservar_valores(secuencia, cantidad)
+
+    ultimo = fila[0]
+    if ultimo > MAX_VALOR_SECUENCIA:
+        raise ValueError(
+            f"Se agotaron los códigos de la secuencia '{secuencia}' ({MAX_VALOR_SECUENCIA + 1} en total). "
+            "Contacte al administrador del sistema."
+        )
+    return range(ultimo - cantidad + 1, ultimo + 1)
+
+
+def generar_codigos_inventario(cantidad):
+    """Códigos INV-{YY}-{HEX} nuevos (año de 2 dígitos + 6 caracteres hexadecimales)."""
+    year = datetime.now().strftime('%y')
+    claves = CLAVES_PERMUTACION[SECUENCIA_INVENTARIO]
+    return [
+        f"INV-{year}-{permutar(valor, claves):06X}"
+        for valor in reservar_valores(SECUENCIA_INVENTARIO, cantidad)
+    ]
+
+
+def generar_codigos_ubicacion(cantidad):
+    """Códigos LOC-{HEX} nuevos (6 caracteres hexadecimales)."""
+    claves = CLAVES_PERMUTACION[SECUENCIA_UBICACION]
+    return [
+        f"LOC-{permutar(valor, claves):06X}"
+        for valor in reservar_valores(SECUENCIA_UBICACION, cantidad)
+    ]
+
+
+# ==============================================================================
+# POOL DE CÓDIGOS
+# ==============================================================================
+
+GENERADORES = {
+    SECUENCIA_INVENTARIO: generar_codigos_inventario,
+    SECUENCIA_UBICACION: generar_codigos_ubicacion,
+}
+
+
+def prefijo_vigente(secuencia):
+    """Prefijo de los códigos que se entregan hoy (INV- lleva el año en curso)."""
+    if secuencia == SECUENCIA_INVENTARIO:
+        return f"INV-{datetime.now().strftime('%y')}-"
+    return 'LOC-'
+
+
+def _codigos_existentes(secuencia, codigos):
+    """Códigos (de la lista) que ya usa un activo o una ubicación."""
+    from .models import Activo, Ubicacion
+    if secuencia == SECUENCIA_INVENTARIO:
+        modelo, campo = Activo, 'codigo_inventario'
+    else:
+        modelo, campo = Ubicacion, 'codigo_qr'
+    return set(
+        modelo.objects.filter(**{f'{campo}__in': codigos}).values_list(campo, flat=True)
+    )
+
+
+def llenar_pool(secuencia, cantidad):
+    """
+    Agrega `cantidad` códigos nuevos al pool de la secuencia.
+
+    Descarta los que coinciden con códigos antiguos (una consulta por lote) y
+    los INV- de años anteriores que sigan en el pool.
+
+    Returns:
+        int: Códigos agregados
+    """
+    from .models import CodigoPool
+
+    CodigoPool.objects.filter(secuencia=secuencia).exclude(
+        codigo__startswith=prefijo_vigente(secuencia)
+    ).delete()
+
+    agregados = 0
+    while agregados < cantidad:
+        codigos = GENERADORES[secuencia](min(TAMANO_LOTE_POOL, cantidad - agregados))
+        ocupados = _codigos_existentes(secuencia, codigos)
+        CodigoPool.objects.bulk_create([
+            CodigoPool(secuencia=secuencia, codigo=codigo)
+            for codigo in codigos if codigo not in ocupados
+        ])
+        agregados += len(codigos) - len(ocupados)
+    return agregados
+
+
+def codigos_disponibles(secuencia):
+    """Códigos del pool que se pueden usar (los INV- del año en curso)."""
+    from .models import CodigoPool
+
+    return CodigoPool.objects.filter(
+        secuencia=secuencia, codigo__startswith=prefijo_vigente(secuencia)
+    ).count()
+
+
+def recargar_pool_si_hace_falta(secuencia):
+    """
+    Recarga el pool si quedó bajo CODIGOS_POOL_UMBRAL.
+
+    El nivel se consulta a lo sumo una vez cada CODIGOS_POOL_INTERVALO segundos
+    por secuencia (cache.add es atómico: un solo worker verifica y recarga).
+
+    Returns:
+        int: Códigos agregados (0 si no hizo falta o ya se verificó hace poco)
+    """
+    if not cache.add(f'codigos:pool:verificado:{secuencia}', True, settings.CODIGOS_POOL_INTERVALO):
+        return 0
+    if codigos_disponibles(secuencia) >= settings.CODIGOS_POOL_UMBRAL:
+        return 0
+    return llenar_pool(secuencia, settings.CODIGOS_POOL_RECARGA)
+
+
+def _recargar_pool_tras_guardado(secuencia):
+    """
+    Recarga en on_commit: el guardado ya se confirmó, así que un error de la
+    recarga no debe llegar a la respuesta (se registra y la próxima verificación
+    vuelve a intentarlo).
+    """
+    try:
+        recargar_pool_si_hace_falta(secuencia)
+    except Exception:
+        logger.exception('No se pudo recargar el pool de códigos %s', secuencia)
+
+
+def tomar_codigos(secuencia, cantidad):
+    """
+    Toma `cantidad` códigos del pool; los que falten se generan del contador.
+
+    SKIP LOCKED salta las filas que otra transacción está tomando, así que los
+    guardados concurrentes no se bloquean entre sí. Los códigos tomados se
+    borran del pool en la misma transacción (si esta se revierte, vuelven).
+
+    Returns:
+        list: Códigos listos para usar, sin consulta previa de existencia
+    """
+    from .models import CodigoPool
+
+    with transaction.atomic():
+        filas = list(
+            CodigoPool.objects.select_for_update(skip_locked=True)
+            .filter(secuencia=secuencia, codigo__startswith=prefijo_vigente(secuencia))
+            .order_by('id')
+            .values_list('id', 'codigo')[:cantidad]
+        )
+        if filas:
+            CodigoPool.objects.filter(id__in=[id_fila for id_fila, _ in filas]).delete()
+
+    codigos = [codigo for _, codigo in filas]
+    if len(codigos) < cantidad:
+        codigos += GENERADORES[secuencia](cantidad - len(codigos))
+
+    # Al confirmarse la transacción externa (o enseguida, en autocommit):
+    # la recarga no alarga los bloqueos del guardado
+    if settings.CODIGOS_POOL_RECARGA_EN_PETICION:
+        transaction.on_commit(lambda: _recargar_pool_tras_guardado(secuencia))
+    return codigos
+
+
+def tomar_codigos_inventario(cantidad):
+    """Códigos INV-{YY}-{HEX} desde el pool (o el contador si se agotó)."""
+    return tomar_codigos(SECUENCIA_INVENTARIO, cantidad)
+
+
+def tomar_codigos_ubicacion(cantidad):
+    """Códigos LOC-{HEX} desde el pool (o el contador si se agotó)."""
+    return tomar_codigos(SECUENCIA_UBICACION, cantidad)
+
+
+# ==============================================================================
+# GUARDADO CON CÓDIGO
+# ==============================================================================
+
+def guardar_con_codigo(instancia, campo, generar, guardar):
+    """
+    Asigna un código nuevo a la instancia y la guarda.
+
+    Args:
+        instancia: Instancia sin código (se le asigna en `campo`)
+        campo (str): Campo único del código (ej: 'codigo_inventario')
+        generar (callable): tomar_codigos_inventario / tomar_codigos_ubicacion
+        guardar (callable): Guardado real (ej: el save() del modelo base)
+    """
+    modelo = type(instancia)
+    for _ in range(MAX_INTENTOS_CODIGO):
+        setattr(instancia, campo, generar(1)[0])
+        try:
+            # Punto de guardado: si el INSERT falla la transacción externa sigue usable
+            with transaction.atomic():
+                guardar()
+            return
+        except IntegrityError:
+            # Solo se reintenta si chocó el código (con uno aleatorio antiguo)
+            if not modelo._default_manager.filter(**{campo: getattr(instancia, campo)}).exists():
+                setattr(instancia, campo, None)
+                raise
+
+    setattr(instancia, campo, None)
+    raise ValueError(
+        f"No se pudo asignar un código único después de {MAX_INTENTOS_CODIGO} intentos. "
+        "Contacte al administrador del sistema."
+    )
+
+
+def crear_con_codigos(modelo, instancias, campo, generar):
+    """
+    Asigna códigos nuevos a todas las instancias y las inserta con bulk_create.
+
+    Si el INSERT choca con códigos antiguos, una consulta identifica cuáles y
+    solo esas instancias reciben un código nuevo antes de reintentar.
+
+    Returns:
+        list: Instancias creadas (con ID), en el mismo orden
+    """
+    for instancia, codigo in zip(instancias, generar(len(instancias))):
+        setattr(instancia, campo, codigo)
+
+    for _ in range(MAX_INTENTOS_CODIGO):
+        try:
+            with transaction.atomic():
+                return modelo._default_manager.bulk_create(instancias)
+        except IntegrityError:
+            ocupados = set(
+                modelo._default_manager.filter(
+                    **{f'{campo}__in': [getattr(instancia, campo) for instancia in instancias]}
+                ).values_list(campo, flat=True)
+            )
+            if not ocupados:
+                raise
+            chocan = [instancia for instancia in instancias if getattr(instancia, campo) in ocupados]
+            for instancia, codigo in zip(chocan, generar(len(chocan))):
+                setattr(instancia, campo, codigo)
+
+    raise ValueError(
+        f"No se pudieron asignar códigos únicos después de {MAX_INTENTOS_CODIGO} intentos. "
+        "Contacte al administrador del sistema."
+    )
@@ -0,0 +1,103 @@
+"""
+Resumen para los dashboards de inicio (AdminHome, JefeHome, TecnicoHome).
+
+Calcula los totales de activos por estado, tipo y departamento y el volumen
+reciente de movimientos con pocas consultas agrupadas, y guarda el resultado
+en la caché de Django por DASHBOARD_CACHE_TTL segundos.
+
+Características:
+- 4 consultas agregadas (GROUP BY) en lugar de listar filas
+- Caché con TTL corto (config/settings.py: DASHBOARD_CACHE_TTL), ya que los
+  totales de las últimas 24 horas / 7 / 30 días cambian con la hora
+- Se guarda con las marcas de cambio de los modelos que lo forman
+  (core.versiones.obtener_derivado): un cambio confirmado en cualquier worker,
+  incluso mientras otro lo está calculando, hace que se recalcule
+
+Uso:
+    resumen = obtener_resumen_dashboard()
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import Activo, Departamento, EstadoActivo, HistorialMovimiento, TipoEquipo, Ubicacion
+from .proyecciones import formatear_fecha
+from .versiones import obtener_derivado
+
+
+CLAVE_CACHE_DASHBOARD = 'dashboard:resumen'
+
+# Modelos cuyos cambios alteran el resumen (totales y nombres de cada grupo)
+MODELOS_DASHBOARD = (Activo, HistorialMovimiento, EstadoActivo, TipoEquipo, Ubicacion, Departamento)
+
+
+def _contar_activos_por(**campos):
+    """Total de activos agrupado por las columnas dadas (alias -> ruta), de mayor a menor."""
+    return list(
+        Activo.objects.order_by()
+        .values(**{alias: F(ruta) for alias, ruta in campos.items()})
+        .annotate(total=Count('pk'))
+        .order_by('-total', *campos)
+    )
+
+
+def calcular_resumen_dashboard():
+    """
+    Calcula el resumen sin usar la caché.
+
+    Returns:
+        dict: {
+            'activos': {'total', 'por_estado', 'por_tipo', 'por_departamento'},
+            'movimientos': {'ultimas_24_horas', 'ultimos_7_dias', 'ultimos_30_dias', 'por_tipo_30_dias'},
+            'generado_en': str
+        }
+    """
+    ahora = timezone.now()
+    hace_24_horas = ahora - timedelta(hours=24)
+    hace_7_dias = ahora - timedelta(days=7)
+    hace_30_dias = ahora - timedelta(days=30)
+
+    por_estado = _contar_activos_por(id_estado='estado_id', nombre_estado='estado__nombre_estado')
+    por_tipo = _contar_activos_por(id_tipo='tipo_id', nombre_tipo='tipo__nombre_tipo')
+    por_departamento = _contar_activos_por(
+        id_departamento='ubicacion_actual__departamento_id',
+        nombre_departamento='ubicacion_actual__departamento__nombre_departamento'
+    )
+
+    # Volumen reciente: una sola consulta sobre el índice de fecha_movimiento
+    tipos = [tipo for tipo, _ in HistorialMovimiento.TIPOS_MOVIMIENTO]
+    movimientos = HistorialMovimiento.objects.order_by().filter(
+        fecha_movimiento__gte=hace_30_dias
+    ).aggregate(
+        ultimas_24_horas=Count('pk', filter=Q(fecha_movimiento__gte=hace_24_horas)),
+        ultimos_7_dias=Count('pk', filter=Q(fecha_movimiento__gte=hace_7_dias)),
+        ultimos_30_dias=Count('pk'),
+        **{tipo: Count('pk', filter=Q(tipo_movimiento=tipo)) for tipo in tipos}
+    )
+
+    return {
+        'activos': {
+            'total': sum(fila['total'] for fila in por_estado),
+            'por_estado': por_estado,
+            'por_tipo': por_tipo,
+            'por_departamento': por_departamento,
+        },
+        'movimientos': {
+            'ultimas_24_horas': movimientos['ultimas_24_horas'],
+            'ultimos_7_dias': movimientos['ultimos_7_dias'],
+            'ultimos_30_dias': movimientos['ultimos_30_dias'],
+            'por_tipo_30_dias': {tipo: movimientos[tipo] for tipo in tipos},
+        },
+        'generado_en': formatear_fecha(ahora),
+    }
+
+
+def obtener_resumen_dashboard():
+    """Retorna el resumen desde la caché (lo calcula y guarda si no está o quedó viejo)."""
+    return obtener_derivado(
+        CLAVE_CACHE_DASHBOARD, MODELOS_DASHBOARD, calcular_resumen_dashboard,
+        timeout=settings.DASHBOARD_CACHE_TTL
+    )
@@ -0,0 +1,138 @@
+"""
+Edición de activos en lote para el SCA Hospital.
+
+Dar de baja o enviar a reparación varios equipos costaba un PATCH por activo,
+cada uno con la validación completa de ActivoSerializer y un save() de toda
+la fila. actualizar_activos() aplica los mismos cambios a todo el lote en una
+transacción con una cantidad fija de consultas, sin importar cuántos activos sean:
+1. SELECT ... FOR UPDATE de los activos (valores anteriores, para la auditoría)
+2. UPDATE de los campos modificados en una sola sentencia
+3. bulk_create de la auditoría (una fila por activo modificado)
+
+QuerySet.update() y bulk_create() no disparan señales: las cachés (marca de
+cambio, dashboard y fotos de inventario de las ubicaciones) se actualizan con
+core.signals.notificar_cambio_masivo().
+
+Uso:
+    resultados = actualizar_activos([12, 15, 18], {'estado': estado_baja}, request.user)
+"""
+
+from django.db import transaction
+
+from .catalogos import obtener_catalogo
+from .models import Activo, AuditoriaLog
+from .movimientos import NO_ENCONTRADO
+from .signals import notificar_cambio_masivo
+
+
+# Campos que admite la edición en lote
+CAMPOS_EDITABLES_LOTE = ('estado', 'tipo', 'notas')
+
+# Resultado de cada activo en la respuesta
+ACTUALIZADO = 'actualizado'
+SIN_CAMBIOS = 'sin_cambios'
+
+
+def _valor_auditoria(campo, valor):
+    """Valor legible para la auditoría: los catálogos se guardan con ID y nombre."""
+    relacion = Activo._meta.get_field(campo)
+    if not relacion.is_relation or valor is None:
+        return valor
+    instancia = obtener_catalogo(relacion.related_model).por_pk.get(valor)
+    return {'id': valor, 'nombre': str(instancia) if instancia is not None else None}
+
+
+def actualizar_activos(ids_activos, cambios, usuario):
+    """
+    Aplica los mismos cambios a varios activos en una sola transacción.
+
+    Los activos inexistentes o que ya tienen esos valores no detienen el lote:
+    se informan en su resultado y no generan auditoría.
+
+    Args:
+        ids_activos (list): IDs de los activos, sin repetir (se respeta el orden)
+        cambios (dict): Nuevos valores de CAMPOS_EDITABLES_LOTE
+            (ej: {'estado': EstadoActivo, 'notas': '...'})
+        usuario (Usuario): Usuario que registra la edición
+
+    Returns:
+        list: Un dict por ID, en el orden recibido:
+            {'id', 'estado': 'actualizado'|'sin_cambios'|'no_encontrado', ...}
+    """
+    # Columna real de cada campo (estado -> estado_id) y su valor nuevo
+    columnas = {campo: Activo._meta.get_field(campo).attname for campo in cambios}
+    nuevos = {columnas[campo]: getattr(valor, 'pk', valor) for campo, valor in cambios.items()}
+
+    with transaction.atomic():
+        # Orden por ID: dos lotes concurrentes bloquean las filas en el mismo orden (sin deadlock)
+        activos = {
+            fila['id']: fila
+            for fila in Activo.objects.select_for_update(of=('self',))
+            .filter(pk__in=ids_activos)
+            .order_by('pk')
+            .values('id', 'codigo_inventario', 'ubicacion_actual_id', *nuevos)
+        }
+
+        modificados = {}
+        for id_activo in ids_activos:
+            fila = activos.get(id_activo)
+            if fila is None:
+                continue
+            diferencias = {
+                campo: {
+                    'anterior': _valor_auditoria(campo, fila[columna]),
+                    'nuevo': _valor_auditoria(campo, nuevos[columna]),
+                }
+                for campo, columna in columnas.items() if fila[columna] != nuevos[columna]
+            }
+            if diferencias:
+                modificados[id_activo] = diferencias
+
+        if modificados:
+            Activo.objects.filter(pk__in=list(modificados)).update(**nuevos)
+
+            # Mismo formato que AuditoriaLog.registrar_accion (modelo, objeto y campos modificados)
+            AuditoriaLog.objects.bulk_create([
+                AuditoriaLog(
+                    usuario=usuario,
+                    accion='UPDATE',
+                    detalle_accion={
+                        'modelo': 'Activo',
+                        'activo_id': id_activo,
+                        'activo_codigo': activos[id_activo]['codigo_inventario'],
+                        'cambios': diferencias,
+                        'lote': True
+                    }
+                )
+                for id_activo, diferencias in modificados.items()
+            ])
+
+            notificar_cambio_masivo(
+                Activo,
+                ids_ubicacion={activos[id_activo]['ubicacion_actual_id'] for id_activo in modificados}
+            )
+
+    resultados = []
+    for id_activo in ids_activos:
+        fila = activos.get(id_activo)
+        if fila is None:
+            resultados.append({
+                'id': id_activo,
+                'estado': NO_ENCONTRADO,
+                'mensaje': f'El activo con ID {id_activo} no existe'
+            })
+        elif id_activo not in modificados:
+            resultados.append({
+                'id': id_activo,
+                'activo_codigo': fila['codigo_inventario'],
+                'estado': SIN_CAMBIOS,
+                'mensaje': 'El activo ya tenía esos valores'
+            })
+        else:
+            resultados.append({
+                'id': id_activo,
+                'activo_codigo': fila['codigo_inventario'],
+                'estado': ACTUALIZADO,
+                'cambios': modificados[id_activo]
+            })
+    return resultados
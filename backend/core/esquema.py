@@ -0,0 +1,163 @@
+"""
+Esquema OpenAPI pregenerado para la API REST del SCA Hospital.
+
+drf-spectacular recorre todos los ViewSets y serializers cada vez que se pide
+/api/schema/. Este módulo genera el esquema una sola vez (en el despliegue con
+`python manage.py generar_esquema`, o en la primera petición si falta) y lo
+guarda en disco en JSON y YAML, cada uno también comprimido con gzip.
+
+Características:
+- La huella del código (fuentes .py del proyecto, versiones de las librerías
+  y SPECTACULAR_SETTINGS) decide si el archivo sigue vigente
+- Si el archivo falta o su huella no coincide, se regenera automáticamente
+- Cada proceso mantiene los bytes en memoria: servirlo no lee el disco
+- ETag por formato y codificación (hash del contenido) para responder 304
+
+Configuración (config/settings.py):
+- OPENAPI_SCHEMA_DIR: carpeta donde se escriben los archivos
+
+Uso:
+    esquema = obtener_esquema('json')
+    esquema.contenido, esquema.contenido_gzip, esquema.etag, esquema.etag_gzip
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from importlib.metadata import version as version_paquete
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+
+FORMATOS_ESQUEMA = {
+    'yaml': ('schema.yaml', OpenApiYamlRenderer, 'application/vnd.oai.openapi; charset=utf-8'),
+    'json': ('schema.json', OpenApiJsonRenderer, 'application/vnd.oai.openapi+json; charset=utf-8'),
+}
+
+ARCHIVO_METADATOS = 'schema.meta.json'
+
+# Paquetes cuya versión cambia el esquema generado
+PAQUETES_ESQUEMA = ('django', 'djangorestframework', 'drf-spectacular', 'django-filter')
+
+_bloqueo = threading.Lock()
+_huella = None
+_esquemas = {}
+
+
+class Esquema:
+    """Esquema de un formato listo para servir."""
+
+    def __init__(self, formato, contenido, contenido_gzip):
+        self.formato = formato
+        self.content_type = FORMATOS_ESQUEMA[formato][2]
+        self.contenido = contenido
+        self.contenido_gzip = contenido_gzip
+        huella = hashlib.sha256(contenido).hexdigest()[:32]
+        self.etag = f'"{huella}"'
+        # Otros bytes, otro ETag fuerte: una caché no debe servir uno por el otro
+        self.etag_gzip = f'"{huella}-gz"'
+
+
+def _directorio():
+    return Path(settings.OPENAPI_SCHEMA_DIR)
+
+
+def huella_codigo():
+    """
+    Huella del código que determina el esquema.
+
+    Se calcula una vez por proceso: el código no cambia sin reiniciar el servidor.
+    """
+    global _huella
+    if _huella is None:
+        digest = hashlib.sha256()
+        for carpeta in ('core', 'config'):
+            for ruta in sorted((Path(settings.BASE_DIR) / carpeta).rglob('*.py')):
+                digest.update(str(ruta.relative_to(settings.BASE_DIR)).encode())
+                digest.update(ruta.read_bytes())
+        for paquete in PAQUETES_ESQUEMA:
+            digest.update(f'{paquete}=={version_paquete(paquete)}'.encode())
+        digest.update(repr(sorted(settings.SPECTACULAR_SETTINGS.items())).encode())
+        _huella = digest.hexdigest()
+    return _huella
+
+
+def _escribir_atomico(ruta, datos):
+    """Escribe el archivo completo o nada (otro worker puede estar leyéndolo)."""
+    descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, prefix=f'.{ruta.name}.')
+    with os.fdopen(descriptor, 'wb') as archivo:
+        archivo.write(datos)
+    os.chmod(temporal, 0o644)
+    os.replace(temporal, ruta)
+
+
+def generar_esquema():
+    """
+    Genera el esquema con drf-spectacular y lo escribe en OPENAPI_SCHEMA_DIR.
+
+    Returns:
+        dict: Metadatos escritos (huella, generado_en, archivos)
+    """
+    generador = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    esquema = generador.get_schema(request=None, public=True)
+
+    directorio = _directorio()
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    archivos = {}
+    for formato, (nombre, renderer_class, _) in FORMATOS_ESQUEMA.items():
+        contenido = renderer_class().render(esquema, renderer_context={})
+        _escribir_atomico(directorio / nombre, contenido)
+        _escribir_atomico(directorio / f'{nombre}.gz', gzip.compress(contenido, mtime=0))
+        archivos[formato] = len(contenido)
+
+    metadatos = {
+        'huella': huella_codigo(),
+        'generado_en': timezone.now().isoformat(),
+        'archivos': archivos,
+    }
+    # Los metadatos se escriben al final: solo validan archivos ya completos
+    _escribir_atomico(directorio / ARCHIVO_METADATOS, json.dumps(metadatos, indent=2).encode())
+    _esquemas.clear()
+    return metadatos
+
+
+def esquema_vigente():
+    """True si los archivos existen y fueron generados con el código actual."""
+    try:
+        metadatos = json.loads((_directorio() / ARCHIVO_METADATOS).read_text())
+    except (OSError, ValueError):
+        return False
+    return metadatos.get('huella') == huella_codigo()
+
+
+def obtener_esquema(formato):
+    """
+    Retorna el Esquema del formato ('json' o 'yaml'), generándolo si hace falta.
+
+    La primera llamada de cada proceso valida la huella y carga los archivos en
+    memoria; las siguientes retornan directamente los bytes cargados.
+    """
+    esquema = _esquemas.get(formato)
+    if esquema is not None:
+        return esquema
+
+    with _bloqueo:
+        if formato not in _esquemas:
+            if not esquema_vigente():
+                generar_esquema()
+            directorio = _directorio()
+            for nombre_formato, (nombre, _, _) in FORMATOS_ESQUEMA.items():
+                _esquemas[nombre_formato] = Esquema(
+                    nombre_formato,
+                    (directorio / nombre).read_bytes(),
+                    (directorio / f'{nombre}.gz').read_bytes()
+                )
+    return _esquemas[formato]
@@ -0,0 +1,312 @@
+"""
+Exportación en streaming (CSV / NDJSON / XLSX) para la API REST del SCA Hospital.
+
+Este módulo arma respuestas StreamingHttpResponse a partir de filas .values()
+leídas por partes, de modo que la memoria se mantiene constante sin importar
+si se exportan 1.000 o 5.000.000 de filas, y el primer byte sale de inmediato.
+
+Características:
+- Lectura con QuerySet.iterator(chunk_size): en PostgreSQL usa un cursor del lado del servidor
+- CSV con BOM UTF-8 (Excel reconoce tildes y ñ)
+- NDJSON: un objeto JSON por línea, con la misma forma que la API
+- XLSX generado en streaming (SpreadsheetML mínimo sobre zipfile, sin dependencias)
+- Los libros XLSX se dividen en hojas al llegar al límite de filas de Excel
+
+Uso (desde un ViewSet):
+    return respuesta_exportacion(filas, proyeccion, campos, expandir, 'csv', 'activos')
+"""
+
+import csv
+import io
+import json
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+# Filas leídas por cada viaje a la base de datos (y escritas por cada bloque de salida)
+TAMANO_BLOQUE_EXPORTACION = 2000
+
+# Límite de filas por hoja de Excel (incluye la fila de encabezados)
+MAX_FILAS_HOJA_XLSX = 1048576
+
+FORMATOS_EXPORTACION = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def _valor_plano(valor):
+    """Convierte un valor a texto plano para CSV (dict/list como JSON)."""
+    if valor is None:
+        return ''
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return valor
+
+
+def _bloques(filas):
+    """Agrupa un iterable de filas en listas de TAMANO_BLOQUE_EXPORTACION."""
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= TAMANO_BLOQUE_EXPORTACION:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+# ==============================================================================
+# CSV
+# ==============================================================================
+
+def generar_csv(filas, lectores):
+    """Genera el CSV por bloques: primero los encabezados, luego las filas."""
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+
+    # BOM para que Excel abra el archivo como UTF-8
+    salida.write('\ufeff')
+    escritor.writerow([encabezado for encabezado, _ in lectores])
+    yield salida.getvalue()
+
+    for bloque in _bloques(filas):
+        salida.seek(0)
+        salida.truncate(0)
+        for fila in bloque:
+            escritor.writerow([_valor_plano(leer(fila)) for _, leer in lectores])
+        yield salida.getvalue()
+
+
+# ==============================================================================
+# NDJSON
+# ==============================================================================
+
+def generar_ndjson(filas, proyeccion, campos, expandir):
+    """Genera un objeto JSON por línea con la misma forma que el listado de la API."""
+    for bloque in _bloques(filas):
+        objetos = proyeccion.serializar(bloque, campos, expandir)
+        yield ''.join(
+            json.dumps(objeto, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
+            for objeto in objetos
+        )
+
+
+# ==============================================================================
+# XLSX (SpreadsheetML mínimo en streaming)
+# ==============================================================================
+
+_CARACTERES_INVALIDOS_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_XLSX_NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XLSX_NS_PKG = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_XML_DECLARACION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+class _BufferSalida:
+    """
+    Archivo de solo escritura (sin seek) donde zipfile deja los bytes generados.
+
+    Al no poder retroceder, zipfile escribe cada entrada con data descriptor,
+    lo que permite enviar el ZIP por partes a medida que se genera.
+    """
+
+    def __init__(self):
+        self._partes = []
+        self._posicion = 0
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def _letra_columna(indice):
+    """Convierte un índice base 0 en letra de columna de Excel (0 -> A, 27 -> AB)."""
+    letras = ''
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _celda_xlsx(referencia, valor):
+    """Retorna el XML de una celda (vacío si el valor es None)."""
+    if valor is None:
+        return ''
+    if isinstance(valor, bool):
+        return f'<c r="{referencia}" t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float)):
+        return f'<c r="{referencia}"><v>{valor}</v></c>'
+    texto = _CARACTERES_INVALIDOS_XML.sub('', str(_valor_plano(valor)))
+    return f'<c r="{referencia}" t="inlineStr"><is><t xml:space="preserve">{escape(texto)}</t></is></c>'
+
+
+def _fila_xlsx(numero, letras, valores):
+    celdas = ''.join(
+        _celda_xlsx(f'{letra}{numero}', valor) for letra, valor in zip(letras, valores)
+    )
+    return f'<row r="{numero}">{celdas}</row>'
+
+
+def generar_xlsx(filas, lectores, nombre_hoja='Datos'):
+    """
+    Genera un libro XLSX por partes.
+
+    Las hojas se escriben primero (una nueva cada MAX_FILAS_HOJA_XLSX filas) y
+    al final el workbook y los archivos de relaciones, que solo necesitan saber
+    cuántas hojas se generaron.
+    """
+    buffer = _BufferSalida()
+    letras = [_letra_columna(indice) for indice in range(len(lectores))]
+    encabezados = [encabezado for encabezado, _ in lectores]
+
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as libro:
+        total_hojas = 0
+        hoja = None
+        numero_fila = MAX_FILAS_HOJA_XLSX
+
+        def abrir_hoja():
+            nonlocal hoja, numero_fila, total_hojas
+            total_hojas += 1
+            hoja = libro.open(f'xl/worksheets/sheet{total_hojas}.xml', 'w', force_zip64=True)
+            hoja.write(f'{_XML_DECLARACION}<worksheet xmlns="{_XLSX_NS}"><sheetData>'.encode())
+            hoja.write(_fila_xlsx(1, letras, encabezados).encode())
+            numero_fila = 1
+
+        def cerrar_hoja():
+            hoja.write(b'</sheetData></worksheet>')
+            hoja.close()
+
+        for bloque in _bloques(filas):
+            partes = []
+            for fila in bloque:
+                if numero_fila >= MAX_FILAS_HOJA_XLSX:
+                    if hoja is not None:
+                        hoja.write(''.join(partes).encode())
+                        partes = []
+                        cerrar_hoja()
+                    abrir_hoja()
+                numero_fila += 1
+                partes.append(_fila_xlsx(numero_fila, letras, [leer(fila) for _, leer in lectores]))
+            hoja.write(''.join(partes).encode())
+            yield buffer.vaciar()
+
+        if hoja is None:
+            abrir_hoja()
+        cerrar_hoja()
+
+        hojas = ''.join(
+            f'<sheet name="{escape(nombre_hoja)}{"" if n == 1 else f" {n}"}" sheetId="{n}" r:id="rId{n}"/>'
+            for n in range(1, total_hojas + 1)
+        )
+        libro.writestr(
+            'xl/workbook.xml',
+            f'{_XML_DECLARACION}<workbook xmlns="{_XLSX_NS}" xmlns:r="{_XLSX_NS_REL}">'
+            f'<sheets>{hojas}</sheets></workbook>'
+        )
+        relaciones_hojas = ''.join(
+            f'<Relationship Id="rId{n}" Type="{_XLSX_NS_REL}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+            for n in range(1, total_hojas + 1)
+        )
+        libro.writestr(
+            'xl/_rels/workbook.xml.rels',
+            f'{_XML_DECLARACION}<Relationships xmlns="{_XLSX_NS_PKG}">{relaciones_hojas}</Relationships>'
+        )
+        libro.writestr(
+            '_rels/.rels',
+            f'{_XML_DECLARACION}<Relationships xmlns="{_XLSX_NS_PKG}">'
+            f'<Relationship Id="rId1" Type="{_XLSX_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            f'</Relationships>'
+        )
+        overrides_hojas = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for n in range(1, total_hojas + 1)
+        )
+        libro.writestr(
+            '[Content_Types].xml',
+            f'{_XML_DECLARACION}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            f'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            f'<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'{overrides_hojas}</Types>'
+        )
+
+    # Directorio central del ZIP (se escribe al cerrar)
+    yield buffer.vaciar()
+
+
+# ==============================================================================
+# RESPUESTA
+# ==============================================================================
+
+def respuesta_exportacion(queryset_filas, proyeccion, campos, expandir, formato, nombre_base):
+    """
+    Crea la StreamingHttpResponse de exportación.
+
+    Args:
+        queryset_filas: QuerySet .values() con las columnas de la proyección (ya filtrado)
+        proyeccion (Proyeccion): Forma de salida del recurso
+        campos (set|None): Selección ?fields=
+        expandir (set|None): Selección ?expand=
+        formato (str): 'csv', 'ndjson' o 'xlsx'
+        nombre_base (str): Prefijo del archivo descargado (ej: 'activos')
+
+    Returns:
+        StreamingHttpResponse
+    """
+    filas = queryset_filas.iterator(chunk_size=TAMANO_BLOQUE_EXPORTACION)
+
+    if formato == 'ndjson':
+        return _respuesta_streaming(generar_ndjson(filas, proyeccion, campos, expandir), formato, nombre_base)
+    return respuesta_archivo(filas, proyeccion.lectores_planos(campos, expandir), formato, nombre_base)
+
+
+def respuesta_archivo(filas, lectores, formato, nombre_base):
+    """
+    Crea la StreamingHttpResponse de un archivo CSV o XLSX a partir de filas planas.
+
+    Args:
+        filas: Iterable de filas (diccionarios)
+        lectores (list): [(encabezado, lector)] de cada columna
+        formato (str): 'csv' o 'xlsx'
+        nombre_base (str): Prefijo del archivo descargado
+
+    Returns:
+        StreamingHttpResponse
+    """
+    if formato == 'xlsx':
+        contenido = generar_xlsx(filas, lectores)
+    else:
+        contenido = generar_csv(filas, lectores)
+    return _respuesta_streaming(contenido, formato, nombre_base)
+
+
+def _respuesta_streaming(contenido, formato, nombre_base):
+    respuesta = StreamingHttpResponse(contenido, content_type=FORMATOS_EXPORTACION[formato])
+    fecha = timezone.localtime().strftime('%Y%m%d_%H%M%S')
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre_base}_{fecha}.{formato}"'
+    # Evita que proxies (nginx) acumulen la respuesta completa antes de enviarla
+    respuesta['X-Accel-Buffering'] = 'no'
+    return respuesta
@@ -0,0 +1,104 @@
+"""
+Inventario por ubicación en caché para el escaneo de códigos LOC- (core.views.EscaneoViewSet).
+
+Al escanear una ubicación el técnico necesita todos los activos que están en
+ella. La respuesta completa ({'ubicacion', 'activos'}) se guarda en la caché
+de Django por ubicación, de modo que un escaneo cuesta una lectura de caché.
+
+Invalidación:
+- Por ubicación: al crear, editar, movilizar o eliminar un activo se borran
+  las fotos de su ubicación anterior y de la nueva (core.signals)
+- Global: la foto guarda las marcas de cambio (core.versiones) de Ubicacion,
+  Departamento, TipoEquipo y EstadoActivo; si alguna cambió (ej: se renombró
+  un estado) la foto se descarta al leerla. Se leen en el mismo acceso a la caché.
+- Sin caché compartida (LocMemCache) el borrado por ubicación solo llega al
+  worker que guardó el activo: la foto guarda también la marca de Activo y
+  cualquier cambio de activos la descarta en todos los workers
+
+Configuración (config/settings.py):
+- INVENTARIO_UBICACION_CACHE_TTL: segundos de vida máxima de cada foto (acota
+  el caso raro de una foto calculada justo antes de confirmarse un movimiento)
+
+Uso:
+    inventario = obtener_inventario_ubicacion('LOC-F8A1B2')   # None si no existe
+    invalidar_inventario_ubicaciones([3, 7])
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Ubicacion, Departamento, TipoEquipo, EstadoActivo, Activo
+from .proyecciones import PROYECCION_UBICACION
+from .serializers import ACTIVO_CAMPOS_LECTURA_RAPIDA, serializar_activos_rapido
+from .versiones import cache_compartida, leer_con_versiones
+
+
+# Modelos que forman la foto además de Activo (invalidación por marca de cambio)
+MODELOS_REFERENCIA = (Ubicacion, Departamento, TipoEquipo, EstadoActivo)
+
+
+def _modelos_version():
+    """Marcas que guarda la foto (con caché local, también la de Activo)."""
+    return MODELOS_REFERENCIA if cache_compartida() else (*MODELOS_REFERENCIA, Activo)
+
+
+def _clave_inventario(codigo_qr):
+    return f'inventario:ubicacion:{codigo_qr}'
+
+
+def calcular_inventario_ubicacion(codigo_qr):
+    """
+    Arma la foto de la ubicación sin usar la caché (2 consultas).
+
+    Returns:
+        dict: {'ubicacion': {...}, 'activos': [...]} con la misma forma que
+            UbicacionSerializer / ActivoSerializer, o None si el código no existe
+    """
+    columnas_ubicacion = [columna for columna in PROYECCION_UBICACION.columnas() if columna != 'total_activos']
+    fila = Ubicacion.objects.filter(codigo_qr=codigo_qr).values(*columnas_ubicacion).first()
+    if fila is None:
+        return None
+
+    columnas_activo = [columna for columna in ACTIVO_CAMPOS_LECTURA_RAPIDA if columna != 'ubicacion_total_activos']
+    activos = list(
+        Activo.objects.filter(ubicacion_actual_id=fila['id'])
+        .order_by('codigo_inventario')
+        .values(*columnas_activo)
+    )
+
+    # El total sale de la misma lista (sin COUNT adicional)
+    fila['total_activos'] = len(activos)
+    for activo in activos:
+        activo['ubicacion_total_activos'] = len(activos)
+
+    return {
+        'ubicacion': PROYECCION_UBICACION.serializar([fila])[0],
+        'activos': serializar_activos_rapido(activos),
+    }
+
+
+def obtener_inventario_ubicacion(codigo_qr):
+    """Retorna la foto de la ubicación desde la caché (la calcula y guarda si no está o quedó vieja)."""
+    clave = _clave_inventario(codigo_qr)
+    guardado, versiones = leer_con_versiones(clave, _modelos_version())
+    versiones = {modelo._meta.label_lower: marca for modelo, marca in versiones.items()}
+    if guardado is not None and guardado['versiones'] == versiones:
+        return guardado['inventario']
+
+    inventario = calcular_inventario_ubicacion(codigo_qr)
+    if inventario is not None:
+        cache.set(
+            clave,
+            {'versiones': versiones, 'inventario': inventario},
+            settings.INVENTARIO_UBICACION_CACHE_TTL
+        )
+    return inventario
+
+
+def invalidar_inventario_ubicaciones(ids_ubicacion):
+    """Borra de la caché las fotos de las ubicaciones dadas (por ID)."""
+    ids_ubicacion = {id_ubicacion for id_ubicacion in ids_ubicacion if id_ubicacion is not None}
+    if not ids_ubicacion:
+        return
+    codigos = Ubicacion.objects.filter(pk__in=ids_ubicacion).values_list('codigo_qr', flat=True)
+    cache.delete_many([_clave_inventario(codigo) for codigo in codigos])
@@ -0,0 +1,38 @@
+"""
+Comando de gestión Django para pregenerar el esquema OpenAPI de la API.
+
+Escribe en OPENAPI_SCHEMA_DIR el esquema en YAML y JSON (más sus versiones
+.gz) junto con la huella del código con que se generó. /api/schema/ sirve esos
+archivos; si faltan o la huella no coincide, los regenera en la primera petición.
+
+Uso (en el despliegue, después de collectstatic):
+    python manage.py generar_esquema
+    python manage.py generar_esquema --si-hace-falta
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.esquema import esquema_vigente, generar_esquema
+
+
+class Command(BaseCommand):
+    help = 'Pregenera el esquema OpenAPI (YAML/JSON comprimidos) que sirve /api/schema/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--si-hace-falta',
+            action='store_true',
+            help='Solo generar si el archivo no existe o el código cambió'
+        )
+
+    def handle(self, *args, **options):
+        if options['si_hace_falta'] and esquema_vigente():
+            self.stdout.write(self.style.SUCCESS('El esquema OpenAPI ya está al día.'))
+            return
+
+        metadatos = generar_esquema()
+        tamanos = ', '.join(f'{formato}: {bytes_} bytes' for formato, bytes_ in metadatos['archivos'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Esquema OpenAPI generado en {settings.OPENAPI_SCHEMA_DIR} ({tamanos})"
+        ))
@@ -0,0 +1,60 @@
+"""
+Comando de gestión Django para llenar el pool de códigos INV- / LOC- por adelantado.
+
+Genera los códigos desde la secuencia de core.codigos (únicos por
+construcción), descarta los que coinciden con códigos antiguos y los deja
+disponibles en Tbl_Pool_Codigos. Activo.save() y Ubicacion.save() los toman
+de ahí.
+
+Con --si-hace-falta solo recarga las secuencias bajo CODIGOS_POOL_UMBRAL
+(agrega CODIGOS_POOL_RECARGA): es la forma de programarlo en un cron o worker
+y sacar la recarga de las peticiones (CODIGOS_POOL_RECARGA_EN_PETICION=False).
+
+Uso:
+    python manage.py llenar_pool_codigos
+    python manage.py llenar_pool_codigos --cantidad 20000 --secuencia codigo_inventario
+    python manage.py llenar_pool_codigos --si-hace-falta     # ej: cron cada 5 minutos
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.codigos import SECUENCIA_INVENTARIO, SECUENCIA_UBICACION, codigos_disponibles, llenar_pool
+
+
+class Command(BaseCommand):
+    help = 'Llena el pool de códigos de inventario (INV-) y de ubicación (LOC-)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cantidad',
+            type=int,
+            help='Códigos a agregar por secuencia (default: 1000, o CODIGOS_POOL_RECARGA con --si-hace-falta)'
+        )
+        parser.add_argument(
+            '--secuencia',
+            choices=[SECUENCIA_INVENTARIO, SECUENCIA_UBICACION],
+            help='Llenar solo una secuencia (por defecto, ambas)'
+        )
+        parser.add_argument(
+            '--si-hace-falta',
+            action='store_true',
+            help='Solo recargar las secuencias con menos de CODIGOS_POOL_UMBRAL códigos disponibles'
+        )
+
+    def handle(self, *args, **options):
+        secuencias = [options['secuencia']] if options['secuencia'] else [SECUENCIA_INVENTARIO, SECUENCIA_UBICACION]
+        cantidad = options['cantidad']
+        if cantidad is None:
+            cantidad = settings.CODIGOS_POOL_RECARGA if options['si_hace_falta'] else 1000
+
+        for secuencia in secuencias:
+            if options['si_hace_falta'] and codigos_disponibles(secuencia) >= settings.CODIGOS_POOL_UMBRAL:
+                agregados = 0
+            else:
+                with transaction.atomic():
+                    agregados = llenar_pool(secuencia, cantidad)
+            self.stdout.write(self.style.SUCCESS(
+                f"{secuencia}: {agregados} códigos agregados ({codigos_disponibles(secuencia)} disponibles)"
+            ))
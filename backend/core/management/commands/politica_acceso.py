@@ -0,0 +1,58 @@
+"""
+Comando de gestión Django para inspeccionar la tabla de permisos RBAC compilada.
+
+Muestra, para cada vista y acción de core.permissions.POLITICA_ACCESO, qué
+métodos HTTP tiene permitidos cada rol de la base de datos (y los usuarios
+sin rol), tal como los evalúa el permiso PoliticaAcceso.
+
+Uso:
+    python manage.py politica_acceso
+    python manage.py politica_acceso --json
+    python manage.py politica_acceso --vista ActivoViewSet
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.permissions import POLITICA_ACCESO, TOTAL, tabla_politica
+from core.models import Rol
+
+
+class Command(BaseCommand):
+    help = 'Muestra la tabla de permisos RBAC compilada (rol, vista, acción, métodos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Salida en JSON (una fila por combinación permitida)')
+        parser.add_argument('--vista', help='Mostrar solo una vista (ej: ActivoViewSet)')
+
+    def handle(self, *args, **options):
+        tabla = tabla_politica()
+        roles = {rol.pk: rol.nombre_rol for rol in Rol.objects.all()}
+        roles[None] = '(sin rol)'
+        metodos = sorted(TOTAL)
+
+        filas = []
+        for vista, acciones in POLITICA_ACCESO.items():
+            if options['vista'] and vista != options['vista']:
+                continue
+            for accion in acciones:
+                for rol_id, nombre_rol in roles.items():
+                    permitidos = [m for m in metodos if tabla.get((rol_id, vista, accion, m))]
+                    filas.append({
+                        'vista': vista,
+                        'accion': accion,
+                        'rol_id': rol_id,
+                        'rol': nombre_rol,
+                        'metodos': permitidos,
+                    })
+
+        if options['json']:
+            self.stdout.write(json.dumps(filas, ensure_ascii=False, indent=2))
+            return
+
+        for fila in filas:
+            metodos_texto = ', '.join(fila['metodos']) or '-'
+            self.stdout.write(
+                f"{fila['vista']:<28} {fila['accion']:<16} {fila['rol']:<24} {metodos_texto}"
+            )
@@ -0,0 +1,177 @@
+"""
+Middleware de compresión negociada para la API REST del SCA Hospital.
+
+Los listados JSON (/api/activos/, /api/historial-movimientos/) repiten las
+mismas claves anidadas en cada fila y comprimen muy bien. Este middleware
+comprime las respuestas según el Accept-Encoding del cliente:
+- brotli ('br') si el paquete opcional `brotli` está instalado
+- gzip en cualquier caso
+
+Características:
+- Solo tipos de contenido de texto (JSON, CSV, NDJSON, YAML, HTML); XLSX ya viene comprimido
+- Umbral de tamaño: las respuestas pequeñas se envían tal cual
+- Respuestas en streaming (exportaciones) comprimidas bloque a bloque: cada
+  bloque se envía apenas se comprime, sin acumular el archivo
+- No toca respuestas que ya traen Content-Encoding (ej: /api/schema/ pregenerado)
+- Agrega Vary: Accept-Encoding y debilita los ETag fuertes, igual que GZipMiddleware
+
+Configuración (config/settings.py):
+- COMPRESION_TAMANO_MINIMO: bytes a partir de los cuales se comprime
+
+Benchmark:
+    python scripts/benchmark_compresion.py
+"""
+
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # Opcional: pip install brotli
+    brotli = None
+
+
+# Nivel de gzip (6: buen equilibrio entre CPU y tamaño para contenido dinámico)
+NIVEL_GZIP = 6
+
+# Calidad de brotli (0-11); sobre 6 el costo de CPU crece mucho para respuestas dinámicas
+CALIDAD_BROTLI = 5
+
+# Tipos de contenido que vale la pena comprimir
+PATRON_TIPO_COMPRIMIBLE = re.compile(
+    r'^(text/|application/(json|x-ndjson|javascript|xml|vnd\.oai\.openapi)|application/[\w.+-]*\+json)'
+)
+
+
+def codificaciones_disponibles():
+    """Codificaciones que el servidor sabe producir, en orden de preferencia."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def elegir_codificacion(accept_encoding):
+    """
+    Elige la codificación según el encabezado Accept-Encoding.
+
+    Respeta los valores q (q=0 significa "no aceptada") y, a igual q, prefiere
+    brotli sobre gzip.
+
+    Returns:
+        str|None: 'br', 'gzip' o None si el cliente no acepta ninguna
+    """
+    calidades = {}
+    for parte in accept_encoding.split(','):
+        nombre, _, parametros = parte.strip().partition(';')
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        calidad = 1.0
+        coincidencia = re.search(r'q\s*=\s*([0-9.]+)', parametros)
+        if coincidencia:
+            try:
+                calidad = float(coincidencia.group(1))
+            except ValueError:
+                calidad = 0.0
+        calidades[nombre] = calidad
+
+    mejor, mejor_calidad = None, 0.0
+    for codificacion in codificaciones_disponibles():
+        calidad = calidades.get(codificacion, calidades.get('*', 0.0))
+        if calidad > mejor_calidad:
+            mejor, mejor_calidad = codificacion, calidad
+    return mejor
+
+
+def comprimir(contenido, codificacion):
+    """Comprime un cuerpo completo con la codificación dada."""
+    if codificacion == 'br':
+        return brotli.compress(contenido, quality=CALIDAD_BROTLI)
+    return zlib.compress(contenido, NIVEL_GZIP, wbits=16 + zlib.MAX_WBITS)
+
+
+class _CompresorFlujo:
+    """Compresor incremental: comprimir(bloque) entrega los bytes listos para enviar."""
+
+    def __init__(self, codificacion):
+        self.codificacion = codificacion
+        if codificacion == 'br':
+            self._compresor = brotli.Compressor(quality=CALIDAD_BROTLI)
+        else:
+            self._compresor = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def comprimir(self, bloque):
+        # flush por bloque: el cliente recibe cada bloque sin esperar al siguiente
+        if self.codificacion == 'br':
+            return self._compresor.process(bloque) + self._compresor.flush()
+        return self._compresor.compress(bloque) + self._compresor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self):
+        if self.codificacion == 'br':
+            return self._compresor.finish()
+        return self._compresor.flush(zlib.Z_FINISH)
+
+
+def comprimir_flujo(bloques, codificacion):
+    """Comprime un iterable de bloques de bytes, bloque a bloque."""
+    compresor = _CompresorFlujo(codificacion)
+    for bloque in bloques:
+        if bloque:
+            yield compresor.comprimir(bloque)
+    yield compresor.finalizar()
+
+
+async def comprimir_flujo_async(bloques, codificacion):
+    """Versión de comprimir_flujo para respuestas en streaming asíncronas."""
+    compresor = _CompresorFlujo(codificacion)
+    async for bloque in bloques:
+        if bloque:
+            yield compresor.comprimir(bloque)
+    yield compresor.finalizar()
+
+
+class CompresionMiddleware(MiddlewareMixin):
+    """
+    Comprime las respuestas de texto con brotli o gzip según Accept-Encoding.
+
+    Debe ubicarse antes que cualquier middleware que lea o modifique el cuerpo
+    de la respuesta (se ejecuta después de ellos al volver).
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 206, 304):
+            return response
+        if not PATRON_TIPO_COMPRIMIBLE.match(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESION_TAMANO_MINIMO:
+            return response
+
+        # La respuesta depende de Accept-Encoding aunque este cliente no comprima
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        codificacion = elegir_codificacion(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if codificacion is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = comprimir_flujo_async(response.streaming_content, codificacion)
+            else:
+                response.streaming_content = comprimir_flujo(response.streaming_content, codificacion)
+            del response.headers['Content-Length']
+        else:
+            comprimido = comprimir(response.content, codificacion)
+            if len(comprimido) >= len(response.content):
+                return response
+            response.content = comprimido
+            response.headers['Content-Length'] = str(len(comprimido))
+
+        # El cuerpo ya no es idéntico byte a byte: un ETag fuerte pasa a débil
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = codificacion
+        return response
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:58
+
+from django.db import migrations, models
+
+
+def crear_secuencias(apps, schema_editor):
+    """Crea los contadores de las secuencias de códigos (core.codigos) en 0."""
+    SecuenciaCodigo = apps.get_model('core', 'SecuenciaCodigo')
+    for nombre in ('codigo_inventario', 'codigo_qr'):
+        SecuenciaCodigo.objects.get_or_create(nombre=nombre)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_add_notas_to_activo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecuenciaCodigo',
+            fields=[
+                ('nombre', models.CharField(help_text='Nombre de la secuencia (ej: codigo_inventario, codigo_qr)', max_length=50, primary_key=True, serialize=False)),
+                ('ultimo_valor', models.BigIntegerField(default=0, help_text='Último valor entregado por la secuencia')),
+            ],
+            options={
+                'verbose_name': 'Secuencia de Código',
+                'verbose_name_plural': 'Secuencias de Códigos',
+                'db_table': 'Tbl_Secuencias_Codigo',
+            },
+        ),
+        migrations.RunPython(crear_secuencias, migrations.RunPython.noop),
+    ]
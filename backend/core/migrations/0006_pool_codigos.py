@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_secuencias_codigo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodigoPool',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('secuencia', models.CharField(choices=[('codigo_inventario', 'Código de inventario (INV-)'), ('codigo_qr', 'Código QR de ubicación (LOC-)')], help_text='Secuencia a la que pertenece el código', max_length=50)),
+                ('codigo', models.CharField(help_text='Código disponible (ej: INV-25-A1B2C3, LOC-F8A1B2)', max_length=20, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Código Disponible',
+                'verbose_name_plural': 'Códigos Disponibles',
+                'db_table': 'Tbl_Pool_Codigos',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['secuencia', 'id'], name='Tbl_Pool_Co_secuenc_b32774_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_pool_codigos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VersionModelo',
+            fields=[
+                ('modelo', models.CharField(help_text='Modelo al que pertenece la marca (ej: core.tipoequipo)', max_length=100, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(help_text='Instante del último cambio del modelo, en nanosegundos')),
+            ],
+            options={
+                'verbose_name': 'Marca de Cambio',
+                'verbose_name_plural': 'Marcas de Cambio',
+                'db_table': 'Tbl_Versiones_Modelo',
+            },
+        ),
+    ]
@@ -9,13 +9,20 @@ Características:
 - Integridad referencial con PROTECT
 - Documentación automática para OpenAPI/Swagger
 - JSONField para auditoría (reemplazo de MongoDB)
-- Generación automática de códigos únicos con manejo de colisiones
+- Generación automática de códigos únicos desde una secuencia en la base (core.codigos)
 """
 
-from django.db import models, IntegrityError
+from django.db import models
 from django.contrib.auth.models import AbstractUser
-import secrets
-from datetime import datetime
+
+from .codigos import (
+    TABLA_SECUENCIAS,
+    SECUENCIA_INVENTARIO,
+    SECUENCIA_UBICACION,
+    tomar_codigos_inventario,
+    tomar_codigos_ubicacion,
+    guardar_con_codigo
+)
 
 
 # ==============================================================================
@@ -174,47 +181,22 @@ class Ubicacion(models.Model):
     def __str__(self):
         return f"{self.nombre_ubicacion} ({self.departamento.nombre_departamento})"
 
-    def _generar_codigo_qr(self):
-        """
-        Genera un código QR único en formato LOC-{HEX}.
-
-        Formato: LOC-F8A1B2 (6 caracteres hexadecimales)
-
-        Returns:
-            str: Código QR único
-        """
-        hex_code = secrets.token_hex(3).upper()  # 3 bytes = 6 caracteres hex
-        return f"LOC-{hex_code}"
-
     def save(self, *args, **kwargs):
         """
         Sobrescribe el método save para generar automáticamente el código QR.
 
-        CRÍTICO: Implementa manejo de colisiones con bucle while.
-        Si el código ya existe, genera uno nuevo hasta encontrar uno único.
+        El código sale del pool de códigos o, si está vacío, de la secuencia
+        (core.codigos): no se consulta antes si existe, solo se reintenta si el
+        INSERT choca con un código antiguo.
         """
-        if not self.codigo_qr:
-            # Intentar generar código único con manejo de colisiones
-            max_intentos = 100
-            intentos = 0
-
-            while intentos < max_intentos:
-                codigo_candidato = self._generar_codigo_qr()
-
-                # Verificar si el código ya existe
-                if not Ubicacion.objects.filter(codigo_qr=codigo_candidato).exists():
-                    self.codigo_qr = codigo_candidato
-                    break
-
-                intentos += 1
-
-            if not self.codigo_qr:
-                raise ValueError(
-                    f"No se pudo generar un código QR único después de {max_intentos} intentos. "
-                    "Esto es extremadamente raro. Contacte al administrador del sistema."
-                )
+        if self.codigo_qr:
+            super().save(*args, **kwargs)
+            return
 
-        super().save(*args, **kwargs)
+        guardar_con_codigo(
+            self, 'codigo_qr', tomar_codigos_ubicacion,
+            lambda: super(Ubicacion, self).save(*args, **kwargs)
+        )
 
 
 # ==============================================================================
@@ -379,48 +361,23 @@ class Activo(models.Model):
         """Retorna la ubicación completa del activo incluyendo departamento."""
         return f"{self.ubicacion_actual.nombre_ubicacion} ({self.ubicacion_actual.departamento.nombre_departamento})"
 
-    def _generar_codigo_inventario(self):
-        """
-        Genera un código de inventario único en formato INV-{YY}-{HEX}.
-
-        Formato: INV-25-A1B2C3 (año de 2 dígitos + 6 caracteres hexadecimales)
-
-        Returns:
-            str: Código de inventario único
-        """
-        year = datetime.now().strftime('%y')  # Año en 2 dígitos (ej: 25)
-        hex_code = secrets.token_hex(3).upper()  # 3 bytes = 6 caracteres hex
-        return f"INV-{year}-{hex_code}"
-
     def save(self, *args, **kwargs):
         """
         Sobrescribe el método save para generar automáticamente el código de inventario.
 
-        CRÍTICO: Implementa manejo de colisiones con bucle while.
-        Si el código ya existe, genera uno nuevo hasta encontrar uno único.
+        El código sale del pool de códigos o, si está vacío, de la secuencia
+        (core.codigos): no se consulta antes si existe, solo se reintenta si el
+        INSERT choca con un código antiguo.
+        Para altas en lote usar core.codigos.crear_con_codigos().
         """
-        if not self.codigo_inventario:
-            # Intentar generar código único con manejo de colisiones
-            max_intentos = 100
-            intentos = 0
-
-            while intentos < max_intentos:
-                codigo_candidato = self._generar_codigo_inventario()
-
-                # Verificar si el código ya existe
-                if not Activo.objects.filter(codigo_inventario=codigo_candidato).exists():
-                    self.codigo_inventario = codigo_candidato
-                    break
-
-                intentos += 1
+        if self.codigo_inventario:
+            super().save(*args, **kwargs)
+            return
 
-            if not self.codigo_inventario:
-                raise ValueError(
-                    f"No se pudo generar un código de inventario único después de {max_intentos} intentos. "
-                    "Esto es extremadamente raro. Contacte al administrador del sistema."
-                )
-
-        super().save(*args, **kwargs)
+        guardar_con_codigo(
+            self, 'codigo_inventario', tomar_codigos_inventario,
+            lambda: super(Activo, self).save(*args, **kwargs)
+        )
 
 
 # ==============================================================================
@@ -619,3 +576,101 @@ class AuditoriaLog(models.Model):
             accion=accion,
             detalle_accion=detalle or {}
         )
+
+
+# ==============================================================================
+# 7. SECUENCIAS Y POOL DE CÓDIGOS
+# ==============================================================================
+
+class SecuenciaCodigo(models.Model):
+    """
+    Contador de una secuencia de códigos (inventario o QR de ubicación).
+
+    Lo usa core.codigos: reservar N códigos es un solo UPDATE ... RETURNING
+    sobre esta fila, que queda bloqueada hasta el COMMIT.
+    """
+    nombre = models.CharField(
+        max_length=50,
+        primary_key=True,
+        help_text="Nombre de la secuencia (ej: codigo_inventario, codigo_qr)"
+    )
+
+    ultimo_valor = models.BigIntegerField(
+        default=0,
+        help_text="Último valor entregado por la secuencia"
+    )
+
+    class Meta:
+        db_table = TABLA_SECUENCIAS
+        verbose_name = 'Secuencia de Código'
+        verbose_name_plural = 'Secuencias de Códigos'
+
+    def __str__(self):
+        return f"{self.nombre} ({self.ultimo_valor})"
+
+
+class CodigoPool(models.Model):
+    """
+    Código pregenerado disponible (pool de core.codigos).
+
+    Se llena con `python manage.py llenar_pool_codigos` o automáticamente bajo
+    el umbral; cada fila se borra al asignarse su código a un activo o ubicación.
+    """
+    SECUENCIAS = [
+        (SECUENCIA_INVENTARIO, 'Código de inventario (INV-)'),
+        (SECUENCIA_UBICACION, 'Código QR de ubicación (LOC-)'),
+    ]
+
+    secuencia = models.CharField(
+        max_length=50,
+        choices=SECUENCIAS,
+        help_text="Secuencia a la que pertenece el código"
+    )
+
+    codigo = models.CharField(
+        max_length=20,
+        unique=True,
+        help_text="Código disponible (ej: INV-25-A1B2C3, LOC-F8A1B2)"
+    )
+
+    class Meta:
+        db_table = 'Tbl_Pool_Codigos'
+        verbose_name = 'Código Disponible'
+        verbose_name_plural = 'Códigos Disponibles'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['secuencia', 'id']),
+        ]
+
+    def __str__(self):
+        return self.codigo
+
+
+# ==============================================================================
+# 8. MARCAS DE CAMBIO
+# ==============================================================================
+
+class VersionModelo(models.Model):
+    """
+    Marca de cambio de un modelo (core.versiones).
+
+    Vive en la base de datos para que todos los workers de gunicorn vean la
+    misma marca aunque la caché de Django sea local a cada proceso.
+    """
+    modelo = models.CharField(
+        max_length=100,
+        primary_key=True,
+        help_text="Modelo al que pertenece la marca (ej: core.tipoequipo)"
+    )
+
+    version = models.BigIntegerField(
+        help_text="Instante del último cambio del modelo, en nanosegundos"
+    )
+
+    class Meta:
+        db_table = 'Tbl_Versiones_Modelo'
+        verbose_name = 'Marca de Cambio'
+        verbose_name_plural = 'Marcas de Cambio'
+
+    def __str__(self):
+        return f"{self.modelo} ({self.version})"
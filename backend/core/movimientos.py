@@ -0,0 +1,149 @@
+"""
+Movilización de activos en lote para el SCA Hospital.
+
+ActivoViewSet.movilizar mueve un activo por petición (≈6 consultas, una
+transacción y un log de auditoría cada vez). Para trasladar el equipamiento
+de una sala completa, movilizar_activos() hace todo en una transacción con
+una cantidad fija de consultas, sin importar cuántos activos sean:
+1. SELECT ... FOR UPDATE de los activos (bloquea las filas hasta el COMMIT)
+2. UPDATE de ubicacion_actual en una sola sentencia
+3. bulk_create del historial
+4. bulk_create de la auditoría
+
+QuerySet.update() y bulk_create() no disparan señales: las cachés (marcas
+de cambio, dashboard y fotos de inventario de origen y destino) se
+actualizan con core.signals.notificar_cambio_masivo().
+
+Uso:
+    resultados = movilizar_activos([12, 15, 18], ubicacion_destino, request.user, notas='...')
+"""
+
+from django.db import transaction
+
+from .models import Activo, HistorialMovimiento, AuditoriaLog
+from .signals import notificar_cambio_masivo
+
+
+# Resultado de cada activo en la respuesta
+MOVIDO = 'movido'
+OMITIDO = 'omitido'
+NO_ENCONTRADO = 'no_encontrado'
+
+
+def resumen_ubicacion(ubicacion):
+    """Ubicación en el formato de la respuesta de movilizar (id, nombre, departamento)."""
+    return {
+        'id': ubicacion.id,
+        'nombre': ubicacion.nombre_ubicacion,
+        'departamento': ubicacion.departamento.nombre_departamento,
+    }
+
+
+def movilizar_activos(ids_activos, ubicacion_destino, usuario, notas='', tipo_movimiento='TRASLADO'):
+    """
+    Mueve varios activos a la misma ubicación en una sola transacción.
+
+    Los activos inexistentes o que ya están en el destino no detienen el
+    lote: se informan en su resultado y el resto se moviliza.
+
+    Args:
+        ids_activos (list): IDs de los activos, sin repetir (se respeta el orden)
+        ubicacion_destino (Ubicacion): Destino, cargado con su departamento
+        usuario (Usuario): Usuario que registra el movimiento
+        notas (str): Comentarios del movimiento (historial y auditoría)
+        tipo_movimiento (str): Uno de HistorialMovimiento.TIPOS_MOVIMIENTO
+
+    Returns:
+        list: Un dict por ID, en el orden recibido:
+            {'id', 'estado': 'movido'|'omitido'|'no_encontrado', 'mensaje', ...}
+    """
+    with transaction.atomic():
+        # Orden por ID: dos lotes concurrentes bloquean las filas en el mismo orden (sin deadlock)
+        activos = {
+            activo.id: activo
+            for activo in Activo.objects.select_for_update(of=('self',))
+            .select_related('ubicacion_actual__departamento')
+            .filter(pk__in=ids_activos)
+            .order_by('pk')
+        }
+
+        a_mover = [
+            activos[id_activo] for id_activo in ids_activos
+            if id_activo in activos and activos[id_activo].ubicacion_actual_id != ubicacion_destino.id
+        ]
+
+        historiales = []
+        if a_mover:
+            Activo.objects.filter(pk__in=[activo.id for activo in a_mover]).update(
+                ubicacion_actual=ubicacion_destino
+            )
+
+            historiales = HistorialMovimiento.objects.bulk_create([
+                HistorialMovimiento(
+                    activo=activo,
+                    usuario_registra=usuario,
+                    ubicacion_origen=activo.ubicacion_actual,
+                    ubicacion_destino=ubicacion_destino,
+                    tipo_movimiento=tipo_movimiento,
+                    comentarios=notas
+                )
+                for activo in a_mover
+            ])
+
+            # Mismo detalle que la movilización individual (ActivoViewSet.movilizar)
+            AuditoriaLog.objects.bulk_create([
+                AuditoriaLog(
+                    usuario=usuario,
+                    accion='MOVILIZACION_ACTIVO',
+                    detalle_accion={
+                        'activo_id': activo.id,
+                        'activo_codigo': activo.codigo_inventario,
+                        'activo_marca': activo.marca,
+                        'activo_modelo': activo.modelo,
+                        'origen_id': activo.ubicacion_actual.id,
+                        'origen_nombre': activo.ubicacion_actual.nombre_ubicacion,
+                        'origen_departamento': activo.ubicacion_actual.departamento.nombre_departamento,
+                        'destino_id': ubicacion_destino.id,
+                        'destino_nombre': ubicacion_destino.nombre_ubicacion,
+                        'destino_departamento': ubicacion_destino.departamento.nombre_departamento,
+                        'notas': notas,
+                        'historial_id': historial.id,
+                        'lote': True
+                    }
+                )
+                for activo, historial in zip(a_mover, historiales)
+            ])
+
+            notificar_cambio_masivo(
+                Activo, HistorialMovimiento,
+                ids_ubicacion={activo.ubicacion_actual_id for activo in a_mover} | {ubicacion_destino.id}
+            )
+
+    historial_por_activo = {historial.activo_id: historial for historial in historiales}
+    resultados = []
+    for id_activo in ids_activos:
+        activo = activos.get(id_activo)
+        if activo is None:
+            resultados.append({
+                'id': id_activo,
+                'estado': NO_ENCONTRADO,
+                'mensaje': f'El activo con ID {id_activo} no existe'
+            })
+        elif id_activo not in historial_por_activo:
+            resultados.append({
+                'id': id_activo,
+                'activo_codigo': activo.codigo_inventario,
+                'estado': OMITIDO,
+                'mensaje': 'El activo ya se encuentra en la ubicación destino'
+            })
+        else:
+            historial = historial_por_activo[id_activo]
+            resultados.append({
+                'id': id_activo,
+                'activo_codigo': activo.codigo_inventario,
+                'estado': MOVIDO,
+                'ubicacion_origen': resumen_ubicacion(activo.ubicacion_actual),
+                'historial_id': historial.id,
+                'fecha_movimiento': historial.fecha_movimiento.isoformat()
+            })
+    return resultados
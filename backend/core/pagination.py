@@ -0,0 +1,248 @@
+"""
+Clases de paginación para la API REST del Sistema de Control de Activos (SCA) Hospital.
+
+Este módulo define paginadores personalizados de Django REST Framework para
+las tablas que solo crecen (historial de movimientos y auditoría).
+
+Características:
+- Tamaño de página elegido por el cliente (?page_size=) con un máximo configurable
+- Conteo aproximado (estadísticas de PostgreSQL) para listados grandes sin filtros
+- Paginación por cursor (keyset): cada página cuesta lo mismo que la primera
+- Sin COUNT(*) sobre toda la tabla ni OFFSET creciente
+- Ordenamiento sobre los índices existentes (-fecha_movimiento, -timestamp); otros
+  ?ordering= usan la paginación numerada
+- Compatibilidad: los clientes que envían ?page= siguen recibiendo paginación numerada
+
+Configuración (config/settings.py):
+- API_MAX_PAGE_SIZE: máximo de filas por página que puede pedir un cliente
+- API_CONTEO_ESTIMADO_MINIMO: filas estimadas a partir de las cuales se usa el conteo aproximado
+
+Formato de respuesta (cursor):
+{
+    "next": "http://.../api/historial-movimientos/?cursor=cD0yMDI1...",
+    "previous": null,
+    "results": [...]
+}
+"""
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+def estimar_total_filas(queryset):
+    """
+    Estima el total de filas de un queryset SIN filtros usando pg_class.reltuples.
+
+    El valor lo mantiene PostgreSQL (ANALYZE / autovacuum) y leerlo no recorre
+    la tabla, a diferencia de COUNT(*).
+
+    Returns:
+        int: Filas estimadas, o None si no aplica (otro motor, queryset con
+            filtros/DISTINCT/LIMIT, tabla sin estadísticas o por debajo del
+            umbral API_CONTEO_ESTIMADO_MINIMO). En ese caso se usa COUNT(*).
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    query = queryset.query
+    if query.where.children or query.distinct or query.low_mark or query.high_mark is not None:
+        return None
+
+    tabla = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)", [tabla])
+        fila = cursor.fetchone()
+
+    if not fila or fila[0] is None or fila[0] < settings.API_CONTEO_ESTIMADO_MINIMO:
+        return None
+    return int(fila[0])
+
+
+class PaginaConteoEstimado(Page):
+    """Página cuyo 'siguiente' se decide leyendo una fila de más, no con el total."""
+
+    def __init__(self, object_list, number, paginator, hay_siguiente):
+        super().__init__(object_list, number, paginator)
+        self.hay_siguiente = hay_siguiente
+
+    def has_next(self):
+        return self.hay_siguiente
+
+    def end_index(self):
+        return (self.number - 1) * self.paginator.per_page + len(self.object_list)
+
+
+class PaginadorConteoEstimado(Paginator):
+    """
+    Paginator de Django que usa el conteo estimado cuando está disponible.
+
+    La estimación solo se informa en 'count': entre dos ANALYZE puede quedar
+    por debajo o por encima del total real. Con ella, la página se lee con una
+    fila de más para saber si hay siguiente, y un número de página mayor que
+    el estimado no es inválido (si no hay filas, la página viene vacía).
+
+    Atributo conteo_aproximado: True si 'count' viene de las estadísticas.
+    """
+
+    conteo_aproximado = False
+
+    @cached_property
+    def count(self):
+        estimado = estimar_total_filas(self.object_list)
+        if estimado is not None:
+            self.conteo_aproximado = True
+            return estimado
+        return super().count
+
+    def validate_number(self, number):
+        if not (self.count and self.conteo_aproximado):
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.conteo_aproximado:
+            return super().page(number)
+        desde = (number - 1) * self.per_page
+        filas = list(self.object_list[desde:desde + self.per_page + 1])
+        return PaginaConteoEstimado(filas[:self.per_page], number, self, len(filas) > self.per_page)
+
+
+class PaginacionEstandar(PageNumberPagination):
+    """
+    Paginación numerada por defecto de la API.
+
+    - ?page_size=N permite al cliente elegir el tamaño (máximo API_MAX_PAGE_SIZE)
+    - En tablas grandes sin filtros, 'count' es una estimación de PostgreSQL y la
+      respuesta incluye 'count_aproximado': true. 'next' no depende de ella:
+      sigue habiendo enlace mientras queden filas, aunque superen la estimación
+
+    Formato de respuesta:
+    {
+        "count": 125000,
+        "count_aproximado": true,
+        "next": "http://.../api/activos/?page=2&page_size=1000",
+        "previous": null,
+        "results": [...]
+    }
+    """
+
+    django_paginator_class = PaginadorConteoEstimado
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.API_MAX_PAGE_SIZE
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_aproximado': self.page.paginator.conteo_aproximado,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        respuesta = super().get_paginated_response_schema(schema)
+        respuesta['properties']['count_aproximado'] = {
+            'type': 'boolean',
+            'example': False,
+        }
+        return respuesta
+
+
+class CursorConCompatibilidadPagination(CursorPagination):
+    """
+    Paginación por cursor con respaldo a paginación numerada.
+
+    - Sin ?page=: paginación por cursor (WHERE fecha < cursor ORDER BY fecha DESC LIMIT n)
+    - Con ?page=: PaginacionEstandar (para vistas que aún navegan por número de página)
+    - ?page_size=N en ambos modos (máximo API_MAX_PAGE_SIZE)
+
+    El cursor solo se posiciona sobre el campo de `ordering` (indexado y casi
+    único), en cualquiera de los dos sentidos. Con ?ordering= sobre otro campo
+    (ej: tipo_movimiento, accion) se usa también la paginación numerada: el
+    cursor de DRF resuelve los empates con un OFFSET limitado a offset_cutoff
+    filas y, con más de 1000 filas de igual valor, el enlace 'next' deja de
+    avanzar. Los enlaces de ambos modos se siguen igual desde el cliente.
+    """
+
+    paginador_numerado_class = PaginacionEstandar
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        self.paginador_numerado = None
+
+    @property
+    def max_page_size(self):
+        return settings.API_MAX_PAGE_SIZE
+
+    def usa_paginacion_numerada(self, request, queryset=None, view=None):
+        """True si el cliente pidió una página por número (?page=) o un orden que el cursor no admite."""
+        if request.query_params.get('page') is not None:
+            return True
+        campos = [campo.lstrip('-') for campo in super().get_ordering(request, queryset, view)]
+        return campos != [self.ordering.lstrip('-')]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.usa_paginacion_numerada(request, queryset, view):
+            # Desempate por ID: con OFFSET, un orden no único puede repetir u omitir filas entre páginas
+            orden = list(queryset.query.order_by)
+            if orden and not {'pk', '-pk'} & set(orden):
+                queryset = queryset.order_by(*orden, '-pk')
+            self.paginador_numerado = self.paginador_numerado_class()
+            return self.paginador_numerado.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.paginador_numerado is not None:
+            return self.paginador_numerado.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def columnas_ordenamiento(self, request, queryset, view=None):
+        """
+        Campos (sin signo) que el cursor leerá de cada fila para armar los enlaces.
+
+        Las vistas que paginan filas .values() deben incluir estas columnas.
+        """
+        if self.usa_paginacion_numerada(request, queryset, view):
+            return []
+        return [campo.lstrip('-') for campo in self.get_ordering(request, queryset, view)]
+
+
+class HistorialCursorPagination(CursorConCompatibilidadPagination):
+    """
+    Paginación por cursor para Tbl_Historial_Movimientos.
+
+    Usa el índice existente sobre -fecha_movimiento.
+    """
+
+    ordering = '-fecha_movimiento'
+
+
+class AuditoriaCursorPagination(CursorConCompatibilidadPagination):
+    """
+    Paginación por cursor para Tbl_Auditoria_Logs.
+
+    Usa el índice existente sobre -timestamp.
+    """
+
+    ordering = '-timestamp'
@@ -0,0 +1,124 @@
+"""
+Perfil del usuario autenticado en caché (autenticación JWT y /api/usuarios/me/).
+
+El frontend llama a /api/usuarios/me/ al iniciar y en cada guardia de ruta, y
+cada petición autenticada cargaba el Usuario con su rol desde la base. El
+perfil de cada usuario se guarda en la caché de Django con:
+- Los campos del Usuario (sin la contraseña) y de su Rol para reconstruir request.user
+- La respuesta de /api/usuarios/me/ ya serializada
+
+Con el perfil vigente, autenticar y responder /api/usuarios/me/ no consulta la
+base: el perfil y la marca de Rol se leen en un solo acceso a la caché.
+
+Solo se usa con una caché compartida (REDIS_URL). Con la caché local de cada
+proceso, invalidar_perfil() solo borraría la copia del worker que guardó el
+usuario y los demás seguirían autenticando con el is_active / rol anterior.
+Una copia por proceso validada con las marcas de la base costaría una
+consulta, la misma que cargar el usuario: sin caché compartida el usuario se
+carga con su rol en una consulta (JOIN) en cada petición.
+
+Invalidación:
+- Por usuario: al guardar o eliminar ese Usuario (core.signals), lo que
+  incluye cambios de rol asignado, contraseña, is_active y último login
+- Global: el perfil guarda la marca de Rol de la caché compartida
+  (core.versiones.marcas_en_cache), que se renueva al guardar o eliminar
+  cualquier rol; los perfiles con otra marca se descartan al leerlos
+- Usuario.objects.update() / bulk_update() no disparan señales: el código que
+  los use debe llamar a invalidar_perfil() por cada usuario modificado (y
+  Rol.objects.update(), a registrar_cambio(Rol))
+
+Configuración (config/settings.py):
+- PERFIL_USUARIO_CACHE_TTL: segundos de vida máxima de cada perfil (acota el
+  caso raro de un perfil calculado justo antes de confirmarse un cambio, o de
+  cambios hechos con QuerySet.update() que no disparan señales)
+
+Uso:
+    usuario, perfil = obtener_usuario_con_perfil(5)   # (None, None) si no existe
+    perfil['datos']                                   # respuesta de /api/usuarios/me/
+                                                      # (perfil es None sin caché compartida)
+    invalidar_perfil(5)
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import Rol, Usuario
+from .serializers import UsuarioSerializer
+from .versiones import cache_compartida, marcas_en_cache
+
+
+# Campos que se guardan en la caché: la contraseña queda diferida (no sale de la base)
+CAMPOS_PERFIL = [
+    campo.attname for campo in Usuario._meta.concrete_fields if campo.attname != 'password'
+]
+CAMPOS_ROL = [campo.attname for campo in Rol._meta.concrete_fields]
+
+
+def _clave_perfil(usuario_id):
+    return f'usuario:perfil:{usuario_id}'
+
+
+def calcular_perfil(usuario):
+    """
+    Arma el perfil de un usuario cargado con su rol (sin consultas adicionales).
+
+    Returns:
+        dict: {'campos': {...}, 'rol': {...}|None, 'huella_password': str|None, 'datos': {...}}
+    """
+    return {
+        'campos': {campo: getattr(usuario, campo) for campo in CAMPOS_PERFIL},
+        'rol': (
+            {campo: getattr(usuario.rol, campo) for campo in CAMPOS_ROL} if usuario.rol_id is not None else None
+        ),
+        # Solo hace falta si simplejwt revoca tokens al cambiar la contraseña
+        'huella_password': (
+            get_md5_hash_password(usuario.password) if jwt_settings.CHECK_REVOKE_TOKEN else None
+        ),
+        'datos': UsuarioSerializer(usuario).data,
+    }
+
+
+def _usuario_desde_perfil(perfil):
+    """Reconstruye el Usuario guardado con su rol (sin consultas)."""
+    campos = perfil['campos']
+    usuario = Usuario.from_db(DEFAULT_DB_ALIAS, CAMPOS_PERFIL, [campos[campo] for campo in CAMPOS_PERFIL])
+    if perfil['rol'] is not None:
+        usuario.rol = Rol.from_db(DEFAULT_DB_ALIAS, CAMPOS_ROL, [perfil['rol'][campo] for campo in CAMPOS_ROL])
+    return usuario
+
+
+def obtener_usuario_con_perfil(usuario_id):
+    """
+    Retorna (usuario, perfil) desde la caché; si no está o quedó viejo, lo carga
+    con su rol en una consulta y lo guarda.
+
+    Si el perfil está vigente no hay consultas. Sin caché compartida no se
+    guarda nada: el usuario se carga en una consulta y el perfil es None.
+
+    Returns:
+        tuple: (Usuario, dict|None) o (None, None) si el usuario no existe
+    """
+    if not cache_compartida():
+        return Usuario.objects.select_related('rol').filter(pk=usuario_id).first(), None
+
+    clave = _clave_perfil(usuario_id)
+    guardados, versiones = marcas_en_cache([Rol], claves=[clave])
+    guardado = guardados.get(clave)
+    version_rol = versiones[Rol]
+    if guardado is not None and guardado['version_rol'] == version_rol:
+        return _usuario_desde_perfil(guardado['perfil']), guardado['perfil']
+
+    usuario = Usuario.objects.select_related('rol').filter(pk=usuario_id).first()
+    if usuario is None:
+        return None, None
+    perfil = calcular_perfil(usuario)
+    cache.set(clave, {'version_rol': version_rol, 'perfil': perfil}, settings.PERFIL_USUARIO_CACHE_TTL)
+    return usuario, perfil
+
+
+def invalidar_perfil(usuario_id):
+    """Borra de la caché el perfil del usuario dado (por ID)."""
+    cache.delete(_clave_perfil(usuario_id))
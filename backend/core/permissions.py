@@ -1,227 +1,277 @@
 """
 Sistema de Control de Acceso Basado en Roles (RBAC) para el SCA Hospital.
 
-Este módulo define permisos personalizados de Django REST Framework que implementan
-la lógica de autorización según los roles definidos en la base de datos:
+La matriz de permisos se declara una sola vez en POLITICA_ACCESO (vista ->
+acción -> rol -> métodos HTTP) y se compila en una tabla plana con claves
+(id del rol, vista, acción, método). El permiso PoliticaAcceso resuelve cada
+petición con una búsqueda en esa tabla en lugar de encadenar clases.
+
+Roles definidos en la base de datos:
 - Administrador: Acceso total a todos los recursos
-- Técnico: Operaciones CRUD excepto DELETE en activos, sin acceso a maestros
-- Jefe de Departamento: Solo lectura en activos y auditoría
+- Técnico: Operaciones CRUD excepto DELETE en activos, solo lectura en maestros
+- Jefe de Departamento: Solo lectura en activos, historial y auditoría
 
 Arquitectura de Seguridad:
 - Todos los permisos verifican autenticación primero
-- Se valida la existencia del rol antes de evaluar permisos
-- Principio de menor privilegio: se deniega por defecto
-- Separación de responsabilidades por tipo de operación
+- Usuarios sin rol solo acceden a lo permitido a cualquier autenticado
+- Principio de menor privilegio: lo que no está en la tabla se deniega
+- La tabla se recompila cuando cambia el catálogo de roles (core.catalogos),
+  ya que las claves usan el ID del rol y la política se escribe por nombre.
+  Con caché compartida el cambio se detecta con la marca de Rol en la caché,
+  la misma que valida el perfil del usuario (core.perfil): sin consultas
+
+Cada ViewSet declara su entrada de la matriz en el atributo `politica`
+(ej: politica = 'ActivoViewSet'), así renombrar o heredar la clase no cambia
+sus permisos. Un chequeo de Django (comprobar_politica_vistas) detiene el
+arranque si una vista registrada en el router no tiene entrada en la matriz.
+
+Inspección:
+    python manage.py politica_acceso
 """
 
+from django.core import checks
 from rest_framework import permissions
 
-
-class IsAdminUser(permissions.BasePermission):
-    """
-    Permiso exclusivo para usuarios con rol 'Administrador'.
-    
-    Casos de uso:
-    - Gestión de usuarios (crear, editar, eliminar)
-    - Gestión de maestros (departamentos, ubicaciones, tipos de equipo, estados)
-    - Acceso completo a todos los recursos del sistema
-    
-    Retorna:
-        True: Si el usuario autenticado tiene rol 'Administrador'
-        False: En cualquier otro caso
-    """
-    
-    def has_permission(self, request, view):
-        # Verificar autenticación
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Verificar existencia de rol
-        if not hasattr(request.user, 'rol') or not request.user.rol:
-            return False
-        
-        # Validar rol de Administrador
-        return request.user.rol.nombre_rol == 'Administrador'
-    
-    message = 'Solo los Administradores tienen acceso a este recurso.'
-
-
-class IsJefeOrAdminReadOnly(permissions.BasePermission):
-    """
-    Permiso para Técnicos, Jefes de Departamento (solo lectura) y Administradores (acceso total).
-
-    Reglas de negocio:
-    - Administrador: Acceso completo (GET, POST, PUT, PATCH, DELETE)
-    - Técnico: Solo métodos seguros (GET, HEAD, OPTIONS) - Necesita ver historial
-    - Jefe de Departamento: Solo métodos seguros (GET, HEAD, OPTIONS)
-    - Otros roles: Acceso denegado
-
-    Casos de uso:
-    - Técnicos pueden consultar historial de movimientos para auditoría
-    - Jefes pueden consultar activos para supervisión
-    - Jefes pueden ver auditoría y historial para control
-    - Técnicos y Jefes NO pueden modificar datos (principio de segregación de funciones)
-
-    Retorna:
-        True: Si es Admin (cualquier método) o Técnico/Jefe (solo lectura)
-        False: En cualquier otro caso
+from .catalogos import obtener_catalogo
+from .models import Rol
+from .versiones import cache_compartida, marcas_en_cache
+
+
+# ==============================================================================
+# ROLES Y MÉTODOS
+# ==============================================================================
+
+ADMINISTRADOR = 'Administrador'
+TECNICO = 'Técnico'
+JEFE = 'Jefe de Departamento'
+
+# Cualquier usuario autenticado, tenga o no rol asignado
+AUTENTICADO = '*'
+
+# Acción comodín: reglas de las acciones no declaradas explícitamente en la vista
+TODAS_LAS_ACCIONES = '*'
+
+LECTURA = frozenset(permissions.SAFE_METHODS)
+OPERACION = LECTURA | {'POST', 'PUT', 'PATCH'}
+TOTAL = OPERACION | {'DELETE'}
+
+SOLO_ADMIN = {ADMINISTRADOR: TOTAL}
+ADMIN_O_LECTURA = {ADMINISTRADOR: TOTAL, TECNICO: LECTURA, JEFE: LECTURA}
+OPERATIVO = {ADMINISTRADOR: TOTAL, TECNICO: OPERACION, JEFE: LECTURA}
+CONSULTA_AUTENTICADO = {ADMINISTRADOR: TOTAL, AUTENTICADO: LECTURA}
+
+
+# ==============================================================================
+# MATRIZ DE PERMISOS
+# ==============================================================================
+
+# Matriz de ActivoViewSet (OPERATIVO):
+#
+# ┌─────────────────┬───────┬─────────┬──────┐
+# │ Acción          │ Admin │ Técnico │ Jefe │
+# ├─────────────────┼───────┼─────────┼──────┤
+# │ GET (List)      │   ✓   │    ✓    │  ✓   │
+# │ GET (Retrieve)  │   ✓   │    ✓    │  ✓   │
+# │ POST (Create)   │   ✓   │    ✓    │  ✗   │
+# │ PUT (Update)    │   ✓   │    ✓    │  ✗   │
+# │ PATCH (Partial) │   ✓   │    ✓    │  ✗   │
+# │ DELETE          │   ✓   │    ✗    │  ✗   │
+# │ movilizar       │   ✓   │    ✓    │  ✗   │
+# │ movilizar-lote  │   ✓   │    ✓    │  ✗   │
+# │ lote POST/PATCH │   ✓   │    ✓    │  ✗   │
+# └─────────────────┴───────┴─────────┴──────┘
+POLITICA_ACCESO = {
+    'RolViewSet': {
+        TODAS_LAS_ACCIONES: SOLO_ADMIN,
+    },
+    'UsuarioViewSet': {
+        TODAS_LAS_ACCIONES: SOLO_ADMIN,
+        # El frontend lo usa para conocer el rol del usuario conectado
+        # (la ruta solo acepta GET; el resto de métodos recibe 405)
+        'me': {AUTENTICADO: TOTAL},
+    },
+    # Los Técnicos necesitan ver departamentos y ubicaciones para filtrar y movilizar
+    'DepartamentoViewSet': {
+        TODAS_LAS_ACCIONES: SOLO_ADMIN,
+        'list': CONSULTA_AUTENTICADO,
+        'retrieve': CONSULTA_AUTENTICADO,
+    },
+    'UbicacionViewSet': {
+        TODAS_LAS_ACCIONES: SOLO_ADMIN,
+        'list': CONSULTA_AUTENTICADO,
+        'retrieve': CONSULTA_AUTENTICADO,
+    },
+    'TipoEquipoViewSet': {
+        TODAS_LAS_ACCIONES: ADMIN_O_LECTURA,
+    },
+    'EstadoActivoViewSet': {
+        TODAS_LAS_ACCIONES: ADMIN_O_LECTURA,
+    },
+    'ActivoViewSet': {
+        TODAS_LAS_ACCIONES: OPERATIVO,
+        'movilizar': {ADMINISTRADOR: TOTAL, TECNICO: OPERACION},
+        'movilizar_lote': {ADMINISTRADOR: TOTAL, TECNICO: OPERACION},
+    },
+    'HistorialMovimientoViewSet': {
+        TODAS_LAS_ACCIONES: OPERATIVO,
+    },
+    'AuditoriaLogViewSet': {
+        TODAS_LAS_ACCIONES: ADMIN_O_LECTURA,
+    },
+    'ReporteViewSet': {
+        TODAS_LAS_ACCIONES: ADMIN_O_LECTURA,
+    },
+    'DashboardViewSet': {
+        TODAS_LAS_ACCIONES: ADMIN_O_LECTURA,
+    },
+    'EscaneoViewSet': {
+        TODAS_LAS_ACCIONES: OPERATIVO,
+    },
+    # Cada sección de la respuesta se filtra con los permisos de 'list' de su vista
+    'BootstrapViewSet': {
+        TODAS_LAS_ACCIONES: {AUTENTICADO: LECTURA},
+    },
+}
+
+
+# ==============================================================================
+# TABLA COMPILADA
+# ==============================================================================
+
+def compilar_politica(roles, politica=POLITICA_ACCESO):
     """
+    Compila la política en una tabla plana.
 
-    def has_permission(self, request, view):
-        # Verificar autenticación
-        if not request.user or not request.user.is_authenticated:
-            return False
-
-        # Verificar existencia de rol
-        if not hasattr(request.user, 'rol') or not request.user.rol:
-            return False
-
-        rol_nombre = request.user.rol.nombre_rol
-
-        # Administrador: acceso total
-        if rol_nombre == 'Administrador':
-            return True
-
-        # Técnico y Jefe de Departamento: solo lectura (métodos seguros)
-        if rol_nombre in ['Técnico', 'Jefe de Departamento']:
-            return request.method in permissions.SAFE_METHODS
-
-        # Otros roles: denegado
-        return False
-
-    message = 'Solo Administradores pueden modificar este recurso. Técnicos y Jefes tienen acceso de solo lectura.'
+    Cada acción declarada tiene una entrada (permitida o no) por rol y método,
+    incluido el rol None (usuario sin rol), para que la búsqueda no tenga que
+    combinar reglas en tiempo de petición.
 
+    Args:
+        roles (dict): ID del rol -> nombre del rol
+        politica (dict): Vista -> acción -> rol -> métodos
 
-class IsTecnicoOperativo(permissions.BasePermission):
+    Returns:
+        dict: (rol_id, vista, accion, metodo) -> bool
     """
-    Permiso para Técnicos (operaciones CRUD sin DELETE) y Administradores (acceso total).
-    
-    Reglas de negocio:
-    - Administrador: Acceso completo (GET, POST, PUT, PATCH, DELETE)
-    - Técnico: Lectura y escritura (GET, POST, PUT, PATCH) pero NO DELETE
-    - Otros roles: Acceso denegado
-    
-    Casos de uso:
-    - Técnicos pueden registrar nuevos activos (POST)
-    - Técnicos pueden actualizar información de activos (PUT/PATCH)
-    - Técnicos pueden movilizar activos entre ubicaciones (POST a acción personalizada)
-    - Técnicos NO pueden eliminar activos (requiere aprobación de Admin)
-    
-    IMPORTANTE: Este permiso debe combinarse con CanDeleteActivo para bloquear DELETE.
-    
-    Retorna:
-        True: Si es Admin (cualquier método) o Técnico (excepto DELETE)
-        False: En cualquier otro caso
+    rol_ids = [*roles, None]
+    tabla = {}
+    for vista, acciones in politica.items():
+        for accion, reglas in acciones.items():
+            for rol_id in rol_ids:
+                nombre_rol = roles.get(rol_id)
+                metodos = reglas.get(AUTENTICADO, frozenset())
+                if nombre_rol is not None:
+                    metodos = metodos | reglas.get(nombre_rol, frozenset())
+                for metodo in TOTAL:
+                    tabla[(rol_id, vista, accion, metodo)] = metodo in metodos
+    return tabla
+
+
+# Tabla vigente: (marca de Rol con que se compiló, tabla)
+_politica_compilada = (None, {})
+
+
+def tabla_politica():
+    """Retorna la tabla compilada, recompilándola si cambió el catálogo de roles."""
+    global _politica_compilada
+    version, tabla = _politica_compilada
+    if cache_compartida():
+        # Marca de la caché: la base solo se consulta si hay que recompilar
+        vigente = marcas_en_cache([Rol])[1][Rol]
+        if version != vigente:
+            catalogo = obtener_catalogo(Rol)
+            tabla = compilar_politica({rol.pk: rol.nombre_rol for rol in catalogo.instancias})
+            _politica_compilada = (vigente, tabla)
+        return tabla
+
+    catalogo = obtener_catalogo(Rol)
+    if version != catalogo.version:
+        tabla = compilar_politica({rol.pk: rol.nombre_rol for rol in catalogo.instancias})
+        _politica_compilada = (catalogo.version, tabla)
+    return tabla
+
+
+def permite(tabla, rol_id, vista, accion, metodo):
     """
-    
-    def has_permission(self, request, view):
-        # Verificar autenticación
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # Verificar existencia de rol
-        if not hasattr(request.user, 'rol') or not request.user.rol:
-            return False
-        
-        rol_nombre = request.user.rol.nombre_rol
-        
-        # Administrador: acceso total
-        if rol_nombre == 'Administrador':
-            return True
-        
-        # Técnico: lectura y escritura, pero NO DELETE
-        if rol_nombre == 'Técnico':
-            # Métodos permitidos: GET, HEAD, OPTIONS, POST, PUT, PATCH
-            # Método bloqueado: DELETE
-            return request.method in ['GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH']
-        
-        # Otros roles: denegado
-        return False
-    
-    message = 'Solo Administradores y Técnicos (sin DELETE) tienen acceso.'
-
-
-class CanDeleteActivo(permissions.BasePermission):
+    Consulta la tabla: primero la acción exacta y, si la vista no la declara,
+    sus reglas comodín. Lo que no está en la tabla se deniega.
     """
-    Permiso específico para operaciones DELETE.
-
-    Reglas de negocio:
-    - Solo Administradores pueden eliminar recursos
-    - Técnicos y Jefes NO pueden eliminar (control de auditoría)
-    - Para métodos distintos a DELETE, este permiso no aplica (retorna True)
+    permitido = tabla.get((rol_id, vista, accion, metodo))
+    if permitido is None:
+        permitido = tabla.get((rol_id, vista, TODAS_LAS_ACCIONES, metodo), False)
+    return permitido
 
-    Casos de uso:
-    - Prevenir eliminación accidental de activos por técnicos
-    - Mantener trazabilidad completa (solo Admin puede eliminar registros)
-    - Cumplir con políticas de auditoría hospitalaria
 
-    IMPORTANTE: Este permiso debe usarse en combinación con otros permisos.
-    Se evalúa DESPUÉS de los permisos de rol para validar DELETE específicamente.
-
-    Retorna:
-        True: Si el método NO es DELETE, o si es DELETE y el usuario es Admin
-        False: Si es DELETE y el usuario NO es Admin
+def accion_de_ruta(view):
     """
+    Acción con la que se evalúa la petición.
 
-    def has_permission(self, request, view):
-        # Si no es DELETE, permitir (otros permisos ya validaron el acceso)
-        if request.method != 'DELETE':
-            return True
-
-        # Si es DELETE, verificar que sea Administrador
-        if not request.user or not request.user.is_authenticated:
-            return False
-
-        if not hasattr(request.user, 'rol') or not request.user.rol:
-            return False
-
-        return request.user.rol.nombre_rol == 'Administrador'
+    En las rutas de acciones extra (@action, ej: /usuarios/me/) los métodos no
+    mapeados y OPTIONS (acción 'metadata') se evalúan con la acción de la ruta,
+    igual que cuando los permisos se declaraban en el decorador @action.
+    """
+    accion = getattr(view, 'action', None)
+    if accion in (None, 'metadata'):
+        acciones_ruta = set((getattr(view, 'action_map', None) or {}).values())
+        if len(acciones_ruta) == 1:
+            accion_ruta = next(iter(acciones_ruta))
+            if accion_ruta in {extra.__name__ for extra in view.get_extra_actions()}:
+                return accion_ruta
+    return accion
 
-    message = 'Solo los Administradores pueden eliminar recursos.'
 
+# ==============================================================================
+# PERMISO DRF
+# ==============================================================================
 
-class IsAdminOrReadOnly(permissions.BasePermission):
+class PoliticaAcceso(permissions.BasePermission):
     """
-    Permiso para maestros: Admin puede modificar, Técnicos y Jefes solo lectura.
-
-    Reglas de negocio:
-    - Administrador: Acceso completo (GET, POST, PUT, PATCH, DELETE)
-    - Técnico: Solo lectura (GET, HEAD, OPTIONS) - Necesita ver maestros para operar
-    - Jefe de Departamento: Solo lectura (GET, HEAD, OPTIONS)
-    - Otros roles: Acceso denegado
-
-    Casos de uso:
-    - Técnicos necesitan ver ubicaciones para movilizar activos
-    - Técnicos necesitan ver tipos de equipo para registrar activos
-    - Técnicos necesitan ver estados para actualizar activos
-    - Solo Admin puede modificar maestros (integridad de datos)
-
-    Retorna:
-        True: Si es Admin (cualquier método) o Técnico/Jefe (solo lectura)
-        False: En cualquier otro caso
+    Permiso único de la API: consulta la tabla compilada de POLITICA_ACCESO.
+
+    La vista se identifica por su atributo `politica` y la acción por
+    view.action (list, retrieve, create, movilizar, ...). Usa el rol_id del
+    usuario, por lo que no necesita cargar el objeto Rol.
     """
 
+    message = 'Su rol no tiene permiso para realizar esta acción.'
+
     def has_permission(self, request, view):
         # Verificar autenticación
         if not request.user or not request.user.is_authenticated:
             return False
 
-        # Verificar existencia de rol
-        if not hasattr(request.user, 'rol') or not request.user.rol:
-            return False
+        return permite(
+            tabla_politica(),
+            getattr(request.user, 'rol_id', None),
+            getattr(view, 'politica', None),
+            accion_de_ruta(view),
+            request.method
+        )
 
-        rol_nombre = request.user.rol.nombre_rol
 
-        # Administrador: acceso total
-        if rol_nombre == 'Administrador':
-            return True
-
-        # Técnico y Jefe: solo lectura (métodos seguros)
-        if rol_nombre in ['Técnico', 'Jefe de Departamento']:
-            return request.method in permissions.SAFE_METHODS
-
-        # Otros roles: denegado
-        return False
-
-    message = 'Solo Administradores pueden modificar este recurso. Técnicos y Jefes tienen acceso de solo lectura.'
+# ==============================================================================
+# CHEQUEO DE ARRANQUE
+# ==============================================================================
 
+def comprobar_politica_vistas(app_configs=None, **kwargs):
+    """
+    Chequeo de Django (registrado en CoreConfig.ready): cada ViewSet del router
+    que usa PoliticaAcceso debe declarar `politica` con una entrada de
+    POLITICA_ACCESO. Sin él, la vista denegaría todas las peticiones.
+    """
+    from .urls import router
+
+    errores = []
+    for prefijo, vista, _ in router.registry:
+        if PoliticaAcceso not in vista.permission_classes:
+            continue
+        politica = getattr(vista, 'politica', None)
+        if politica not in POLITICA_ACCESO:
+            errores.append(checks.Error(
+                f"{vista.__name__} (/api/{prefijo}/) no tiene entrada en POLITICA_ACCESO "
+                f"(politica = {politica!r}).",
+                hint="Declare `politica` en la vista y agregue su entrada en core.permissions.POLITICA_ACCESO.",
+                obj=vista,
+                id='core.E001',
+            ))
+    return errores
@@ -0,0 +1,276 @@
+"""
+Proyecciones de lectura para la API REST del Sistema de Control de Activos (SCA) Hospital.
+
+Una proyección describe cómo armar la representación JSON de un recurso a partir
+de filas .values() (diccionarios), sin instanciar modelos ni serializers.
+
+Características:
+- Cada clave de salida declara las columnas que necesita (rutas de .values())
+- Las relaciones se pueden expandir (objeto anidado) o no (solo el ID)
+- Soporta campos dispersos: ?fields=id,marca y expansión selectiva: ?expand=tipo
+- Solo se consultan las columnas (y JOINs) que la respuesta realmente usa
+- Lectura plana (encabezado, valor) para exportaciones CSV / XLSX
+
+Ejemplo:
+    GET /api/activos/?fields=id,codigo_inventario,marca,modelo
+    GET /api/activos/?fields=id,codigo_inventario,ubicacion_actual&expand=ubicacion_actual
+"""
+
+from rest_framework import serializers
+
+# Campo reutilizado para formatear fechas exactamente igual que los ModelSerializer
+_campo_fecha = serializers.DateTimeField()
+
+
+def formatear_fecha(valor):
+    """Formatea un datetime igual que serializers.DateTimeField (None si no hay valor)."""
+    if valor is None:
+        return None
+    return _campo_fecha.to_representation(valor)
+
+
+class Columna:
+    """
+    Valor leído directamente de una columna de la fila.
+
+    Args:
+        ruta (str): Ruta de .values() (ej: 'marca', 'tipo__nombre_tipo')
+        formato (callable): Conversión opcional del valor (ej: formatear_fecha)
+        por_defecto: Valor a usar cuando la columna viene en NULL
+    """
+
+    def __init__(self, ruta, formato=None, por_defecto=None):
+        self.ruta = ruta
+        self.formato = formato
+        self.por_defecto = por_defecto
+
+    def columnas(self, expandido):
+        return [self.ruta]
+
+    def lector(self, expandido):
+        ruta, formato, por_defecto = self.ruta, self.formato, self.por_defecto
+        if formato is not None:
+            return lambda fila: formato(fila[ruta])
+        if por_defecto is not None:
+            return lambda fila: fila[ruta] if fila[ruta] is not None else por_defecto
+        return lambda fila: fila[ruta]
+
+    def lectores_planos(self, encabezado, expandido):
+        return [(encabezado, self.lector(expandido))]
+
+
+class Relacion:
+    """
+    Relación que se devuelve como objeto anidado (expandida) o como ID (no expandida).
+
+    Args:
+        ruta_id (str): Columna con el ID de la relación (ej: 'tipo_id')
+        campos (dict): Claves del objeto anidado -> Columna/Relacion (en orden de salida)
+    """
+
+    def __init__(self, ruta_id, campos):
+        self.ruta_id = ruta_id
+        self.campos = campos
+
+    def columnas(self, expandido):
+        if not expandido:
+            return [self.ruta_id]
+        rutas = []
+        for campo in self.campos.values():
+            rutas.extend(campo.columnas(True))
+        return rutas
+
+    def lector(self, expandido):
+        if not expandido:
+            ruta_id = self.ruta_id
+            return lambda fila: fila[ruta_id]
+        pares = [(clave, campo.lector(True)) for clave, campo in self.campos.items()]
+        return lambda fila: {clave: leer(fila) for clave, leer in pares}
+
+    def lectores_planos(self, encabezado, expandido):
+        if not expandido:
+            return [(encabezado, self.lector(False))]
+        lectores = []
+        for clave, campo in self.campos.items():
+            lectores.extend(campo.lectores_planos(f"{encabezado}.{clave}", True))
+        return lectores
+
+
+class Proyeccion:
+    """
+    Representación de lectura de un recurso construida desde filas .values().
+
+    Args:
+        campos (dict): Claves de salida -> Columna/Relacion, en el mismo orden
+            que el ModelSerializer equivalente.
+    """
+
+    def __init__(self, campos):
+        self.campos = campos
+
+    @property
+    def relaciones(self):
+        """Nombres de las claves que se pueden expandir."""
+        return [clave for clave, campo in self.campos.items() if isinstance(campo, Relacion)]
+
+    def _seleccion(self, campos=None, expandir=None):
+        """
+        Retorna [(clave, campo, expandido)] según la selección solicitada.
+
+        - campos=None: todas las claves
+        - expandir=None: todas las relaciones expandidas (forma por defecto)
+        """
+        seleccion = []
+        for clave, campo in self.campos.items():
+            if campos is not None and clave not in campos:
+                continue
+            expandido = expandir is None or clave in expandir
+            seleccion.append((clave, campo, expandido))
+        return seleccion
+
+    def columnas(self, campos=None, expandir=None):
+        """Rutas de .values() necesarias para la selección (sin duplicados, en orden)."""
+        rutas = []
+        for _, campo, expandido in self._seleccion(campos, expandir):
+            for ruta in campo.columnas(expandido):
+                if ruta not in rutas:
+                    rutas.append(ruta)
+        return rutas
+
+    def serializar(self, filas, campos=None, expandir=None):
+        """Arma la lista de diccionarios de salida para las filas dadas."""
+        pares = [
+            (clave, campo.lector(expandido))
+            for clave, campo, expandido in self._seleccion(campos, expandir)
+        ]
+        return [{clave: leer(fila) for clave, leer in pares} for fila in filas]
+
+    def lectores_planos(self, campos=None, expandir=None):
+        """
+        Retorna [(encabezado, lector)] con una columna por valor escalar.
+
+        Las relaciones expandidas se aplanan con encabezados punteados
+        (ej: 'ubicacion_actual.departamento.nombre_departamento').
+        """
+        lectores = []
+        for clave, campo, expandido in self._seleccion(campos, expandir):
+            lectores.extend(campo.lectores_planos(clave, expandido))
+        return lectores
+
+    def validar(self, campos=None, expandir=None):
+        """
+        Valida los nombres solicitados.
+
+        Returns:
+            dict: Errores por parámetro ({'fields': [...], 'expand': [...]}), vacío si es válido
+        """
+        errores = {}
+        if campos is not None:
+            desconocidos = sorted(set(campos) - set(self.campos))
+            if desconocidos:
+                errores['fields'] = [
+                    f"Campos no disponibles: {', '.join(desconocidos)}. "
+                    f"Opciones: {', '.join(self.campos)}"
+                ]
+        if expandir is not None:
+            desconocidos = sorted(set(expandir) - set(self.relaciones))
+            if desconocidos:
+                errores['expand'] = [
+                    f"Relaciones no expandibles: {', '.join(desconocidos)}. "
+                    f"Opciones: {', '.join(self.relaciones)}"
+                ]
+        return errores
+
+
+# ==============================================================================
+# PROYECCIONES DE LOS RECURSOS
+# ==============================================================================
+
+# Misma forma que ActivoSerializer (lectura). 'ubicacion_total_activos' es la
+# anotación SQL del queryset de ActivoViewSet.
+PROYECCION_ACTIVO = Proyeccion({
+    'id': Columna('id'),
+    'codigo_inventario': Columna('codigo_inventario'),
+    'numero_serie': Columna('numero_serie'),
+    'marca': Columna('marca'),
+    'modelo': Columna('modelo'),
+    'fecha_alta': Columna('fecha_alta', formato=formatear_fecha),
+    'tipo': Relacion('tipo_id', {
+        'id': Columna('tipo_id'),
+        'nombre_tipo': Columna('tipo__nombre_tipo'),
+    }),
+    'estado': Relacion('estado_id', {
+        'id': Columna('estado_id'),
+        'nombre_estado': Columna('estado__nombre_estado'),
+    }),
+    'ubicacion_actual': Relacion('ubicacion_actual_id', {
+        'id': Columna('ubicacion_actual_id'),
+        'nombre_ubicacion': Columna('ubicacion_actual__nombre_ubicacion'),
+        'codigo_qr': Columna('ubicacion_actual__codigo_qr'),
+        'departamento': Relacion('ubicacion_actual__departamento_id', {
+            'id': Columna('ubicacion_actual__departamento_id'),
+            'nombre_departamento': Columna('ubicacion_actual__departamento__nombre_departamento'),
+        }),
+        'total_activos': Columna('ubicacion_total_activos', por_defecto=0),
+    }),
+    'notas': Columna('notas'),
+})
+
+# Misma forma que UbicacionSerializer (lectura). 'total_activos' es la anotación
+# COUNT del queryset de UbicacionViewSet.
+PROYECCION_UBICACION = Proyeccion({
+    'id': Columna('id'),
+    'nombre_ubicacion': Columna('nombre_ubicacion'),
+    'codigo_qr': Columna('codigo_qr'),
+    'departamento': Relacion('departamento_id', {
+        'id': Columna('departamento_id'),
+        'nombre_departamento': Columna('departamento__nombre_departamento'),
+    }),
+    'total_activos': Columna('total_activos', por_defecto=0),
+})
+
+# Misma forma que HistorialMovimientoSerializer (lectura)
+PROYECCION_HISTORIAL = Proyeccion({
+    'id': Columna('id'),
+    'activo': Relacion('activo_id', {
+        'id': Columna('activo_id'),
+        'codigo_inventario': Columna('activo__codigo_inventario'),
+        'marca': Columna('activo__marca'),
+        'modelo': Columna('activo__modelo'),
+    }),
+    'codigo_activo': Columna('activo__codigo_inventario'),
+    'usuario_registra': Relacion('usuario_registra_id', {
+        'id': Columna('usuario_registra_id'),
+        'username': Columna('usuario_registra__username'),
+        'nombre_completo': Columna('usuario_registra__nombre_completo'),
+    }),
+    'nombre_usuario': Columna('usuario_registra__nombre_completo'),
+    'ubicacion_origen': Relacion('ubicacion_origen_id', {
+        'id': Columna('ubicacion_origen_id'),
+        'nombre_ubicacion': Columna('ubicacion_origen__nombre_ubicacion'),
+        'codigo_qr': Columna('ubicacion_origen__codigo_qr'),
+        'departamento': Columna('ubicacion_origen__departamento__nombre_departamento'),
+    }),
+    'codigo_origen': Columna('ubicacion_origen__codigo_qr'),
+    'ubicacion_destino': Relacion('ubicacion_destino_id', {
+        'id': Columna('ubicacion_destino_id'),
+        'nombre_ubicacion': Columna('ubicacion_destino__nombre_ubicacion'),
+        'codigo_qr': Columna('ubicacion_destino__codigo_qr'),
+        'departamento': Columna('ubicacion_destino__departamento__nombre_departamento'),
+    }),
+    'codigo_destino': Columna('ubicacion_destino__codigo_qr'),
+    'fecha_movimiento': Columna('fecha_movimiento', formato=formatear_fecha),
+    'tipo_movimiento': Columna('tipo_movimiento'),
+    'comentarios': Columna('comentarios'),
+})
+
+# Misma forma que AuditoriaLogSerializer (lectura)
+PROYECCION_AUDITORIA = Proyeccion({
+    'id': Columna('id'),
+    'usuario': Columna('usuario_id'),
+    'usuario_username': Columna('usuario__username'),
+    'usuario_nombre_completo': Columna('usuario__nombre_completo'),
+    'accion': Columna('accion'),
+    'detalle_accion': Columna('detalle_accion'),
+    'timestamp': Columna('timestamp', formato=formatear_fecha),
+})
@@ -0,0 +1,527 @@
+"""
+Motor de reportes para la API REST del Sistema de Control de Activos (SCA) Hospital.
+
+Cada reporte se resuelve con consultas agregadas en SQL (GROUP BY, funciones de
+ventana) y devuelve solo el resultado resumido, de modo que el costo no depende
+de cuántos activos o movimientos existan.
+
+Características:
+- Mismos filtros que la vista de reportes del frontend: estado, ubicación, tipo,
+  departamento, período, usuario, activo y rango de fechas
+- Totales generales y ranking calculados con funciones de ventana (OVER ())
+- Tiempo en mantenimiento calculado con LEAD() sobre el historial de cada activo
+- Resultado como lista de filas planas (JSON, CSV o XLSX)
+
+Uso:
+    filtros = resolver_filtros({'periodo': '30dias', 'departamento': 3})
+    filas = generar_reporte('por_tipo', filtros)
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db.models import (
+    Avg, BooleanField, Count, DurationField, ExpressionWrapper, F, Func, IntegerField, Max, Min, OuterRef, Q, Subquery, Window
+)
+from django.db.models.functions import Cast, Lead, Rank, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Activo, HistorialMovimiento
+from .proyecciones import formatear_fecha
+
+
+# Períodos del frontend (ReportesView.vue) -> días hacia atrás o meses calendario
+PERIODOS = {
+    '7dias': {'dias': 7},
+    '30dias': {'dias': 30},
+    'mes': {'meses': 1},
+    'trimestre': {'meses': 3},
+    'año': {'meses': 12},
+    'personalizado': {},
+}
+
+# Activos "sin asignar": los que están en una ubicación o estado de bodega
+FILTRO_BODEGA = (
+    Q(ubicacion_actual__departamento__nombre_departamento__icontains='bodega')
+    | Q(estado__nombre_estado__icontains='bodega')
+)
+
+
+class SumaSobreTotal(Func):
+    """
+    SUM(<agregado>) OVER (): total general calculado sobre las filas ya agrupadas.
+
+    Window(Sum(Count(...))) no está permitido en el ORM; esta expresión genera
+    el mismo SQL y se castea a entero (PostgreSQL devuelve NUMERIC).
+    """
+
+    template = 'SUM(%(expressions)s) OVER ()'
+    output_field = IntegerField()
+
+
+def total_general():
+    """Anotación con el total de filas de todos los grupos del reporte."""
+    return Cast(SumaSobreTotal(Count('pk')), IntegerField())
+
+
+def ranking():
+    """Anotación con la posición de cada grupo según su total (1 = mayor)."""
+    return Window(Rank(), order_by=Count('pk').desc())
+
+
+# ==============================================================================
+# FILTROS
+# ==============================================================================
+
+def _restar_meses(fecha, meses):
+    """Retrocede 'meses' meses calendario (ajustando el día al último del mes si no existe)."""
+    mes = fecha.month - meses
+    anio = fecha.year + (mes - 1) // 12
+    mes = (mes - 1) % 12 + 1
+    for dia in range(fecha.day, 0, -1):
+        try:
+            return fecha.replace(year=anio, month=mes, day=dia)
+        except ValueError:
+            continue
+    return fecha
+
+
+def resolver_filtros(parametros):
+    """
+    Convierte los parámetros validados en filtros listos para los querysets.
+
+    El período se traduce a un rango [desde, hasta) de datetimes con zona horaria.
+    Si se envían fecha_desde / fecha_hasta, tienen prioridad sobre el período.
+
+    Args:
+        parametros (dict): validated_data de ReporteParametrosSerializer
+
+    Returns:
+        dict: Filtros con 'desde' y 'hasta' resueltos (None si no aplica)
+    """
+    filtros = dict(parametros)
+    ahora = timezone.now()
+    desde = hasta = None
+
+    periodo = PERIODOS.get(filtros.get('periodo') or '', {})
+    if 'dias' in periodo:
+        desde = ahora - timedelta(days=periodo['dias'])
+    elif 'meses' in periodo:
+        desde = _restar_meses(timezone.localtime(ahora), periodo['meses'])
+
+    zona = timezone.get_current_timezone()
+    if filtros.get('fecha_desde'):
+        desde = timezone.make_aware(datetime.combine(filtros['fecha_desde'], time.min), zona)
+    if filtros.get('fecha_hasta'):
+        hasta = timezone.make_aware(datetime.combine(filtros['fecha_hasta'] + timedelta(days=1), time.min), zona)
+
+    filtros['desde'] = desde
+    filtros['hasta'] = hasta
+    return filtros
+
+
+def activos_filtrados(filtros):
+    """Activos que cumplen los filtros de estado, ubicación, tipo y departamento."""
+    queryset = Activo.objects.order_by()
+    if filtros.get('estado'):
+        queryset = queryset.filter(estado_id=filtros['estado'])
+    if filtros.get('ubicacion'):
+        queryset = queryset.filter(ubicacion_actual_id=filtros['ubicacion'])
+    if filtros.get('tipo'):
+        queryset = queryset.filter(tipo_id=filtros['tipo'])
+    if filtros.get('departamento'):
+        queryset = queryset.filter(ubicacion_actual__departamento_id=filtros['departamento'])
+    return queryset
+
+
+def movimientos_filtrados(filtros, con_periodo=True):
+    """
+    Movimientos que cumplen los filtros del reporte.
+
+    - estado / tipo: del activo movido
+    - ubicacion / departamento: origen o destino del movimiento
+    - usuario / activo: usuario que registró y activo movido
+    - período: fecha_movimiento en [desde, hasta) (omitido si con_periodo=False)
+    """
+    queryset = HistorialMovimiento.objects.order_by()
+    if filtros.get('estado'):
+        queryset = queryset.filter(activo__estado_id=filtros['estado'])
+    if filtros.get('tipo'):
+        queryset = queryset.filter(activo__tipo_id=filtros['tipo'])
+    if filtros.get('ubicacion'):
+        queryset = queryset.filter(
+            Q(ubicacion_origen_id=filtros['ubicacion']) | Q(ubicacion_destino_id=filtros['ubicacion'])
+        )
+    if filtros.get('departamento'):
+        queryset = queryset.filter(
+            Q(ubicacion_origen__departamento_id=filtros['departamento'])
+            | Q(ubicacion_destino__departamento_id=filtros['departamento'])
+        )
+    if filtros.get('usuario'):
+        queryset = queryset.filter(usuario_registra_id=filtros['usuario'])
+    if filtros.get('activo'):
+        queryset = queryset.filter(activo_id=filtros['activo'])
+    if con_periodo:
+        queryset = filtrar_periodo(queryset, filtros)
+    return queryset
+
+
+def filtrar_periodo(queryset, filtros, campo='fecha_movimiento'):
+    """Aplica el rango [desde, hasta) del reporte sobre un campo de fecha."""
+    if filtros.get('desde'):
+        queryset = queryset.filter(**{f'{campo}__gte': filtros['desde']})
+    if filtros.get('hasta'):
+        queryset = queryset.filter(**{f'{campo}__lt': filtros['hasta']})
+    return queryset
+
+
+def _truncado_periodo(filtros):
+    """
+    Función de truncado de fechas según el largo del rango:
+    día (hasta 31 días), semana (hasta 6 meses) o mes.
+    """
+    desde = filtros.get('desde')
+    if desde is None:
+        return TruncMonth, 'mes'
+    dias = ((filtros.get('hasta') or timezone.now()) - desde).days
+    if dias <= 31:
+        return TruncDay, 'dia'
+    if dias <= 186:
+        return TruncWeek, 'semana'
+    return TruncMonth, 'mes'
+
+
+def _con_porcentaje(filas):
+    """Agrega 'porcentaje' (del total general) a filas que traen total y total_general."""
+    for fila in filas:
+        total_general = fila.pop('total_general') or 0
+        fila['porcentaje'] = round(fila['total'] * 100 / total_general, 2) if total_general else 0.0
+    return filas
+
+
+def _horas(duracion):
+    """Convierte un timedelta en horas con 2 decimales (None si no hay valor)."""
+    if duracion is None:
+        return None
+    return round(duracion.total_seconds() / 3600, 2)
+
+
+# ==============================================================================
+# REPORTES DE INVENTARIO
+# ==============================================================================
+
+def _agrupar_activos(queryset, campos):
+    """
+    Agrupa activos por las columnas dadas con total, porcentaje y ranking.
+
+    Args:
+        queryset: Activos ya filtrados
+        campos (dict): Nombre de la columna del reporte -> ruta del modelo
+    """
+    filas = (
+        queryset
+        .values(**{alias: F(ruta) for alias, ruta in campos.items()})
+        .annotate(total=Count('pk'), total_general=total_general(), ranking=ranking())
+        .order_by('ranking', *campos)
+    )
+    return _con_porcentaje(list(filas))
+
+
+def reporte_inventario_completo(filtros):
+    """Inventario resumido: total de activos por departamento, tipo y estado."""
+    return _agrupar_activos(activos_filtrados(filtros), {
+        'nombre_departamento': 'ubicacion_actual__departamento__nombre_departamento',
+        'nombre_tipo': 'tipo__nombre_tipo',
+        'nombre_estado': 'estado__nombre_estado',
+    })
+
+
+def reporte_por_estado(filtros):
+    return _agrupar_activos(activos_filtrados(filtros), {
+        'id_estado': 'estado_id',
+        'nombre_estado': 'estado__nombre_estado',
+    })
+
+
+def reporte_por_ubicacion(filtros):
+    return _agrupar_activos(activos_filtrados(filtros), {
+        'id_ubicacion': 'ubicacion_actual_id',
+        'nombre_ubicacion': 'ubicacion_actual__nombre_ubicacion',
+        'codigo_qr': 'ubicacion_actual__codigo_qr',
+        'nombre_departamento': 'ubicacion_actual__departamento__nombre_departamento',
+    })
+
+
+def reporte_por_tipo(filtros):
+    return _agrupar_activos(activos_filtrados(filtros), {
+        'id_tipo': 'tipo_id',
+        'nombre_tipo': 'tipo__nombre_tipo',
+    })
+
+
+def reporte_por_departamento(filtros):
+    return _agrupar_activos(activos_filtrados(filtros), {
+        'id_departamento': 'ubicacion_actual__departamento_id',
+        'nombre_departamento': 'ubicacion_actual__departamento__nombre_departamento',
+    })
+
+
+def reporte_sin_asignar(filtros):
+    """Activos en bodega (ubicación o estado de bodega), agrupados por ubicación y tipo."""
+    return _agrupar_activos(activos_filtrados(filtros).filter(FILTRO_BODEGA), {
+        'nombre_ubicacion': 'ubicacion_actual__nombre_ubicacion',
+        'nombre_tipo': 'tipo__nombre_tipo',
+    })
+
+
+def reporte_en_mantenimiento(filtros):
+    """
+    Activos cuyo último movimiento es un envío a mantenimiento.
+
+    El último movimiento se obtiene con una subconsulta por activo que usa el
+    índice (activo, fecha_movimiento); los días en mantenimiento se calculan
+    desde la fecha de ese envío.
+    """
+    ultimo = HistorialMovimiento.objects.filter(activo=OuterRef('pk')).order_by('-fecha_movimiento')
+    filas = (
+        activos_filtrados(filtros)
+        .annotate(
+            ultimo_tipo_movimiento=Subquery(ultimo.values('tipo_movimiento')[:1]),
+            fecha_envio=Subquery(ultimo.values('fecha_movimiento')[:1]),
+        )
+        .filter(ultimo_tipo_movimiento='MANTENIMIENTO')
+        .values(
+            'id', 'codigo_inventario', 'marca', 'modelo', 'fecha_envio',
+            nombre_tipo=F('tipo__nombre_tipo'),
+            nombre_ubicacion=F('ubicacion_actual__nombre_ubicacion'),
+            nombre_departamento=F('ubicacion_actual__departamento__nombre_departamento'),
+        )
+        .order_by('fecha_envio')
+    )
+    ahora = timezone.now()
+    resultado = []
+    for fila in filas:
+        fila['dias_en_mantenimiento'] = (ahora - fila['fecha_envio']).days
+        fila['fecha_envio'] = formatear_fecha(fila['fecha_envio'])
+        resultado.append(fila)
+    return resultado
+
+
+# ==============================================================================
+# REPORTES DE MOVIMIENTOS
+# ==============================================================================
+
+def _serie_temporal(queryset, filtros, tipos):
+    """
+    Movimientos agrupados por día / semana / mes, con un total por tipo y el acumulado.
+
+    Args:
+        queryset: Movimientos ya filtrados
+        tipos (list): Tipos de movimiento a contar en columnas separadas
+    """
+    truncar, granularidad = _truncado_periodo(filtros)
+    conteos = {
+        tipo.lower(): Count('pk', filter=Q(tipo_movimiento=tipo))
+        for tipo in tipos
+    }
+    filas = (
+        queryset
+        .annotate(periodo=truncar('fecha_movimiento'))
+        .values('periodo')
+        .annotate(total=Count('pk'), **conteos)
+        .order_by('periodo')
+    )
+    acumulado = 0
+    resultado = []
+    for fila in filas:
+        acumulado += fila['total']
+        periodo = fila.pop('periodo')
+        resultado.append({
+            'periodo': periodo.date().isoformat() if isinstance(periodo, datetime) else str(periodo),
+            'granularidad': granularidad,
+            **fila,
+            'acumulado': acumulado,
+        })
+    return resultado
+
+
+def reporte_movimientos_periodo(filtros):
+    tipos = [tipo for tipo, _ in HistorialMovimiento.TIPOS_MOVIMIENTO]
+    return _serie_temporal(movimientos_filtrados(filtros), filtros, tipos)
+
+
+def reporte_movimientos_usuario(filtros):
+    """Movimientos registrados por cada usuario, con ranking y porcentaje del total."""
+    filas = (
+        movimientos_filtrados(filtros)
+        .values(
+            id_usuario=F('usuario_registra_id'),
+            username=F('usuario_registra__username'),
+            nombre_completo=F('usuario_registra__nombre_completo'),
+        )
+        .annotate(
+            total=Count('pk'),
+            ultimo_movimiento=Max('fecha_movimiento'),
+            total_general=total_general(),
+            ranking=ranking(),
+        )
+        .order_by('ranking', 'username')
+    )
+    resultado = _con_porcentaje(list(filas))
+    for fila in resultado:
+        fila['ultimo_movimiento'] = formatear_fecha(fila['ultimo_movimiento'])
+    return resultado
+
+
+def _activos_por_movimientos(queryset, filtros, minimo=1):
+    filas = (
+        queryset
+        .values(
+            id_activo=F('activo_id'),
+            codigo_inventario=F('activo__codigo_inventario'),
+            marca=F('activo__marca'),
+            modelo=F('activo__modelo'),
+        )
+        .annotate(total=Count('pk'), ultimo_movimiento=Max('fecha_movimiento'), ranking=ranking())
+        .filter(total__gte=minimo)
+        .order_by('ranking', 'codigo_inventario')
+    )[:filtros['limite']]
+    resultado = list(filas)
+    for fila in resultado:
+        fila['ultimo_movimiento'] = formatear_fecha(fila['ultimo_movimiento'])
+    return resultado
+
+
+def reporte_activos_mas_movidos(filtros):
+    """Activos con más movimientos en el período (los primeros 'limite')."""
+    return _activos_por_movimientos(movimientos_filtrados(filtros), filtros)
+
+
+def reporte_historial_activo(filtros):
+    """
+    Trazabilidad de un activo: sus movimientos en orden y el tiempo que
+    permaneció en cada destino (LEAD sobre la fecha del movimiento siguiente).
+    """
+    filas = (
+        movimientos_filtrados(filtros, con_periodo=False)
+        .annotate(
+            fecha_siguiente=Window(Lead('fecha_movimiento'), order_by=F('fecha_movimiento').asc())
+        )
+        .values(
+            'id', 'fecha_movimiento', 'tipo_movimiento', 'comentarios', 'fecha_siguiente',
+            nombre_origen=F('ubicacion_origen__nombre_ubicacion'),
+            nombre_destino=F('ubicacion_destino__nombre_ubicacion'),
+            username=F('usuario_registra__username'),
+        )
+        .order_by('fecha_movimiento')
+    )
+    resultado = []
+    for fila in filas:
+        fecha_siguiente = fila.pop('fecha_siguiente')
+        fila['horas_en_destino'] = _horas(fecha_siguiente - fila['fecha_movimiento']) if fecha_siguiente else None
+        fila['fecha_movimiento'] = formatear_fecha(fila['fecha_movimiento'])
+        resultado.append(fila)
+    return resultado
+
+
+# ==============================================================================
+# REPORTES DE MANTENIMIENTO
+# ==============================================================================
+
+def reporte_historial_mantenimientos(filtros):
+    return _serie_temporal(
+        movimientos_filtrados(filtros).filter(tipo_movimiento__in=['MANTENIMIENTO', 'RETORNO']),
+        filtros,
+        ['MANTENIMIENTO', 'RETORNO']
+    )
+
+
+def reporte_tiempo_promedio(filtros):
+    """
+    Duración de los mantenimientos: desde el envío hasta el movimiento siguiente del activo.
+
+    LEAD() se calcula sobre el historial completo de cada activo desde el inicio
+    del período (sin límite superior, para ver el retorno aunque ocurra después).
+    Los filtros del reporte no se aplican a esas filas, ya que el movimiento
+    siguiente puede no cumplirlos (ej: el retorno a otra ubicación o registrado
+    por otro usuario): solo eligen qué envíos entran en la agregación final.
+    """
+    envios = Q(en_reporte=True)
+    cerrados = envios & Q(fecha_retorno__isnull=False)
+    duracion = ExpressionWrapper(F('fecha_retorno') - F('fecha_movimiento'), output_field=DurationField())
+
+    metricas = (
+        filtrar_periodo(HistorialMovimiento.objects.order_by(), {'desde': filtros.get('desde')})
+        .annotate(
+            fecha_retorno=Window(
+                Lead('fecha_movimiento'),
+                partition_by=[F('activo_id')],
+                order_by=F('fecha_movimiento').asc()
+            ),
+            en_reporte=ExpressionWrapper(
+                Q(pk__in=movimientos_filtrados(filtros).filter(tipo_movimiento='MANTENIMIENTO').values('pk')),
+                output_field=BooleanField()
+            )
+        )
+        .aggregate(
+            total_envios=Count('pk', filter=envios),
+            mantenimientos_cerrados=Count('pk', filter=cerrados),
+            promedio=Avg(duracion, filter=cerrados),
+            minimo=Min(duracion, filter=cerrados),
+            maximo=Max(duracion, filter=cerrados),
+        )
+    )
+    return [{
+        'total_envios': metricas['total_envios'],
+        'mantenimientos_cerrados': metricas['mantenimientos_cerrados'],
+        'mantenimientos_abiertos': metricas['total_envios'] - metricas['mantenimientos_cerrados'],
+        'promedio_horas': _horas(metricas['promedio']),
+        'minimo_horas': _horas(metricas['minimo']),
+        'maximo_horas': _horas(metricas['maximo']),
+    }]
+
+
+def reporte_mantenimientos_frecuentes(filtros):
+    """Activos con dos o más envíos a mantenimiento en el período."""
+    return _activos_por_movimientos(
+        movimientos_filtrados(filtros).filter(tipo_movimiento='MANTENIMIENTO'),
+        filtros,
+        minimo=2
+    )
+
+
+# ==============================================================================
+# CATÁLOGO DE REPORTES
+# ==============================================================================
+
+# Claves iguales a 'tipo' de las tarjetas de ReportesView.vue
+REPORTES = {
+    'inventario_completo': ('Inventario Completo', reporte_inventario_completo),
+    'por_estado': ('Activos por Estado', reporte_por_estado),
+    'por_ubicacion': ('Activos por Ubicación', reporte_por_ubicacion),
+    'por_tipo': ('Activos por Tipo', reporte_por_tipo),
+    'por_departamento': ('Activos por Departamento', reporte_por_departamento),
+    'movimientos_periodo': ('Movimientos por Período', reporte_movimientos_periodo),
+    'movimientos_usuario': ('Movimientos por Usuario', reporte_movimientos_usuario),
+    'activos_mas_movidos': ('Activos Más Movidos', reporte_activos_mas_movidos),
+    'historial_activo': ('Historial de Activo', reporte_historial_activo),
+    'en_mantenimiento': ('Activos en Mantenimiento', reporte_en_mantenimiento),
+    'historial_mantenimientos': ('Historial de Mantenimientos', reporte_historial_mantenimientos),
+    'tiempo_promedio': ('Tiempo Promedio', reporte_tiempo_promedio),
+    'mantenimientos_frecuentes': ('Mantenimientos Frecuentes', reporte_mantenimientos_frecuentes),
+    'sin_asignar': ('Activos Sin Asignar', reporte_sin_asignar),
+}
+
+
+def generar_reporte(reporte, filtros):
+    """
+    Ejecuta un reporte del catálogo.
+
+    Args:
+        reporte (str): Clave de REPORTES
+        filtros (dict): Resultado de resolver_filtros()
+
+    Returns:
+        list: Filas (diccionarios planos) del reporte
+    """
+    _, funcion = REPORTES[reporte]
+    return funcion(filtros)
@@ -13,6 +13,8 @@ Características:
 - Documentación automática para OpenAPI/Swagger
 """
 
+import copy
+
 from rest_framework import serializers
 from django.core.exceptions import ValidationError
 from .models import (
@@ -26,6 +28,35 @@ from .models import (
     HistorialMovimiento,
     AuditoriaLog
 )
+from .proyecciones import PROYECCION_ACTIVO, PROYECCION_HISTORIAL, formatear_fecha
+from .reportes import REPORTES, PERIODOS
+from .catalogos import obtener_catalogo
+
+
+# ==============================================================================
+# CAMPOS
+# ==============================================================================
+
+class CatalogoPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField para catálogos maestros que valida el ID en memoria.
+
+    Busca el ID en la caché de core.catalogos (sin consulta SQL); solo si no
+    está ahí recurre al queryset, como PrimaryKeyRelatedField normal.
+    Retorna una copia de la instancia para no compartir el objeto en caché.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instancia = obtener_catalogo(self.queryset.model).por_pk.get(pk)
+        if instancia is None:
+            return super().to_internal_value(data)
+        return copy.copy(instancia)
 
 
 # ==============================================================================
@@ -140,7 +171,7 @@ class UbicacionSerializer(serializers.ModelSerializer):
     """
 
     # Campo limpio para escritura (acepta ID)
-    departamento_id = serializers.PrimaryKeyRelatedField(
+    departamento_id = CatalogoPrimaryKeyRelatedField(
         queryset=Departamento.objects.all(),
         source='departamento',
         write_only=True,
@@ -174,9 +205,16 @@ class UbicacionSerializer(serializers.ModelSerializer):
         Args:
             obj (Ubicacion): Instancia de la ubicación
 
+        OPTIMIZACIÓN: Si el queryset ya trae el conteo anotado en SQL
+        (atributo 'total_activos'), se usa directamente y no se ejecuta
+        un COUNT adicional por cada ubicación serializada.
+
         Returns:
             int: Cantidad de activos en esta ubicación
         """
+        total_anotado = getattr(obj, 'total_activos', None)
+        if total_anotado is not None:
+            return total_anotado
         return obj.activos_actuales.count()
 
 
@@ -215,7 +253,7 @@ class UsuarioSerializer(serializers.ModelSerializer):
     )
 
     # Campo limpio para escritura (acepta ID)
-    rol_id = serializers.PrimaryKeyRelatedField(
+    rol_id = CatalogoPrimaryKeyRelatedField(
         queryset=Rol.objects.all(),
         source='rol',
         write_only=True,
@@ -331,14 +369,14 @@ class ActivoSerializer(serializers.ModelSerializer):
     """
 
     # Campos limpios para escritura (aceptan IDs)
-    tipo_id = serializers.PrimaryKeyRelatedField(
+    tipo_id = CatalogoPrimaryKeyRelatedField(
         queryset=TipoEquipo.objects.all(),
         source='tipo',
         write_only=True,
         help_text="ID del tipo de equipo"
     )
 
-    estado_id = serializers.PrimaryKeyRelatedField(
+    estado_id = CatalogoPrimaryKeyRelatedField(
         queryset=EstadoActivo.objects.all(),
         source='estado',
         write_only=True,
@@ -376,6 +414,282 @@ class ActivoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'codigo_inventario', 'fecha_alta', 'tipo', 'estado', 'ubicacion_actual']
 
+    def to_representation(self, instance):
+        """
+        Traspasa el conteo anotado por ActivoViewSet a la ubicación anidada.
+
+        El queryset del ViewSet calcula 'ubicacion_total_activos' con una
+        subconsulta SQL; aquí se copia a ubicacion_actual para que
+        UbicacionSerializer no ejecute un COUNT por cada activo.
+        """
+        total_anotado = getattr(instance, 'ubicacion_total_activos', None)
+        if total_anotado is not None and instance.ubicacion_actual_id:
+            instance.ubicacion_actual.total_activos = total_anotado
+        return super().to_representation(instance)
+
+
+# ==============================================================================
+# ALTA DE ACTIVOS EN LOTE
+# ==============================================================================
+
+# Máximo de activos por operación en lote (alta o movilización): una compra
+# o una sala completa caben con holgura
+MAX_ACTIVOS_LOTE = 500
+
+
+class ActivoLoteSerializer(ActivoSerializer):
+    """
+    Fila de POST /api/activos/lote/: mismos campos y reglas que ActivoSerializer,
+    pero sin consultas por fila.
+
+    - tipo_id / estado_id se validan contra los catálogos en memoria (igual que siempre)
+    - ubicacion_actual_id y la unicidad de numero_serie se validan para todo el
+      lote a la vez en ActivoLoteInputSerializer (una consulta cada una)
+    """
+
+    ubicacion_actual_id = serializers.IntegerField(
+        min_value=1,
+        write_only=True,
+        help_text="ID de la ubicación actual del activo"
+    )
+
+    class Meta(ActivoSerializer.Meta):
+        extra_kwargs = {'numero_serie': {'validators': []}}
+
+
+class ActivoLoteInputSerializer(serializers.Serializer):
+    """
+    Serializer de entrada para el alta de activos en lote.
+
+    CONTEXTO DE USO:
+    - Se usa en el endpoint POST /api/activos/lote/ (ej: recepción de una compra)
+    - Si alguna fila tiene errores no se crea ninguna; los errores se devuelven
+      en una lista con una entrada por fila ({} si la fila es válida)
+
+    VALIDACIÓN DEL LOTE (además de la de cada fila):
+    - numero_serie no repetido dentro del lote ni en la base (una consulta),
+      informado junto con los errores de las demás filas
+    - ubicacion_actual_id existente (una consulta para todas las ubicaciones)
+
+    EJEMPLO DE USO:
+    ```json
+    {
+        "activos": [
+            {"numero_serie": "SN-001", "marca": "Dell", "modelo": "P2422H", "tipo_id": 3, "estado_id": 1, "ubicacion_actual_id": 7},
+            {"numero_serie": "SN-002", "marca": "Dell", "modelo": "P2422H", "tipo_id": 3, "estado_id": 1, "ubicacion_actual_id": 7}
+        ]
+    }
+    ```
+    """
+
+    activos = ActivoLoteSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=MAX_ACTIVOS_LOTE,
+        help_text=f"Activos a registrar (máximo {MAX_ACTIVOS_LOTE})"
+    )
+
+    def errores_numero_serie(self, filas):
+        """
+        Errores de numero_serie de cada fila recibida: repetido en el lote o ya
+        existente en la base (una consulta).
+
+        Trabaja sobre las filas sin validar para informarlos también cuando otras
+        filas tienen errores: validate() solo se ejecuta si todas son válidas.
+        """
+        numeros_serie = [
+            fila['numero_serie'].strip()
+            if isinstance(fila, dict) and isinstance(fila.get('numero_serie'), str) else None
+            for fila in filas
+        ]
+        errores = [{} for _ in filas]
+
+        # numero_serie repetido dentro del lote (se marca desde la segunda aparición)
+        primera_fila = {}
+        for indice, numero_serie in enumerate(numeros_serie):
+            if not numero_serie:
+                continue
+            if numero_serie in primera_fila:
+                errores[indice]['numero_serie'] = [
+                    f"Número de serie repetido en el lote (fila {primera_fila[numero_serie]})."
+                ]
+            else:
+                primera_fila[numero_serie] = indice
+
+        existentes = set(
+            Activo.objects.filter(numero_serie__in=primera_fila).values_list('numero_serie', flat=True)
+        )
+        for indice, numero_serie in enumerate(numeros_serie):
+            if numero_serie in existentes:
+                errores[indice]['numero_serie'] = ["Ya existe un activo con este número de serie."]
+        return errores
+
+    def validate_activos(self, filas):
+        errores = [{} for _ in filas]
+
+        ids_ubicacion = {fila['ubicacion_actual_id'] for fila in filas}
+        ubicaciones = set(Ubicacion.objects.filter(pk__in=ids_ubicacion).values_list('pk', flat=True))
+
+        for indice, fila in enumerate(filas):
+            if fila['ubicacion_actual_id'] not in ubicaciones:
+                errores[indice]['ubicacion_actual_id'] = [
+                    f"La ubicación con ID {fila['ubicacion_actual_id']} no existe."
+                ]
+
+        if any(errores):
+            raise serializers.ValidationError(errores)
+        return filas
+
+    def to_internal_value(self, data):
+        """
+        Valida cada fila y agrega a su entrada de la lista de errores los de
+        numero_serie del lote, de modo que una sola respuesta 400 los informa todos.
+        """
+        try:
+            valores = super().to_internal_value(data)
+            errores = [{} for _ in valores['activos']]
+        except serializers.ValidationError as exc:
+            errores = exc.detail.get('activos') if isinstance(exc.detail, dict) else None
+            # Errores de la lista completa (vacía, demasiado larga, no es una lista): sin filas que marcar
+            if not isinstance(errores, list) or not all(isinstance(error, dict) for error in errores):
+                raise
+            valores = None
+
+        for error_fila, errores_serie in zip(errores, self.errores_numero_serie(data['activos'])):
+            for campo, mensajes in errores_serie.items():
+                # El error propio del campo (ej: vacío o demasiado largo) tiene prioridad
+                error_fila.setdefault(campo, mensajes)
+
+        if valores is None or any(errores):
+            raise serializers.ValidationError({'activos': errores})
+        return valores
+
+
+# ==============================================================================
+# EDICIÓN DE ACTIVOS EN LOTE
+# ==============================================================================
+
+class ActivoActualizacionLoteInputSerializer(serializers.Serializer):
+    """
+    Serializer de entrada para la edición de activos en lote.
+
+    CONTEXTO DE USO:
+    - Se usa en el endpoint PATCH /api/activos/lote/ (ej: dar de baja o enviar
+      a reparación varios equipos)
+    - Aplica los mismos cambios a todos los activos seleccionados
+
+    CAMPOS:
+    - ids_activos: IDs de los activos (opcional; sin él se usan los filtros del
+      listado en la URL: ?estado=, ?tipo=, ?ubicacion_actual=, ?search=)
+    - estado_id, tipo_id: Nuevos valores (se validan contra los catálogos en memoria)
+    - notas: Nuevas notas (null o "" las borra)
+    Se requiere al menos uno de estado_id, tipo_id o notas.
+
+    EJEMPLO DE USO:
+    ```json
+    {
+        "ids_activos": [12, 15, 18],
+        "estado_id": 4,
+        "notas": "Dados de baja por obsolescencia"
+    }
+    ```
+    """
+
+    ids_activos = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        min_length=1,
+        max_length=MAX_ACTIVOS_LOTE,
+        help_text=f"IDs de los activos a editar (máximo {MAX_ACTIVOS_LOTE})"
+    )
+
+    estado_id = CatalogoPrimaryKeyRelatedField(
+        queryset=EstadoActivo.objects.all(),
+        source='estado',
+        required=False,
+        help_text="Nuevo estado de los activos"
+    )
+
+    tipo_id = CatalogoPrimaryKeyRelatedField(
+        queryset=TipoEquipo.objects.all(),
+        source='tipo',
+        required=False,
+        help_text="Nuevo tipo de equipo de los activos"
+    )
+
+    notas = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        allow_null=True,
+        help_text="Nuevas notas de los activos (null o vacío las borra)"
+    )
+
+    def validate_ids_activos(self, value):
+        """Quita los IDs repetidos conservando el orden de la petición."""
+        return list(dict.fromkeys(value))
+
+    def validate(self, attrs):
+        if not any(campo in attrs for campo in ('estado', 'tipo', 'notas')):
+            raise serializers.ValidationError(
+                "Indique al menos un campo a modificar: estado_id, tipo_id o notas."
+            )
+        return attrs
+
+
+# ==============================================================================
+# LECTURA RÁPIDA DE ACTIVOS (SIN INSTANCIAR MODELOS NI SERIALIZERS)
+# ==============================================================================
+
+# Columnas proyectadas con .values() sobre los mismos JOINs del select_related
+# de ActivoViewSet. 'ubicacion_total_activos' es la anotación del queryset.
+ACTIVO_CAMPOS_LECTURA_RAPIDA = tuple(PROYECCION_ACTIVO.columnas())
+
+
+def serializar_activos_rapido(filas):
+    """
+    Construye la representación JSON de ActivoSerializer a partir de filas .values().
+
+    Produce exactamente la misma forma (mismas claves y en el mismo orden) que
+    ActivoSerializer en lectura, pero sin crear instancias de Activo ni de los
+    serializers anidados (TipoEquipo, EstadoActivo, Ubicacion, Departamento).
+
+    Args:
+        filas: Iterable de diccionarios con las columnas de ACTIVO_CAMPOS_LECTURA_RAPIDA
+
+    Returns:
+        list: Lista de diccionarios listos para Response()
+    """
+    return [
+        {
+            'id': fila['id'],
+            'codigo_inventario': fila['codigo_inventario'],
+            'numero_serie': fila['numero_serie'],
+            'marca': fila['marca'],
+            'modelo': fila['modelo'],
+            'fecha_alta': formatear_fecha(fila['fecha_alta']),
+            'tipo': {
+                'id': fila['tipo_id'],
+                'nombre_tipo': fila['tipo__nombre_tipo'],
+            },
+            'estado': {
+                'id': fila['estado_id'],
+                'nombre_estado': fila['estado__nombre_estado'],
+            },
+            'ubicacion_actual': {
+                'id': fila['ubicacion_actual_id'],
+                'nombre_ubicacion': fila['ubicacion_actual__nombre_ubicacion'],
+                'codigo_qr': fila['ubicacion_actual__codigo_qr'],
+                'departamento': {
+                    'id': fila['ubicacion_actual__departamento_id'],
+                    'nombre_departamento': fila['ubicacion_actual__departamento__nombre_departamento'],
+                },
+                'total_activos': fila['ubicacion_total_activos'] or 0,
+            },
+            'notas': fila['notas'],
+        }
+        for fila in filas
+    ]
+
 
 # ==============================================================================
 # SERIALIZERS DE TRAZABILIDAD Y AUDITORÍA
@@ -559,6 +873,67 @@ class HistorialMovimientoSerializer(serializers.ModelSerializer):
         }
 
 
+# Columnas proyectadas con .values() para listar el historial en una sola pasada
+HISTORIAL_CAMPOS_LECTURA_RAPIDA = tuple(PROYECCION_HISTORIAL.columnas())
+
+
+def serializar_historial_rapido(filas):
+    """
+    Construye la representación JSON de HistorialMovimientoSerializer en una sola pasada.
+
+    Cada columna se lee una vez desde la proyección .values() y se reutiliza
+    tanto en los objetos anidados (activo, usuario_registra, ubicaciones) como
+    en los códigos planos para reportes (codigo_activo, codigo_origen, etc.).
+    La salida es idéntica a la del serializer (mismas claves y mismo orden).
+
+    Args:
+        filas: Iterable de diccionarios con las columnas de HISTORIAL_CAMPOS_LECTURA_RAPIDA
+
+    Returns:
+        list: Lista de diccionarios listos para Response()
+    """
+    resultado = []
+    for fila in filas:
+        codigo_activo = fila['activo__codigo_inventario']
+        codigo_origen = fila['ubicacion_origen__codigo_qr']
+        codigo_destino = fila['ubicacion_destino__codigo_qr']
+        nombre_usuario = fila['usuario_registra__nombre_completo']
+        resultado.append({
+            'id': fila['id'],
+            'activo': {
+                'id': fila['activo_id'],
+                'codigo_inventario': codigo_activo,
+                'marca': fila['activo__marca'],
+                'modelo': fila['activo__modelo'],
+            },
+            'codigo_activo': codigo_activo,
+            'usuario_registra': {
+                'id': fila['usuario_registra_id'],
+                'username': fila['usuario_registra__username'],
+                'nombre_completo': nombre_usuario,
+            },
+            'nombre_usuario': nombre_usuario,
+            'ubicacion_origen': {
+                'id': fila['ubicacion_origen_id'],
+                'nombre_ubicacion': fila['ubicacion_origen__nombre_ubicacion'],
+                'codigo_qr': codigo_origen,
+                'departamento': fila['ubicacion_origen__departamento__nombre_departamento'],
+            },
+            'codigo_origen': codigo_origen,
+            'ubicacion_destino': {
+                'id': fila['ubicacion_destino_id'],
+                'nombre_ubicacion': fila['ubicacion_destino__nombre_ubicacion'],
+                'codigo_qr': codigo_destino,
+                'departamento': fila['ubicacion_destino__departamento__nombre_departamento'],
+            },
+            'codigo_destino': codigo_destino,
+            'fecha_movimiento': formatear_fecha(fila['fecha_movimiento']),
+            'tipo_movimiento': fila['tipo_movimiento'],
+            'comentarios': fila['comentarios'],
+        })
+    return resultado
+
+
 class AuditoriaLogSerializer(serializers.ModelSerializer):
     """
     Serializer para el modelo AuditoriaLog (SOLO LECTURA).
@@ -651,15 +1026,21 @@ class MovilizacionInputSerializer(serializers.Serializer):
     CAMPOS:
     - id_ubicacion_destino: ID de la ubicación a la que se moverá el activo (requerido)
     - notas: Comentarios u observaciones sobre el movimiento (opcional)
+    - tipo_movimiento: Tipo de movimiento del historial (opcional, default: TRASLADO)
+    - estado_id: Nuevo estado del activo, aplicado en la misma transacción (opcional)
 
     VALIDACIÓN:
     - El id_ubicacion_destino debe ser un entero positivo
     - Las notas pueden estar vacías o en blanco
+    - estado_id se valida contra el catálogo en memoria (sin consulta)
+    - Si el destino es la ubicación actual, estado_id es obligatorio (lo valida la vista)
 
     EJEMPLO DE USO:
     ```json
     {
         "id_ubicacion_destino": 5,
+        "tipo_movimiento": "MANTENIMIENTO",
+        "estado_id": 3,
         "notas": "Traslado por mantenimiento preventivo programado"
     }
     ```
@@ -683,6 +1064,19 @@ class MovilizacionInputSerializer(serializers.Serializer):
         help_text="Comentarios u observaciones sobre el movimiento (opcional)"
     )
 
+    tipo_movimiento = serializers.ChoiceField(
+        choices=HistorialMovimiento.TIPOS_MOVIMIENTO,
+        default='TRASLADO',
+        help_text="Tipo de movimiento registrado en el historial (default: TRASLADO)"
+    )
+
+    estado_id = CatalogoPrimaryKeyRelatedField(
+        queryset=EstadoActivo.objects.all(),
+        source='estado',
+        required=False,
+        help_text="Nuevo estado del activo (opcional; se aplica junto con el traslado)"
+    )
+
     def validate_id_ubicacion_destino(self, value):
         """
         Valida que la ubicación destino exista en la base de datos.
@@ -704,3 +1098,132 @@ class MovilizacionInputSerializer(serializers.Serializer):
             )
         return value
 
+
+class MovilizacionLoteInputSerializer(serializers.Serializer):
+    """
+    Serializer de entrada para la movilización en lote de activos.
+
+    CONTEXTO DE USO:
+    - Se usa en el endpoint POST /api/activos/movilizar-lote/
+    - Mueve varios activos a la misma ubicación destino en una transacción
+
+    CAMPOS:
+    - ids_activos: IDs de los activos a movilizar (requerido, sin repetir se toma el primero)
+    - id_ubicacion_destino: ID de la ubicación destino (requerido; se valida en la vista)
+    - notas: Comentarios u observaciones sobre el movimiento (opcional)
+
+    EJEMPLO DE USO:
+    ```json
+    {
+        "ids_activos": [12, 15, 18],
+        "id_ubicacion_destino": 5,
+        "notas": "Traslado de equipos por remodelación de la sala"
+    }
+    ```
+    """
+
+    ids_activos = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=MAX_ACTIVOS_LOTE,
+        help_text=f"IDs de los activos a movilizar (máximo {MAX_ACTIVOS_LOTE})"
+    )
+
+    id_ubicacion_destino = serializers.IntegerField(
+        required=True,
+        min_value=1,
+        help_text="ID de la ubicación destino donde se moverán los activos"
+    )
+
+    notas = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=500,
+        help_text="Comentarios u observaciones sobre el movimiento (opcional)"
+    )
+
+    def validate_ids_activos(self, value):
+        """Quita los IDs repetidos conservando el orden de la petición."""
+        return list(dict.fromkeys(value))
+
+
+class ReporteParametrosSerializer(serializers.Serializer):
+    """
+    Serializer de entrada (query params) para GET /api/reportes/.
+
+    Recibe la misma configuración que el diálogo de ReportesView.vue.
+
+    CAMPOS:
+    - reporte: Tipo de reporte (ej: por_estado, movimientos_periodo) (requerido)
+    - estado, ubicacion, tipo, departamento, usuario, activo: IDs para filtrar (opcionales)
+    - periodo: 7dias, 30dias, mes, trimestre, año o personalizado (default: 30dias)
+    - fecha_desde / fecha_hasta: Rango de fechas (YYYY-MM-DD), tiene prioridad sobre el período
+    - formato: json (default), csv o xlsx ('excel' se acepta como sinónimo de xlsx)
+    - limite: Máximo de filas en los rankings de activos (default: 50)
+
+    EJEMPLO:
+        GET /api/reportes/?reporte=por_tipo&departamento=3
+        GET /api/reportes/?reporte=movimientos_periodo&periodo=personalizado&fecha_desde=2025-01-01&fecha_hasta=2025-03-31
+    """
+
+    reporte = serializers.ChoiceField(
+        choices=list(REPORTES),
+        help_text="Tipo de reporte a generar"
+    )
+    estado = serializers.IntegerField(required=False, min_value=1, help_text="ID del estado de activo")
+    ubicacion = serializers.IntegerField(required=False, min_value=1, help_text="ID de la ubicación")
+    tipo = serializers.IntegerField(required=False, min_value=1, help_text="ID del tipo de equipo")
+    departamento = serializers.IntegerField(required=False, min_value=1, help_text="ID del departamento")
+    usuario = serializers.IntegerField(required=False, min_value=1, help_text="ID del usuario que registró")
+    activo = serializers.IntegerField(required=False, min_value=1, help_text="ID del activo")
+    periodo = serializers.ChoiceField(
+        choices=list(PERIODOS),
+        default='30dias',
+        help_text="Período a considerar en los reportes de movimientos"
+    )
+    fecha_desde = serializers.DateField(required=False, help_text="Inicio del rango (incluido)")
+    fecha_hasta = serializers.DateField(required=False, help_text="Fin del rango (incluido)")
+    formato = serializers.ChoiceField(
+        choices=['json', 'csv', 'xlsx', 'excel'],
+        default='json',
+        help_text="Formato de la respuesta"
+    )
+    limite = serializers.IntegerField(
+        required=False,
+        default=50,
+        min_value=1,
+        max_value=1000,
+        help_text="Máximo de filas en los rankings de activos"
+    )
+
+    def validate_formato(self, value):
+        """'excel' (valor del frontend) equivale a xlsx."""
+        return 'xlsx' if value == 'excel' else value
+
+    def validate(self, attrs):
+        """
+        Valida combinaciones de parámetros.
+
+        Raises:
+            ValidationError: Si el rango de fechas es inválido, si el período
+                personalizado no trae fechas o si falta el activo en historial_activo
+        """
+        fecha_desde = attrs.get('fecha_desde')
+        fecha_hasta = attrs.get('fecha_hasta')
+
+        if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+            raise serializers.ValidationError({
+                'fecha_hasta': "La fecha hasta debe ser igual o posterior a la fecha desde"
+            })
+
+        if attrs.get('periodo') == 'personalizado' and not (fecha_desde or fecha_hasta):
+            raise serializers.ValidationError({
+                'periodo': "El período personalizado requiere fecha_desde y/o fecha_hasta"
+            })
+
+        if attrs['reporte'] == 'historial_activo' and not attrs.get('activo'):
+            raise serializers.ValidationError({
+                'activo': "El reporte historial_activo requiere el ID del activo"
+            })
+
+        return attrs
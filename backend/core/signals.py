@@ -0,0 +1,91 @@
+"""
+Señales de Django para el SCA Hospital.
+
+Mantienen las cachés derivadas al día cuando cambian los datos de origen.
+
+Nota: QuerySet.update() y bulk_create() no disparan señales; el código que
+los use debe llamar a notificar_cambio_masivo() con los modelos afectados.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    Rol,
+    Usuario,
+    Departamento,
+    Ubicacion,
+    TipoEquipo,
+    EstadoActivo,
+    Activo,
+    HistorialMovimiento
+)
+from .versiones import registrar_cambio
+from .inventario import invalidar_inventario_ubicaciones
+from .perfil import invalidar_perfil
+
+
+@receiver([post_save, post_delete], sender=Rol)
+@receiver([post_save, post_delete], sender=Usuario)
+@receiver([post_save, post_delete], sender=Departamento)
+@receiver([post_save, post_delete], sender=Ubicacion)
+@receiver([post_save, post_delete], sender=TipoEquipo)
+@receiver([post_save, post_delete], sender=EstadoActivo)
+@receiver([post_save, post_delete], sender=Activo)
+@receiver([post_save, post_delete], sender=HistorialMovimiento)
+def actualizar_version_modelo(sender, **kwargs):
+    """
+    Actualiza la marca de cambio del modelo al confirmar la transacción.
+
+    La usan los catálogos en memoria (core.catalogos), las respuestas
+    condicionales ETag / Last-Modified de los ViewSets y los datos derivados
+    en la caché (ej: resumen del dashboard).
+    """
+    transaction.on_commit(lambda: registrar_cambio(sender))
+
+
+@receiver(post_init, sender=Activo)
+def recordar_ubicacion_cargada(sender, instance, **kwargs):
+    """Guarda la ubicación con que se cargó el activo, para invalidar también la de origen."""
+    instance._ubicacion_cargada_id = instance.__dict__.get('ubicacion_actual_id')
+
+
+@receiver(post_save, sender=Activo)
+@receiver(post_delete, sender=Activo)
+def invalidar_inventario_ubicacion(sender, instance, **kwargs):
+    """
+    Borra la foto de inventario de la ubicación actual del activo y de la anterior
+    (crear, editar, movilizar o eliminar) al confirmar la transacción.
+    """
+    ids_ubicacion = {instance.ubicacion_actual_id, getattr(instance, '_ubicacion_cargada_id', None)}
+    instance._ubicacion_cargada_id = instance.ubicacion_actual_id
+    transaction.on_commit(lambda: invalidar_inventario_ubicaciones(ids_ubicacion))
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def invalidar_perfil_usuario(sender, instance, **kwargs):
+    """Borra el perfil en caché del usuario (autenticación y /api/usuarios/me/) al confirmar la transacción."""
+    usuario_id = instance.pk
+    transaction.on_commit(lambda: invalidar_perfil(usuario_id))
+
+
+def notificar_cambio_masivo(*modelos, ids_ubicacion=()):
+    """
+    Mantiene las cachés al día tras un QuerySet.update() o bulk_create(), al
+    confirmar la transacción (lo mismo que harían las señales fila a fila).
+
+    Los perfiles de usuario en caché se borran por usuario: tras un
+    Usuario.objects.update() hay que llamar a invalidar_perfil() por cada uno.
+
+    Args:
+        modelos: Modelos modificados (se registra su marca de cambio)
+        ids_ubicacion: Ubicaciones cuyos activos cambiaron (foto de inventario)
+    """
+    ids_ubicacion = set(ids_ubicacion)
+
+    def notificar():
+        registrar_cambio(*modelos)
+        invalidar_inventario_ubicaciones(ids_ubicacion)
+
+    transaction.on_commit(notificar)
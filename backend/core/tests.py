@@ -1,3 +1,1504 @@
-from django.test import TestCase
+"""
+Pruebas de la app core del SCA Hospital.
 
-# Create your tests here.
+Ejecutar:
+    python manage.py test core
+"""
+
+import csv
+import gzip
+import io
+import json
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import (
+    Activo, AuditoriaLog, CodigoPool, Departamento, EstadoActivo, HistorialMovimiento, Rol, SecuenciaCodigo, TipoEquipo, Ubicacion, Usuario,
+    VersionModelo
+)
+from .codigos import (
+    CLAVES_PERMUTACION, MAX_VALOR_SECUENCIA, SECUENCIA_INVENTARIO, SECUENCIA_UBICACION, codigos_disponibles,
+    crear_con_codigos, generar_codigos_inventario, guardar_con_codigo, llenar_pool, permutar, prefijo_vigente,
+    tomar_codigos_inventario
+)
+from .catalogos import obtener_catalogo
+from .dashboard import obtener_resumen_dashboard
+from .esquema import Esquema
+from .middleware import elegir_codificacion
+from .inventario import obtener_inventario_ubicacion
+from .permissions import (
+    ADMINISTRADOR, JEFE, LECTURA, POLITICA_ACCESO, TECNICO, TODAS_LAS_ACCIONES, TOTAL, PoliticaAcceso,
+    comprobar_politica_vistas, compilar_politica, permite
+)
+from .reportes import reporte_tiempo_promedio
+from .serializers import HistorialMovimientoSerializer
+from .urls import router
+from .views import ActivoViewSet
+
+
+def crear_usuario(username, nombre_rol=None):
+    """Crea un usuario con el rol indicado (o sin rol) y retorna un APIClient autenticado como él."""
+    rol = Rol.objects.get_or_create(nombre_rol=nombre_rol)[0] if nombre_rol else None
+    usuario = Usuario.objects.create_user(username=username, password='clave-prueba', rol=rol)
+    cliente = APIClient()
+    cliente.force_authenticate(usuario)
+    return cliente
+
+
+def crear_ubicacion(nombre):
+    """Crea una ubicación en el departamento de pruebas."""
+    departamento = Departamento.objects.get_or_create(nombre_departamento='Imagenología')[0]
+    return Ubicacion.objects.create(nombre_ubicacion=nombre, departamento=departamento)
+
+
+def nuevo_activo(numero_serie, ubicacion):
+    """Activo sin guardar, con el tipo y el estado de pruebas."""
+    return Activo(
+        numero_serie=numero_serie, marca='GE', modelo='Logiq',
+        tipo=TipoEquipo.objects.get_or_create(nombre_tipo='Ecógrafo')[0],
+        estado=EstadoActivo.objects.get_or_create(nombre_estado='Operativo')[0],
+        ubicacion_actual=ubicacion
+    )
+
+
+def marcar_cambio_en_otro_worker(modelo):
+    """Deja en la base la marca nueva de un modelo, como registrar_cambio() en otro proceso."""
+    VersionModelo.objects.filter(modelo=modelo._meta.label_lower).update(version=F('version') + 1)
+
+
+# ==============================================================================
+# RBAC (core.permissions)
+# ==============================================================================
+
+class TablaPoliticaTests(TestCase):
+    """Tabla compilada de POLITICA_ACCESO: (rol, vista, acción, método) -> permitido."""
+
+    ROLES = {1: ADMINISTRADOR, 2: TECNICO, 3: JEFE}
+
+    def setUp(self):
+        self.tabla = compilar_politica(self.ROLES)
+
+    def metodos_permitidos(self, rol_id, vista, accion):
+        return {metodo for metodo in TOTAL if permite(self.tabla, rol_id, vista, accion, metodo)}
+
+    def test_jefe_solo_lee_activos(self):
+        for accion in ('list', 'retrieve', 'create', 'update', 'partial_update', 'destroy', 'lote', 'actualizar_lote'):
+            self.assertEqual(self.metodos_permitidos(3, 'ActivoViewSet', accion), LECTURA)
+        self.assertEqual(self.metodos_permitidos(3, 'ActivoViewSet', 'movilizar'), set())
+
+    def test_tecnico_no_elimina_activos(self):
+        self.assertFalse(permite(self.tabla, 2, 'ActivoViewSet', 'destroy', 'DELETE'))
+        self.assertEqual(self.metodos_permitidos(2, 'ActivoViewSet', 'movilizar'), TOTAL - {'DELETE'})
+
+    def test_sin_rol_solo_consulta_autenticado(self):
+        vistas_consulta = {'DepartamentoViewSet', 'UbicacionViewSet'}
+        for vista in ('DepartamentoViewSet', 'UbicacionViewSet', 'ActivoViewSet', 'RolViewSet', 'AuditoriaLogViewSet'):
+            esperado = LECTURA if vista in vistas_consulta else set()
+            self.assertEqual(self.metodos_permitidos(None, vista, 'list'), esperado, vista)
+            self.assertEqual(self.metodos_permitidos(None, vista, 'destroy'), set(), vista)
+
+    def test_accion_no_declarada_usa_el_comodin(self):
+        self.assertFalse(permite(self.tabla, 2, 'RolViewSet', 'accion_nueva', 'GET'))
+        self.assertTrue(permite(self.tabla, 1, 'RolViewSet', 'accion_nueva', 'GET'))
+        self.assertNotIn((1, 'RolViewSet', 'accion_nueva', 'GET'), self.tabla)
+        self.assertIn((1, 'RolViewSet', TODAS_LAS_ACCIONES, 'GET'), self.tabla)
+
+    def test_vista_no_declarada_se_deniega(self):
+        self.assertFalse(permite(self.tabla, 1, 'VistaNueva', 'list', 'GET'))
+
+
+class PoliticaAccesoTests(TestCase):
+    """PoliticaAcceso sobre peticiones reales."""
+
+    def test_jefe_no_escribe_activos(self):
+        cliente = crear_usuario('jefe', JEFE)
+        self.assertEqual(cliente.get('/api/activos/').status_code, 200)
+        self.assertEqual(cliente.post('/api/activos/', {}).status_code, 403)
+        self.assertEqual(cliente.patch('/api/activos/lote/', {}, format='json').status_code, 403)
+
+    def test_tecnico_no_elimina_activos(self):
+        cliente = crear_usuario('tecnico', TECNICO)
+        self.assertEqual(cliente.delete('/api/activos/1/').status_code, 403)
+
+    def test_sin_rol(self):
+        cliente = crear_usuario('sin_rol')
+        self.assertEqual(cliente.get('/api/departamentos/').status_code, 200)
+        self.assertEqual(cliente.post('/api/departamentos/', {}).status_code, 403)
+        self.assertEqual(cliente.get('/api/activos/').status_code, 403)
+
+    def test_options_en_me_usa_la_accion_de_la_ruta(self):
+        # OPTIONS se evalúa como 'me' (cualquier autenticado), no con el comodín SOLO_ADMIN
+        for username, nombre_rol in (('tecnico', TECNICO), ('sin_rol', None)):
+            cliente = crear_usuario(username, nombre_rol)
+            self.assertEqual(cliente.options('/api/usuarios/me/').status_code, 200, username)
+            self.assertEqual(cliente.get('/api/usuarios/me/').status_code, 200, username)
+
+    def test_subclase_renombrada_conserva_la_politica(self):
+        class ActivoViewSetV2(ActivoViewSet):
+            pass
+
+        crear_usuario('jefe', JEFE)
+        vista = ActivoViewSetV2(action='list')
+        lectura = mock.Mock(method='GET', user=Usuario.objects.get(username='jefe'))
+        escritura = mock.Mock(method='POST', user=lectura.user)
+
+        self.assertEqual(vista.politica, 'ActivoViewSet')
+        self.assertTrue(PoliticaAcceso().has_permission(lectura, vista))
+        self.assertFalse(PoliticaAcceso().has_permission(escritura, vista))
+
+
+class PoliticaVistasTests(TestCase):
+    """Toda vista registrada en el router tiene entrada en POLITICA_ACCESO."""
+
+    def test_vistas_del_router_estan_en_la_politica(self):
+        for prefijo, vista, _ in router.registry:
+            self.assertIn(PoliticaAcceso, vista.permission_classes, prefijo)
+            self.assertIn(getattr(vista, 'politica', None), POLITICA_ACCESO, prefijo)
+        self.assertEqual(comprobar_politica_vistas(), [])
+
+    def test_vista_sin_entrada_detiene_el_arranque(self):
+        class VistaNueva(ActivoViewSet):
+            politica = 'VistaNueva'
+
+        registro = [*router.registry, ('nueva', VistaNueva, 'nueva')]
+        with mock.patch.object(router, 'registry', registro):
+            errores = comprobar_politica_vistas()
+
+        self.assertEqual([error.id for error in errores], ['core.E001'])
+        self.assertIs(errores[0].obj, VistaNueva)
+
+
+# ==============================================================================
+# GET CONDICIONAL (ETag / Last-Modified)
+# ==============================================================================
+
+class RespuestaCondicionalTests(TestCase):
+    """Los ETags salen de las marcas de cambio compartidas por todos los workers."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        EstadoActivo.objects.create(nombre_estado='Operativo')
+
+    def test_304_si_nada_cambio(self):
+        respuesta = self.cliente.get('/api/estados-activo/')
+        self.assertEqual(respuesta.status_code, 200)
+
+        revalidacion = self.cliente.get('/api/estados-activo/', HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(revalidacion.status_code, 304)
+
+    def test_cambio_en_otro_worker_invalida_el_etag(self):
+        respuesta = self.cliente.get('/api/estados-activo/')
+        etag = respuesta['ETag']
+
+        # Otro worker: escribe sin pasar por este proceso (ni su caché ni sus
+        # señales) y solo deja la marca nueva en la base, como registrar_cambio()
+        EstadoActivo.objects.bulk_create([EstadoActivo(nombre_estado='En Reparación')])
+        marcar_cambio_en_otro_worker(EstadoActivo)
+
+        revalidacion = self.cliente.get('/api/estados-activo/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidacion.status_code, 200)
+        self.assertNotEqual(revalidacion['ETag'], etag)
+        self.assertIn('En Reparación', str(revalidacion.content, 'utf-8'))
+
+
+# ==============================================================================
+# REPORTES
+# ==============================================================================
+
+class ReporteTiempoPromedioTests(TestCase):
+    """El retorno de un mantenimiento es el movimiento siguiente del activo, cumpla o no los filtros."""
+
+    def setUp(self):
+        self.taller = crear_ubicacion('Taller')
+        self.sala = crear_ubicacion('Sala 101')
+        self.otra_sala = crear_ubicacion('Sala 205')
+        self.tecnico = Usuario.objects.create_user(username='tecnico', password='clave-prueba')
+        self.otro_tecnico = Usuario.objects.create_user(username='otro', password='clave-prueba')
+        activo = nuevo_activo('SN-001', self.sala)
+        activo.save()
+
+        # Envío al taller y retorno 10 horas después, a otra ubicación y por otro usuario
+        envio = timezone.now() - timedelta(days=2)
+        for fecha, tipo, origen, destino, usuario in [
+            (envio, 'MANTENIMIENTO', self.sala, self.taller, self.tecnico),
+            (envio + timedelta(hours=10), 'TRASLADO', self.taller, self.otra_sala, self.otro_tecnico),
+        ]:
+            movimiento = HistorialMovimiento.objects.create(
+                activo=activo, tipo_movimiento=tipo, usuario_registra=usuario,
+                ubicacion_origen=origen, ubicacion_destino=destino
+            )
+            HistorialMovimiento.objects.filter(pk=movimiento.pk).update(fecha_movimiento=fecha)
+
+    def assertMantenimientoCerrado(self, filtros):
+        metricas = reporte_tiempo_promedio(filtros)[0]
+        self.assertEqual(metricas['total_envios'], 1)
+        self.assertEqual(metricas['mantenimientos_cerrados'], 1)
+        self.assertEqual(metricas['promedio_horas'], 10)
+
+    def test_sin_filtros(self):
+        self.assertMantenimientoCerrado({})
+
+    def test_filtro_de_usuario_no_oculta_el_retorno(self):
+        self.assertMantenimientoCerrado({'usuario': self.tecnico.pk})
+
+    def test_filtro_de_ubicacion_no_oculta_el_retorno(self):
+        self.assertMantenimientoCerrado({'ubicacion': self.sala.pk})
+
+    def test_envio_fuera_del_filtro(self):
+        metricas = reporte_tiempo_promedio({'usuario': self.otro_tecnico.pk})[0]
+        self.assertEqual(metricas['total_envios'], 0)
+
+
+# ==============================================================================
+# DASHBOARD
+# ==============================================================================
+
+class ResumenDashboardTests(TestCase):
+    """El resumen en caché se recalcula cuando cambia la marca de sus modelos."""
+
+    def test_cambio_en_otro_worker_recalcula_el_resumen(self):
+        sala = crear_ubicacion('Sala 101')
+        nuevo_activo('SN-001', sala).save()
+        self.assertEqual(obtener_resumen_dashboard()['activos']['total'], 1)
+
+        Activo.objects.bulk_create([nuevo_activo('SN-002', sala)])
+        self.assertEqual(obtener_resumen_dashboard()['activos']['total'], 1)
+
+        marcar_cambio_en_otro_worker(Activo)
+        self.assertEqual(obtener_resumen_dashboard()['activos']['total'], 2)
+
+
+# ==============================================================================
+# CÓDIGOS DE INVENTARIO (core.codigos)
+# ==============================================================================
+
+class PermutacionTests(TestCase):
+    """La permutación de 24 bits no repite códigos."""
+
+    def test_biyeccion_en_una_muestra(self):
+        muestra = [*range(0, 1 << 16), *range(MAX_VALOR_SECUENCIA - (1 << 12), MAX_VALOR_SECUENCIA + 1)]
+        for claves in CLAVES_PERMUTACION.values():
+            permutados = {permutar(valor, claves) for valor in muestra}
+            self.assertEqual(len(permutados), len(muestra))
+            self.assertTrue(all(0 <= valor <= MAX_VALOR_SECUENCIA for valor in permutados))
+
+    def test_consecutivos_no_son_correlativos(self):
+        claves = CLAVES_PERMUTACION[SECUENCIA_INVENTARIO]
+        self.assertNotEqual(permutar(2, claves) - permutar(1, claves), 1)
+
+
+class GuardarConCodigoTests(TestCase):
+    """Reintentos de guardar_con_codigo ante un IntegrityError."""
+
+    def setUp(self):
+        self.sala = crear_ubicacion('Sala 101')
+        self.generados = []
+
+    def generar(self, cantidad):
+        """generar_codigos_inventario que recuerda lo entregado."""
+        codigos = generar_codigos_inventario(cantidad)
+        self.generados.extend(codigos)
+        return codigos
+
+    def guardar(self, activo):
+        guardar_con_codigo(activo, 'codigo_inventario', self.generar, lambda: super(Activo, activo).save())
+
+    def siguiente_codigo(self, salto=1):
+        """Código que entregará la secuencia dentro de `salto` valores."""
+        valor = SecuenciaCodigo.objects.get(nombre=SECUENCIA_INVENTARIO).ultimo_valor + salto
+        return f"{prefijo_vigente(SECUENCIA_INVENTARIO)}{permutar(valor, CLAVES_PERMUTACION[SECUENCIA_INVENTARIO]):06X}"
+
+    def crear_activo_antiguo(self, codigo):
+        """Activo con un código aleatorio de antes de la secuencia."""
+        antiguo = nuevo_activo('SN-ANTIGUO', self.sala)
+        antiguo.codigo_inventario = codigo
+        antiguo.save()
+        return antiguo
+
+    def test_choque_con_codigo_antiguo_se_reintenta_una_vez(self):
+        # Código aleatorio antiguo que coincide con el próximo de la secuencia
+        proximo, siguiente = self.siguiente_codigo(1), self.siguiente_codigo(2)
+        self.crear_activo_antiguo(proximo)
+
+        activo = nuevo_activo('SN-001', self.sala)
+        self.guardar(activo)
+
+        self.assertEqual(self.generados, [proximo, siguiente])
+        self.assertEqual(activo.codigo_inventario, siguiente)
+        self.assertTrue(Activo.objects.filter(pk=activo.pk, codigo_inventario=siguiente).exists())
+
+    def test_otra_restriccion_unica_no_se_reintenta(self):
+        nuevo_activo('SN-001', self.sala).save()
+
+        repetido = nuevo_activo('SN-001', self.sala)
+        with self.assertRaises(IntegrityError):
+            self.guardar(repetido)
+
+        self.assertEqual(len(self.generados), 1)
+        self.assertIsNone(repetido.codigo_inventario)
+
+    def test_lote_solo_regenera_los_codigos_que_chocan(self):
+        # Solo el primero del lote choca: se le asigna el cuarto valor de la secuencia
+        self.crear_activo_antiguo(self.siguiente_codigo(1))
+        esperados = [self.siguiente_codigo(4), self.siguiente_codigo(2), self.siguiente_codigo(3)]
+
+        activos = [nuevo_activo(f'SN-{numero}', self.sala) for numero in range(3)]
+        crear_con_codigos(Activo, activos, 'codigo_inventario', self.generar)
+
+        self.assertEqual(len(self.generados), 4)
+        self.assertEqual([activo.codigo_inventario for activo in activos], esperados)
+        self.assertEqual(Activo.objects.count(), 4)
+
+
+@override_settings(CODIGOS_POOL_UMBRAL=5, CODIGOS_POOL_RECARGA=10, CODIGOS_POOL_INTERVALO=60)
+class PoolCodigosTests(TestCase):
+    """Toma de códigos del pool y su recarga (en la petición o con llenar_pool_codigos)."""
+
+    def setUp(self):
+        cache.clear()
+        self.sala = crear_ubicacion('Sala 101')
+
+    def disponibles(self):
+        return codigos_disponibles(SECUENCIA_INVENTARIO)
+
+    def test_toma_en_orden_y_borra_del_pool(self):
+        llenar_pool(SECUENCIA_INVENTARIO, 8)
+        en_pool = list(CodigoPool.objects.filter(secuencia=SECUENCIA_INVENTARIO).order_by('id').values_list('codigo', flat=True))
+
+        with self.captureOnCommitCallbacks(execute=False):
+            codigos = tomar_codigos_inventario(3)
+
+        self.assertEqual(codigos, en_pool[:3])
+        self.assertEqual(self.disponibles(), 5)
+
+    def test_pool_vacio_usa_el_contador(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            codigo, = tomar_codigos_inventario(1)
+
+        self.assertTrue(codigo.startswith(prefijo_vigente(SECUENCIA_INVENTARIO)))
+        self.assertEqual(SecuenciaCodigo.objects.get(nombre=SECUENCIA_INVENTARIO).ultimo_valor, 1)
+
+    def test_recarga_al_confirmar_bajo_el_umbral(self):
+        llenar_pool(SECUENCIA_INVENTARIO, 5)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            tomar_codigos_inventario(1)
+            # Dentro de la transacción todavía no se recargó
+            self.assertEqual(self.disponibles(), 4)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.disponibles(), 14)
+
+    def test_nivel_se_verifica_una_vez_por_intervalo(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tomar_codigos_inventario(1)
+        self.assertEqual(self.disponibles(), 10)
+
+        CodigoPool.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            tomar_codigos_inventario(1)
+        self.assertEqual(self.disponibles(), 0)
+
+    def test_error_en_la_recarga_se_registra_y_el_guardado_sigue(self):
+        activo = nuevo_activo('SN-001', self.sala)
+        with mock.patch('core.codigos.llenar_pool', side_effect=DatabaseError('sin conexión')), \
+                self.assertLogs('core.codigos', 'ERROR') as logs, \
+                self.captureOnCommitCallbacks(execute=True):
+            activo.save()
+
+        self.assertIn('No se pudo recargar el pool de códigos codigo_inventario', logs.output[0])
+        self.assertTrue(Activo.objects.filter(pk=activo.pk).exists())
+
+    @override_settings(CODIGOS_POOL_RECARGA_EN_PETICION=False)
+    def test_sin_recarga_en_peticion(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            tomar_codigos_inventario(1)
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.disponibles(), 0)
+
+    def test_comando_si_hace_falta_solo_recarga_bajo_el_umbral(self):
+        llenar_pool(SECUENCIA_UBICACION, 5)
+        salida = io.StringIO()
+        call_command('llenar_pool_codigos', '--si-hace-falta', stdout=salida)
+
+        self.assertEqual(self.disponibles(), 10)
+        self.assertEqual(codigos_disponibles(SECUENCIA_UBICACION), 5)
+        self.assertIn('codigo_qr: 0 códigos agregados (5 disponibles)', salida.getvalue())
+
+        call_command('llenar_pool_codigos', '--si-hace-falta', stdout=io.StringIO())
+        self.assertEqual(self.disponibles(), 10)
+
+
+# ==============================================================================
+# ALTA DE ACTIVOS EN LOTE
+# ==============================================================================
+
+class AltaLoteTests(TestCase):
+    """POST /api/activos/lote/ informa en una sola respuesta los errores de todas las filas."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        self.sala = crear_ubicacion('Sala 101')
+        nuevo_activo('SN-EXISTENTE', self.sala).save()
+
+    def fila(self, numero_serie, **campos):
+        return {
+            'numero_serie': numero_serie, 'marca': 'GE', 'modelo': 'Logiq',
+            'tipo_id': TipoEquipo.objects.get().pk, 'estado_id': EstadoActivo.objects.get().pk,
+            'ubicacion_actual_id': self.sala.pk, **campos
+        }
+
+    def test_errores_de_numero_serie_junto_con_los_de_otras_filas(self):
+        respuesta = self.cliente.post('/api/activos/lote/', {'activos': [
+            self.fila('SN-001'),
+            self.fila('SN-EXISTENTE'),
+            self.fila('SN-001'),
+            self.fila('SN-002', marca=''),
+        ]}, format='json')
+
+        self.assertEqual(respuesta.status_code, 400)
+        errores = respuesta.data['errors']['activos']
+        self.assertEqual(errores[0], {})
+        self.assertEqual(set(errores[1]), {'numero_serie'})
+        self.assertIn('fila 0', str(errores[2]['numero_serie'][0]))
+        self.assertEqual(set(errores[3]), {'marca'})
+        self.assertEqual(Activo.objects.count(), 1)
+
+
+# ==============================================================================
+# PAGINACIÓN (core.pagination)
+# ==============================================================================
+
+def recorrer_paginas(cliente, url, params, maximo_paginas=100):
+    """Sigue los enlaces 'next' desde la primera página y retorna los IDs en orden."""
+    ids = []
+    respuesta = cliente.get(url, params)
+    for _ in range(maximo_paginas):
+        ids.extend(fila['id'] for fila in respuesta.data['results'])
+        if not respuesta.data['next']:
+            return ids
+        respuesta = cliente.get(respuesta.data['next'])
+    raise AssertionError(f"El enlace 'next' no terminó después de {maximo_paginas} páginas")
+
+
+class PaginacionCursorTests(TestCase):
+    """Todas las filas se alcanzan una sola vez siguiendo 'next', sea cual sea ?ordering=."""
+
+    # Más empates que offset_cutoff (1000) de CursorPagination
+    TOTAL_FILAS = 1200
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = Usuario.objects.create_user(
+            username='admin', password='clave-prueba',
+            rol=Rol.objects.create(nombre_rol=ADMINISTRADOR)
+        )
+        sala = crear_ubicacion('Sala 101')
+        activo = nuevo_activo('SN-001', sala)
+        activo.save()
+        HistorialMovimiento.objects.bulk_create([
+            HistorialMovimiento(
+                activo=activo, usuario_registra=cls.usuario, ubicacion_origen=sala,
+                ubicacion_destino=sala, tipo_movimiento='TRASLADO'
+            )
+            for _ in range(cls.TOTAL_FILAS)
+        ])
+        AuditoriaLog.objects.bulk_create([
+            AuditoriaLog(usuario=cls.usuario, accion='UPDATE', detalle_accion={})
+            for _ in range(cls.TOTAL_FILAS)
+        ])
+
+    def setUp(self):
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.usuario)
+
+    def assertRecorridoCompleto(self, url, **params):
+        ids = recorrer_paginas(self.cliente, url, {'page_size': 100, **params})
+        self.assertEqual(len(ids), self.TOTAL_FILAS, params)
+        self.assertEqual(len(set(ids)), self.TOTAL_FILAS, params)
+
+    def test_historial_por_fecha(self):
+        self.assertRecorridoCompleto('/api/historial-movimientos/')
+        self.assertRecorridoCompleto('/api/historial-movimientos/', ordering='fecha_movimiento')
+
+    def test_historial_por_campo_con_empates(self):
+        self.assertRecorridoCompleto('/api/historial-movimientos/', ordering='tipo_movimiento')
+
+    def test_auditoria_por_campo_con_empates(self):
+        self.assertRecorridoCompleto('/api/auditoria-logs/', ordering='-timestamp')
+        self.assertRecorridoCompleto('/api/auditoria-logs/', ordering='accion')
+
+    def test_orden_por_fecha_usa_el_cursor(self):
+        respuesta = self.cliente.get('/api/historial-movimientos/', {'page_size': 100})
+        self.assertIn('cursor=', respuesta.data['next'])
+        self.assertNotIn('count', respuesta.data)
+
+
+class ConteoEstimadoTests(TestCase):
+    """La estimación de PostgreSQL solo se informa en 'count': no decide 'next' ni qué páginas existen."""
+
+    TOTAL_FILAS = 30
+
+    @classmethod
+    def setUpTestData(cls):
+        departamento = Departamento.objects.create(nombre_departamento='Imagenología')
+        for numero in range(cls.TOTAL_FILAS):
+            Ubicacion.objects.create(nombre_ubicacion=f'Sala {numero:03d}', departamento=departamento)
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+
+    def pagina(self, numero, estimado):
+        with mock.patch('core.pagination.estimar_total_filas', return_value=estimado):
+            return self.cliente.get('/api/ubicaciones/', {'page': numero, 'page_size': 10})
+
+    def test_estimacion_menor_que_el_total(self):
+        segunda = self.pagina(2, estimado=20)
+        self.assertEqual(segunda.data['count'], 20)
+        self.assertTrue(segunda.data['count_aproximado'])
+        self.assertIsNotNone(segunda.data['next'])
+
+        tercera = self.pagina(3, estimado=20)
+        self.assertEqual(tercera.status_code, 200)
+        self.assertEqual(len(tercera.data['results']), 10)
+        self.assertIsNone(tercera.data['next'])
+
+    def test_estimacion_mayor_que_el_total(self):
+        tercera = self.pagina(3, estimado=40)
+        self.assertEqual(len(tercera.data['results']), 10)
+        self.assertIsNone(tercera.data['next'])
+
+        cuarta = self.pagina(4, estimado=40)
+        self.assertEqual(cuarta.status_code, 200)
+        self.assertEqual(cuarta.data['results'], [])
+        self.assertIsNotNone(cuarta.data['previous'])
+
+    def test_todas_las_filas_siguiendo_next(self):
+        with mock.patch('core.pagination.estimar_total_filas', return_value=20):
+            ids = recorrer_paginas(self.cliente, '/api/ubicaciones/', {'page_size': 10})
+        self.assertEqual(len(set(ids)), self.TOTAL_FILAS)
+
+    def test_sin_estimacion_se_valida_con_el_total(self):
+        self.assertEqual(self.pagina(4, estimado=None).status_code, 404)
+
+
+# ==============================================================================
+# OPERACIONES SOBRE VARIOS ACTIVOS (movilizar, movilizar-lote, PATCH lote)
+# ==============================================================================
+
+class OperacionActivosTestCase(TestCase):
+    """Base: dos salas, tres activos en la primera y un cliente por rol."""
+
+    def setUp(self):
+        self.admin = crear_usuario('admin', ADMINISTRADOR)
+        self.tecnico = crear_usuario('tecnico', TECNICO)
+        self.jefe = crear_usuario('jefe', JEFE)
+        self.sala = crear_ubicacion('Sala 101')
+        self.taller = crear_ubicacion('Taller')
+        self.activos = []
+        for numero in range(3):
+            activo = nuevo_activo(f'SN-{numero:03d}', self.sala)
+            activo.save()
+            self.activos.append(activo)
+        self.ids = [activo.pk for activo in self.activos]
+        self.en_reparacion = EstadoActivo.objects.create(nombre_estado='En Reparación')
+
+    def post(self, cliente, url, datos):
+        """POST que ejecuta los on_commit (notificar_cambio_masivo, marcas de cambio)."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return cliente.post(url, datos, format='json')
+
+    def patch(self, cliente, url, datos):
+        with self.captureOnCommitCallbacks(execute=True):
+            return cliente.patch(url, datos, format='json')
+
+    def ubicaciones(self):
+        return dict(Activo.objects.filter(pk__in=self.ids).values_list('pk', 'ubicacion_actual_id'))
+
+    def assertInvalidaCachesDeLectura(self, operacion):
+        """La operación cambia el ETag del listado y las fotos de inventario de las salas."""
+        etag = self.admin.get('/api/activos/')['ETag']
+        # Caché compartida: solo el borrado por ubicación (core.signals) mantiene la foto al día
+        with mock.patch('core.inventario.cache_compartida', return_value=True):
+            antes = self.fotos_inventario()
+            operacion()
+            despues = self.fotos_inventario()
+        self.assertEqual(self.admin.get('/api/activos/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        return antes, despues
+
+    def fotos_inventario(self):
+        """Activos de cada sala según la foto de inventario (id -> nombre del estado)."""
+        return {
+            ubicacion.pk: {
+                activo['id']: activo['estado']['nombre_estado']
+                for activo in obtener_inventario_ubicacion(ubicacion.codigo_qr)['activos']
+            }
+            for ubicacion in (self.sala, self.taller)
+        }
+
+
+class MovilizarLoteTests(OperacionActivosTestCase):
+    """POST /api/activos/movilizar-lote/ (core.movimientos)."""
+
+    url = '/api/activos/movilizar-lote/'
+
+    def movilizar(self, ids, cliente=None):
+        return self.post(cliente or self.tecnico, self.url, {
+            'ids_activos': ids, 'id_ubicacion_destino': self.taller.pk, 'notas': 'Remodelación'
+        })
+
+    def test_resultado_por_activo(self):
+        Activo.objects.filter(pk=self.ids[1]).update(ubicacion_actual=self.taller)
+
+        respuesta = self.movilizar([self.ids[0], self.ids[1], 999999])
+
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.data['data']
+        self.assertEqual(
+            [resultado['estado'] for resultado in datos['resultados']],
+            ['movido', 'omitido', 'no_encontrado']
+        )
+        self.assertEqual(datos['totales'], {'movido': 1, 'omitido': 1, 'no_encontrado': 1})
+        self.assertEqual(datos['resultados'][0]['ubicacion_origen']['id'], self.sala.pk)
+
+    def test_historial_y_auditoria_por_activo_movido(self):
+        self.movilizar(self.ids)
+
+        self.assertEqual(set(self.ubicaciones().values()), {self.taller.pk})
+        self.assertEqual(HistorialMovimiento.objects.filter(activo_id__in=self.ids).count(), 3)
+        logs = AuditoriaLog.objects.filter(accion='MOVILIZACION_ACTIVO')
+        self.assertEqual(sorted(log.detalle_accion['activo_id'] for log in logs), sorted(self.ids))
+
+    def test_todo_o_nada(self):
+        with mock.patch.object(AuditoriaLog.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.movilizar(self.ids)
+
+        self.assertEqual(set(self.ubicaciones().values()), {self.sala.pk})
+        self.assertFalse(HistorialMovimiento.objects.exists())
+
+    def test_invalida_etag_e_inventario_de_origen_y_destino(self):
+        antes, despues = self.assertInvalidaCachesDeLectura(lambda: self.movilizar(self.ids[:2]))
+        self.assertEqual(sorted(antes[self.sala.pk]), self.ids)
+        self.assertEqual(antes[self.taller.pk], {})
+        self.assertEqual(sorted(despues[self.sala.pk]), self.ids[2:])
+        self.assertEqual(sorted(despues[self.taller.pk]), self.ids[:2])
+
+    def test_jefe_no_moviliza(self):
+        self.assertEqual(self.movilizar(self.ids, cliente=self.jefe).status_code, 403)
+        self.assertEqual(set(self.ubicaciones().values()), {self.sala.pk})
+
+
+class ActualizarLoteTests(OperacionActivosTestCase):
+    """PATCH /api/activos/lote/ (core.ediciones)."""
+
+    url = '/api/activos/lote/'
+
+    def actualizar(self, ids, cliente=None):
+        return self.patch(cliente or self.tecnico, self.url, {
+            'ids_activos': ids, 'estado_id': self.en_reparacion.pk
+        })
+
+    def estados(self):
+        return set(Activo.objects.filter(pk__in=self.ids).values_list('estado__nombre_estado', flat=True))
+
+    def test_resultado_por_activo(self):
+        Activo.objects.filter(pk=self.ids[1]).update(estado=self.en_reparacion)
+
+        respuesta = self.actualizar([self.ids[0], self.ids[1], 999999])
+
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.data['data']
+        self.assertEqual(
+            [resultado['estado'] for resultado in datos['resultados']],
+            ['actualizado', 'sin_cambios', 'no_encontrado']
+        )
+        self.assertEqual(datos['totales'], {'actualizado': 1, 'sin_cambios': 1, 'no_encontrado': 1})
+
+    def test_auditoria_por_activo_actualizado(self):
+        self.actualizar(self.ids)
+
+        self.assertEqual(self.estados(), {'En Reparación'})
+        logs = [log.detalle_accion for log in AuditoriaLog.objects.filter(accion='UPDATE')]
+        self.assertEqual(sorted(detalle['activo_id'] for detalle in logs), sorted(self.ids))
+        self.assertTrue(all(detalle['lote'] for detalle in logs))
+
+    def test_todo_o_nada(self):
+        with mock.patch.object(AuditoriaLog.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.actualizar(self.ids)
+
+        self.assertEqual(self.estados(), {'Operativo'})
+
+    def test_invalida_etag_e_inventario(self):
+        antes, despues = self.assertInvalidaCachesDeLectura(lambda: self.actualizar(self.ids[:2]))
+        self.assertEqual(set(antes[self.sala.pk].values()), {'Operativo'})
+        self.assertEqual(
+            despues[self.sala.pk],
+            {self.ids[0]: 'En Reparación', self.ids[1]: 'En Reparación', self.ids[2]: 'Operativo'}
+        )
+
+    def test_jefe_no_edita_en_lote(self):
+        self.assertEqual(self.actualizar(self.ids, cliente=self.jefe).status_code, 403)
+        self.assertEqual(self.estados(), {'Operativo'})
+
+
+class MovilizarActivoTests(OperacionActivosTestCase):
+    """POST /api/activos/{id}/movilizar/ con cambio de estado (HU2)."""
+
+    def movilizar(self, cliente=None, **datos):
+        datos.setdefault('id_ubicacion_destino', self.taller.pk)
+        return self.post(cliente or self.tecnico, f'/api/activos/{self.ids[0]}/movilizar/', datos)
+
+    def test_aplica_estado_con_el_traslado(self):
+        respuesta = self.movilizar(tipo_movimiento='MANTENIMIENTO', estado_id=self.en_reparacion.pk)
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data['data']['estado'], {'anterior': 'Operativo', 'nuevo': 'En Reparación'})
+        self.assertEqual(respuesta.data['data']['activo']['estado']['nombre_estado'], 'En Reparación')
+        activo = Activo.objects.get(pk=self.ids[0])
+        self.assertEqual((activo.ubicacion_actual_id, activo.estado_id), (self.taller.pk, self.en_reparacion.pk))
+
+        historial = HistorialMovimiento.objects.get(activo=activo)
+        self.assertEqual(historial.tipo_movimiento, 'MANTENIMIENTO')
+        log = AuditoriaLog.objects.get(accion='MOVILIZACION_ACTIVO')
+        self.assertEqual(log.detalle_accion['historial_id'], historial.pk)
+        self.assertEqual(
+            (log.detalle_accion['estado_anterior'], log.detalle_accion['estado_nuevo']),
+            ('Operativo', 'En Reparación')
+        )
+
+    def test_sin_estado_conserva_el_actual(self):
+        self.movilizar()
+
+        self.assertEqual(Activo.objects.get(pk=self.ids[0]).estado.nombre_estado, 'Operativo')
+
+    def test_misma_ubicacion_solo_con_cambio_de_estado(self):
+        self.assertEqual(self.movilizar(id_ubicacion_destino=self.sala.pk).status_code, 400)
+        self.assertEqual(
+            self.movilizar(id_ubicacion_destino=self.sala.pk, estado_id=self.activos[0].estado_id).status_code,
+            400
+        )
+
+        respuesta = self.movilizar(
+            id_ubicacion_destino=self.sala.pk, tipo_movimiento='MANTENIMIENTO', estado_id=self.en_reparacion.pk
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        activo = Activo.objects.get(pk=self.ids[0])
+        self.assertEqual((activo.ubicacion_actual_id, activo.estado_id), (self.sala.pk, self.en_reparacion.pk))
+        historial = HistorialMovimiento.objects.get(activo=activo)
+        self.assertEqual((historial.ubicacion_origen_id, historial.ubicacion_destino_id), (self.sala.pk, self.sala.pk))
+        self.assertEqual(AuditoriaLog.objects.get(accion='MOVILIZACION_ACTIVO').detalle_accion['estado_nuevo'], 'En Reparación')
+
+    def test_todo_o_nada(self):
+        with mock.patch.object(AuditoriaLog.objects, 'create', side_effect=DatabaseError):
+            respuesta = self.movilizar(estado_id=self.en_reparacion.pk)
+
+        self.assertEqual(respuesta.status_code, 400)
+        activo = Activo.objects.get(pk=self.ids[0])
+        self.assertEqual((activo.ubicacion_actual_id, activo.estado_id), (self.sala.pk, self.activos[0].estado_id))
+        self.assertFalse(HistorialMovimiento.objects.exists())
+
+    def test_jefe_no_moviliza(self):
+        self.assertEqual(self.movilizar(cliente=self.jefe, estado_id=self.en_reparacion.pk).status_code, 403)
+        self.assertFalse(HistorialMovimiento.objects.exists())
+
+
+# ==============================================================================
+# LISTADOS (consultas por página)
+# ==============================================================================
+
+def contar_consultas(cliente, url):
+    """Retorna (respuesta, cantidad de consultas SQL) de un GET."""
+    with CaptureQueriesContext(connection) as consultas:
+        respuesta = cliente.get(url)
+    return respuesta, len(consultas.captured_queries)
+
+
+class ConsultasConstantesTests(TestCase):
+    """total_activos se anota en SQL: la página cuesta lo mismo con 1 o con N ubicaciones."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        self.agregar_ubicaciones(1)
+
+    def agregar_ubicaciones(self, cantidad, activos_por_ubicacion=2):
+        for _ in range(cantidad):
+            ubicacion = crear_ubicacion(f'Sala {Ubicacion.objects.count() + 1}')
+            for numero in range(activos_por_ubicacion):
+                nuevo_activo(f'SN-{ubicacion.pk}-{numero}', ubicacion).save()
+
+    def assertConsultasConstantes(self, url):
+        self.cliente.get(url)  # Catálogos y marcas de cambio ya cargados
+        consultas = contar_consultas(self.cliente, url)[1]
+
+        self.agregar_ubicaciones(10)
+        self.cliente.get(url)
+        with self.assertNumQueries(consultas):
+            respuesta = self.cliente.get(url)
+        return respuesta
+
+    def test_listado_de_ubicaciones(self):
+        respuesta = self.assertConsultasConstantes('/api/ubicaciones/')
+
+        self.assertEqual(len(respuesta.data['results']), 11)
+        self.assertEqual({fila['total_activos'] for fila in respuesta.data['results']}, {2})
+
+    def test_listado_de_activos(self):
+        respuesta = self.assertConsultasConstantes('/api/activos/')
+
+        self.assertEqual(len(respuesta.data['results']), 20)
+        self.assertEqual({fila['ubicacion_actual']['total_activos'] for fila in respuesta.data['results']}, {2})
+
+
+# ==============================================================================
+# RUTAS DE LECTURA RÁPIDA (misma salida que los serializers)
+# ==============================================================================
+
+class LecturaRapidaActivosTests(TestCase):
+    """?modo=rapido responde exactamente los mismos bytes que ActivoSerializer."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        sala = crear_ubicacion('Sala 101')
+        taller = crear_ubicacion('Taller')
+        nuevo_activo('SN-001', sala).save()
+        activo = nuevo_activo('SN-002', taller)
+        activo.notas = 'Pantalla con "rayas" y acentos: ñandú'
+        activo.save()
+        activo = nuevo_activo('SN-003', taller)
+        activo.notas = None
+        activo.marca = ''
+        activo.save()
+
+    def assertMismosBytes(self, url):
+        completa = self.cliente.get(url)
+        rapida = self.cliente.get(url + ('&' if '?' in url else '?') + 'modo=rapido')
+        self.assertEqual(completa.status_code, 200)
+        self.assertEqual(rapida.content, completa.content)
+
+    def test_listado(self):
+        self.assertMismosBytes('/api/activos/')
+
+    def test_filtros_busqueda_y_orden(self):
+        self.assertMismosBytes(f'/api/activos/?ubicacion_actual={Ubicacion.objects.get(nombre_ubicacion="Taller").pk}')
+        self.assertMismosBytes('/api/activos/?search=SN-00&ordering=marca')
+
+    def test_detalle(self):
+        self.assertMismosBytes(f'/api/activos/{Activo.objects.get(numero_serie="SN-002").pk}/')
+
+
+class LecturaRapidaHistorialTests(TestCase):
+    """El listado de historial (una sola pasada) coincide con HistorialMovimientoSerializer."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        usuario = Usuario.objects.get(username='admin')
+        sala = crear_ubicacion('Sala 101')
+        taller = crear_ubicacion('Taller')
+        activo = nuevo_activo('SN-001', taller)
+        activo.save()
+        for tipo, comentarios in (('TRASLADO', 'Remodelación "Ala Norte"'), ('MANTENIMIENTO', None), ('RETORNO', '')):
+            HistorialMovimiento.objects.create(
+                activo=activo, usuario_registra=usuario, ubicacion_origen=sala,
+                ubicacion_destino=taller, tipo_movimiento=tipo, comentarios=comentarios
+            )
+
+    def test_cada_fila_coincide_con_el_serializer(self):
+        for parametros in ('', '?page=1', '?ordering=tipo_movimiento'):
+            respuesta = self.cliente.get('/api/historial-movimientos/' + parametros)
+            filas = respuesta.data['results']
+            self.assertEqual(len(filas), 3)
+            for fila in filas:
+                esperado = HistorialMovimientoSerializer(HistorialMovimiento.objects.get(pk=fila['id'])).data
+                self.assertEqual(JSONRenderer().render(fila), JSONRenderer().render(esperado))
+
+
+# ==============================================================================
+# CAMPOS DISPERSOS (?fields= / ?expand=)
+# ==============================================================================
+
+class CamposDinamicosTests(TestCase):
+    """?fields= reduce columnas y JOINs; ?expand= elige qué relaciones se anidan."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        self.sala = crear_ubicacion('Sala 101')
+        self.activo = nuevo_activo('SN-001', self.sala)
+        self.activo.save()
+
+    def get(self, url):
+        """GET que retorna (respuesta, SQL ejecutado sin contar las marcas de cambio)."""
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.cliente.get(url)
+        return respuesta, [consulta['sql'] for consulta in consultas.captured_queries if 'Versiones' not in consulta['sql']]
+
+    def test_fields_solo_lee_las_columnas_pedidas(self):
+        respuesta, sql = self.get('/api/activos/?fields=marca,id,codigo_inventario')
+
+        self.assertEqual(respuesta.status_code, 200)
+        # Las claves salen en el orden de la respuesta completa, no en el de ?fields=
+        self.assertEqual(list(respuesta.data['results'][0]), ['id', 'codigo_inventario', 'marca'])
+        lectura = [consulta for consulta in sql if 'Tbl_Activos' in consulta and 'COUNT' not in consulta]
+        self.assertEqual(len(lectura), 1)
+        self.assertNotIn('JOIN', lectura[0])
+        self.assertNotIn('numero_serie', lectura[0])
+
+    def test_expand_anida_solo_las_relaciones_pedidas(self):
+        fila = self.cliente.get('/api/activos/?expand=estado').data['results'][0]
+
+        self.assertEqual(fila['tipo'], self.activo.tipo_id)
+        self.assertEqual(fila['ubicacion_actual'], self.sala.pk)
+        self.assertEqual(fila['estado'], {'id': self.activo.estado_id, 'nombre_estado': 'Operativo'})
+
+    def test_total_activos_solo_si_se_pide(self):
+        respuesta, sql = self.get('/api/ubicaciones/?fields=id,nombre_ubicacion')
+        self.assertEqual(respuesta.data['results'], [{'id': self.sala.pk, 'nombre_ubicacion': 'Sala 101'}])
+        self.assertFalse(any('Tbl_Activos' in consulta for consulta in sql))
+
+        fila = self.cliente.get('/api/ubicaciones/?fields=id,total_activos').data['results'][0]
+        self.assertEqual(fila, {'id': self.sala.pk, 'total_activos': 1})
+
+    def test_detalle_y_cursor(self):
+        self.assertEqual(
+            self.cliente.get(f'/api/activos/{self.activo.pk}/?fields=id,marca').data,
+            {'id': self.activo.pk, 'marca': 'GE'}
+        )
+
+        usuario = Usuario.objects.get(username='admin')
+        taller = crear_ubicacion('Taller')
+        for _ in range(3):
+            HistorialMovimiento.objects.create(
+                activo=self.activo, usuario_registra=usuario, ubicacion_origen=self.sala, ubicacion_destino=taller
+            )
+        ids = recorrer_paginas(
+            self.cliente, '/api/historial-movimientos/', {'fields': 'id,tipo_movimiento', 'page_size': 2}
+        )
+        self.assertEqual(sorted(ids), sorted(HistorialMovimiento.objects.values_list('pk', flat=True)))
+
+    def test_campo_desconocido(self):
+        respuesta = self.cliente.get('/api/activos/?fields=id,precio&expand=proveedor')
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('fields', respuesta.data)
+        self.assertIn('expand', respuesta.data)
+
+
+# ==============================================================================
+# EXPORTACIÓN EN STREAMING (CSV / NDJSON / XLSX)
+# ==============================================================================
+
+XLSX_NS = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+class ExportacionTests(TestCase):
+    """GET /api/activos/exportar/ respeta los filtros y arma cada formato por bloques."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        self.sala = crear_ubicacion('Sala 101')
+        taller = crear_ubicacion('Taller')
+        for numero in range(5):
+            activo = nuevo_activo(f'SN-{numero:03d}', self.sala)
+            activo.notas = f'Línea {numero}, con "comillas"'
+            activo.save()
+        nuevo_activo('SN-TALLER', taller).save()
+        self.ids = sorted(Activo.objects.filter(ubicacion_actual=self.sala).values_list('pk', flat=True))
+
+    def exportar(self, formato, **parametros):
+        respuesta = self.cliente.get('/api/activos/exportar/', {
+            'formato': formato, 'ubicacion_actual': self.sala.pk, 'ordering': 'codigo_inventario', **parametros
+        })
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertTrue(respuesta.streaming)
+        self.assertIn(f'.{formato}"', respuesta['Content-Disposition'])
+        return b''.join(respuesta.streaming_content)
+
+    def test_csv(self):
+        # Bloques de 2 filas: también se prueban los cortes entre bloques
+        with mock.patch('core.exportacion.TAMANO_BLOQUE_EXPORTACION', 2):
+            contenido = self.exportar('csv').decode('utf-8')
+
+        self.assertTrue(contenido.startswith('\ufeff'))
+        filas = list(csv.DictReader(io.StringIO(contenido.lstrip('\ufeff'))))
+        self.assertEqual(sorted(int(fila['id']) for fila in filas), self.ids)
+        self.assertEqual({fila['notas'] for fila in filas}, {f'Línea {n}, con "comillas"' for n in range(5)})
+        self.assertEqual({fila['ubicacion_actual.nombre_ubicacion'] for fila in filas}, {'Sala 101'})
+
+    def test_ndjson_con_la_forma_del_listado(self):
+        with mock.patch('core.exportacion.TAMANO_BLOQUE_EXPORTACION', 2):
+            lineas = self.exportar('ndjson', fields='id,codigo_inventario,estado').decode('utf-8').splitlines()
+
+        listado = self.cliente.get('/api/activos/', {
+            'ubicacion_actual': self.sala.pk, 'ordering': 'codigo_inventario', 'fields': 'id,codigo_inventario,estado'
+        }).json()['results']
+        self.assertEqual([json.loads(linea) for linea in lineas], listado)
+
+    def test_xlsx_divide_en_hojas(self):
+        # 3 filas por hoja (encabezado + 2 activos): 5 activos ocupan 3 hojas
+        with mock.patch('core.exportacion.MAX_FILAS_HOJA_XLSX', 3), \
+                mock.patch('core.exportacion.TAMANO_BLOQUE_EXPORTACION', 2):
+            libro = zipfile.ZipFile(io.BytesIO(self.exportar('xlsx', fields='id,numero_serie')))
+
+        hojas = ElementTree.fromstring(libro.read('xl/workbook.xml')).findall('.//x:sheet', XLSX_NS)
+        self.assertEqual([hoja.get('name') for hoja in hojas], ['Datos', 'Datos 2', 'Datos 3'])
+
+        ids = []
+        for numero in range(1, 4):
+            filas = ElementTree.fromstring(libro.read(f'xl/worksheets/sheet{numero}.xml')).findall('.//x:row', XLSX_NS)
+            self.assertEqual(filas[0].find('.//x:t', XLSX_NS).text, 'id')
+            self.assertLessEqual(len(filas), 3)
+            ids.extend(int(fila.find('x:c/x:v', XLSX_NS).text) for fila in filas[1:])
+        self.assertEqual(sorted(ids), self.ids)
+
+    def test_formato_desconocido(self):
+        respuesta = self.cliente.get('/api/activos/exportar/', {'formato': 'pdf'})
+
+        self.assertEqual(respuesta.status_code, 400)
+
+
+# ==============================================================================
+# ESCANEO DE CÓDIGOS QR
+# ==============================================================================
+
+class EscaneoTests(TestCase):
+    """GET /api/scan/{codigo}/ resuelve etiquetas LOC- e INV- por igualdad exacta."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('jefe', JEFE)
+        self.sala = crear_ubicacion('Sala 101')
+        self.activos = [nuevo_activo(f'SN-{numero}', self.sala) for numero in range(2)]
+        for activo in self.activos:
+            activo.save()
+        crear_ubicacion('Taller')
+
+    def test_ubicacion_con_sus_activos(self):
+        respuesta = self.cliente.get(f'/api/scan/{self.sala.codigo_qr.lower()}/')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual((respuesta.data['tipo'], respuesta.data['codigo']), ('ubicacion', self.sala.codigo_qr))
+        self.assertEqual(respuesta.data['ubicacion'], self.cliente.get(f'/api/ubicaciones/{self.sala.pk}/').data)
+        listado = self.cliente.get('/api/activos/', {'ubicacion_actual': self.sala.pk}).data['results']
+        self.assertEqual(
+            sorted(respuesta.data['activos'], key=lambda activo: activo['id']),
+            sorted(listado, key=lambda activo: activo['id'])
+        )
+
+    def test_activo(self):
+        activo = self.activos[0]
+        detalle = self.cliente.get(f'/api/activos/{activo.pk}/').data
+
+        with self.assertNumQueries(2):  # Marcas de cambio y el activo
+            respuesta = self.cliente.get(f'/api/scan/{activo.codigo_inventario}/')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data, {'tipo': 'activo', 'codigo': activo.codigo_inventario, 'activo': detalle})
+
+    def test_codigo_inexistente_y_formato_invalido(self):
+        self.assertEqual(self.cliente.get('/api/scan/LOC-FFFFFF/').status_code, 404)
+        self.assertEqual(self.cliente.get('/api/scan/INV-25-FFFFFF/').status_code, 404)
+
+        respuesta = self.cliente.get('/api/scan/SN-0/')
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('codigo', respuesta.data)
+
+
+# ==============================================================================
+# CATÁLOGOS EN MEMORIA
+# ==============================================================================
+
+class CatalogosTests(TestCase):
+    """Los catálogos maestros se leen de memoria mientras su marca de cambio no cambie."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        EstadoActivo.objects.create(nombre_estado='Operativo')
+
+    def test_listado_sin_leer_las_filas(self):
+        self.cliente.get('/api/estados-activo/')
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.cliente.get('/api/estados-activo/')
+
+        self.assertEqual([fila['nombre_estado'] for fila in respuesta.data['results']], ['Operativo'])
+        self.assertTrue(all('Tbl_Versiones_Modelo' in consulta['sql'] for consulta in consultas.captured_queries))
+
+    def test_escritura_por_la_api_recarga(self):
+        self.cliente.get('/api/estados-activo/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            respuesta = self.cliente.post('/api/estados-activo/', {'nombre_estado': 'De Baja'}, format='json')
+        self.assertEqual(respuesta.status_code, 201)
+
+        nombres = [fila['nombre_estado'] for fila in self.cliente.get('/api/estados-activo/').data['results']]
+        self.assertEqual(sorted(nombres), ['De Baja', 'Operativo'])
+
+    def test_cambio_en_otro_worker_recarga(self):
+        catalogo = obtener_catalogo(EstadoActivo)
+        self.assertIs(obtener_catalogo(EstadoActivo), catalogo)
+
+        # Sin señales ni marca nueva este proceso no se entera...
+        nuevo = EstadoActivo.objects.bulk_create([EstadoActivo(nombre_estado='De Baja')])[0]
+        self.assertIs(obtener_catalogo(EstadoActivo), catalogo)
+
+        # ...hasta que otro worker deja la marca nueva en la base
+        marcar_cambio_en_otro_worker(EstadoActivo)
+        self.assertIn(nuevo.pk, obtener_catalogo(EstadoActivo).por_pk)
+
+    def test_validacion_de_ids_contra_el_catalogo(self):
+        respuesta = self.cliente.post('/api/activos/', {
+            'numero_serie': 'SN-001', 'marca': 'GE', 'modelo': 'Logiq',
+            'tipo_id': TipoEquipo.objects.create(nombre_tipo='Ecógrafo').pk, 'estado_id': 999999,
+            'ubicacion_actual_id': crear_ubicacion('Sala 101').pk
+        }, format='json')
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('estado_id', respuesta.data)
+
+
+# ==============================================================================
+# AUTENTICACIÓN JWT (usuario y rol)
+# ==============================================================================
+
+def consultas_de_identidad(consultas):
+    """SQL de las consultas que leen usuarios o roles."""
+    return [
+        consulta['sql'] for consulta in consultas.captured_queries
+        if '"Tbl_Usuarios"' in consulta['sql'] or '"Tbl_Roles"' in consulta['sql']
+    ]
+
+
+class AutenticacionConRolTests(TestCase):
+    """JWTAuthenticationConRol carga el usuario y su rol en una sola consulta."""
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(
+            username='tecnico', password='clave-prueba', rol=Rol.objects.create(nombre_rol=TECNICO)
+        )
+        self.cliente = APIClient()
+        self.cliente.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.usuario).access_token}')
+
+    def test_una_consulta_de_identidad_por_peticion(self):
+        self.cliente.get('/api/activos/')
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.cliente.get('/api/activos/')
+
+        self.assertEqual(respuesta.status_code, 200)
+        identidad = consultas_de_identidad(consultas)
+        self.assertEqual(len(identidad), 1)
+        self.assertIn('JOIN "Tbl_Roles"', identidad[0])
+
+    def test_usuario_inactivo_o_eliminado(self):
+        Usuario.objects.filter(pk=self.usuario.pk).update(is_active=False)
+        self.assertEqual(self.cliente.get('/api/activos/').status_code, 401)
+
+        Usuario.objects.filter(pk=self.usuario.pk).delete()
+        self.assertEqual(self.cliente.get('/api/activos/').status_code, 401)
+
+
+# ==============================================================================
+# ESQUEMA OPENAPI PREGENERADO
+# ==============================================================================
+
+class EsquemaPregeneradoTests(TestCase):
+    """/api/schema/ sirve el cuerpo gzip solo si el Accept-Encoding lo acepta."""
+
+    def setUp(self):
+        contenido = b'{"openapi": "3.0.3", "info": {"title": "SCA Hospital"}}'
+        self.esquema = Esquema('json', contenido, gzip.compress(contenido))
+        parche = mock.patch('core.views.obtener_esquema', return_value=self.esquema)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.cliente = APIClient()
+
+    def get(self, accept_encoding, **encabezados):
+        return self.cliente.get('/api/schema/?format=json', HTTP_ACCEPT_ENCODING=accept_encoding, **encabezados)
+
+    def test_negociacion_con_valores_q(self):
+        for accept_encoding in ('gzip', 'GZIP, deflate', 'identity;q=0.5, gzip;q=0.8'):
+            respuesta = self.get(accept_encoding)
+            self.assertEqual(respuesta['Content-Encoding'], 'gzip', accept_encoding)
+            self.assertEqual(respuesta.content, self.esquema.contenido_gzip)
+            self.assertEqual(respuesta['ETag'], self.esquema.etag_gzip)
+
+        for accept_encoding in ('', 'identity', 'gzip;q=0', 'deflate, gzip;q=0.0'):
+            respuesta = self.get(accept_encoding)
+            self.assertFalse(respuesta.has_header('Content-Encoding'), accept_encoding)
+            self.assertEqual(respuesta.content, self.esquema.contenido)
+            self.assertEqual(respuesta['ETag'], self.esquema.etag)
+
+    def test_304_por_codificacion(self):
+        self.assertEqual(self.get('gzip', HTTP_IF_NONE_MATCH=self.esquema.etag_gzip).status_code, 304)
+        # El ETag del cuerpo sin comprimir no valida la versión gzip
+        self.assertEqual(self.get('gzip', HTTP_IF_NONE_MATCH=self.esquema.etag).status_code, 200)
+        self.assertEqual(self.get('gzip;q=0', HTTP_IF_NONE_MATCH=self.esquema.etag).status_code, 304)
+
+
+# ==============================================================================
+# INVENTARIO POR UBICACIÓN EN CACHÉ
+# ==============================================================================
+
+class InventarioUbicacionTests(TestCase):
+    """Foto de inventario por ubicación: una lectura de caché mientras siga vigente."""
+
+    def setUp(self):
+        cache.clear()
+        self.salas = [crear_ubicacion(f'Sala {numero}') for numero in range(3)]
+        self.activo = nuevo_activo('SN-001', self.salas[0])
+        self.activo.save()
+        nuevo_activo('SN-002', self.salas[2]).save()
+
+    def leer(self, ubicacion):
+        """Retorna (ids de activos en la foto, True si se leyó de la base)."""
+        with CaptureQueriesContext(connection) as consultas:
+            inventario = obtener_inventario_ubicacion(ubicacion.codigo_qr)
+        calculada = any('"Tbl_Activos"' in consulta['sql'] for consulta in consultas.captured_queries)
+        return [activo['id'] for activo in inventario['activos']], calculada
+
+    def test_segunda_lectura_desde_la_cache(self):
+        self.assertEqual(self.leer(self.salas[0]), ([self.activo.pk], True))
+        self.assertEqual(self.leer(self.salas[0]), ([self.activo.pk], False))
+        self.assertIsNone(obtener_inventario_ubicacion('LOC-FFFFFF'))
+
+    def test_cache_local_se_descarta_con_la_marca_de_activo(self):
+        self.leer(self.salas[0])
+
+        # Otro worker moviliza el activo: el borrado por ubicación no llega a esta caché
+        Activo.objects.filter(pk=self.activo.pk).update(ubicacion_actual=self.salas[1])
+        marcar_cambio_en_otro_worker(Activo)
+
+        self.assertEqual(self.leer(self.salas[0]), ([], True))
+
+    def test_cache_compartida_invalida_solo_las_ubicaciones_afectadas(self):
+        with mock.patch('core.inventario.cache_compartida', return_value=True):
+            for sala in self.salas:
+                self.leer(sala)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.activo.ubicacion_actual = self.salas[1]
+                self.activo.save()
+
+            self.assertEqual(self.leer(self.salas[0]), ([], True))
+            self.assertEqual(self.leer(self.salas[1]), ([self.activo.pk], True))
+            self.assertFalse(self.leer(self.salas[2])[1])
+
+    def test_cambio_de_catalogo_descarta_las_fotos(self):
+        self.leer(self.salas[0])
+
+        estado = self.activo.estado
+        estado.nombre_estado = 'Operativo (revisado)'
+        with self.captureOnCommitCallbacks(execute=True):
+            estado.save()
+
+        inventario = obtener_inventario_ubicacion(self.salas[0].codigo_qr)
+        self.assertEqual(inventario['activos'][0]['estado']['nombre_estado'], 'Operativo (revisado)')
+
+
+# ==============================================================================
+# CARGA INICIAL (BOOTSTRAP)
+# ==============================================================================
+
+class BootstrapTests(TestCase):
+    """GET /api/bootstrap/: los catálogos que el rol puede listar, con la forma de cada listado."""
+
+    secciones = {
+        'estados_activo': '/api/estados-activo/',
+        'tipos_equipo': '/api/tipos-equipo/',
+        'departamentos': '/api/departamentos/',
+        'ubicaciones': '/api/ubicaciones/',
+        'roles': '/api/roles/',
+        'usuarios': '/api/usuarios/',
+    }
+
+    def setUp(self):
+        self.clientes = {
+            nombre_rol: crear_usuario(f'usuario-{numero}', nombre_rol)
+            for numero, nombre_rol in enumerate((ADMINISTRADOR, TECNICO, JEFE))
+        }
+        nuevo_activo('SN-001', crear_ubicacion('Sala 101')).save()
+        crear_ubicacion('Taller')
+
+    def test_secciones_iguales_a_cada_listado_permitido(self):
+        for nombre_rol, cliente in self.clientes.items():
+            datos = cliente.get('/api/bootstrap/').json()
+            for clave, url in self.secciones.items():
+                listado = cliente.get(url, {'page_size': 1000})
+                if listado.status_code == 200:
+                    self.assertEqual(datos[clave], listado.json()['results'], f'{nombre_rol}: {clave}')
+                else:
+                    self.assertNotIn(clave, datos, f'{nombre_rol}: {clave}')
+        self.assertIn('usuarios', self.clientes[ADMINISTRADOR].get('/api/bootstrap/').data)
+
+    def test_304_sin_leer_los_catalogos(self):
+        cliente = self.clientes[TECNICO]
+        etag = cliente.get('/api/bootstrap/')['ETag']
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = cliente.get('/api/bootstrap/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(respuesta.status_code, 304)
+        self.assertTrue(all('Tbl_Versiones_Modelo' in consulta['sql'] for consulta in consultas.captured_queries))
+
+    def test_cambio_en_una_seccion_cambia_el_etag(self):
+        cliente = self.clientes[TECNICO]
+        etag = cliente.get('/api/bootstrap/')['ETag']
+        self.assertNotEqual(self.clientes[ADMINISTRADOR].get('/api/bootstrap/')['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            crear_ubicacion('Bodega')
+
+        respuesta = cliente.get('/api/bootstrap/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn('Bodega', [fila['nombre_ubicacion'] for fila in respuesta.data['ubicaciones']])
+
+
+# ==============================================================================
+# COMPRESIÓN NEGOCIADA
+# ==============================================================================
+
+class ElegirCodificacionTests(TestCase):
+    """Accept-Encoding con valores q: q=0 rechaza, a igual q se prefiere brotli."""
+
+    casos = {
+        '': (None, None),
+        'identity': (None, None),
+        'gzip': ('gzip', 'gzip'),
+        'GZip, deflate': ('gzip', 'gzip'),
+        'gzip, deflate, br': ('br', 'gzip'),
+        'br;q=0.5, gzip': ('gzip', 'gzip'),
+        'gzip;q=0': (None, None),
+        'gzip;q=0.0, br;q=0': (None, None),
+        'gzip ; q=0.001': ('gzip', 'gzip'),
+        '*': ('br', 'gzip'),
+        '*;q=0, gzip;q=0.2': ('gzip', 'gzip'),
+        'br, *;q=0': ('br', None),
+    }
+
+    def test_con_y_sin_brotli(self):
+        for accept_encoding, (con_brotli, sin_brotli) in self.casos.items():
+            with mock.patch('core.middleware.codificaciones_disponibles', return_value=('br', 'gzip')):
+                self.assertEqual(elegir_codificacion(accept_encoding), con_brotli, accept_encoding)
+            with mock.patch('core.middleware.codificaciones_disponibles', return_value=('gzip',)):
+                self.assertEqual(elegir_codificacion(accept_encoding), sin_brotli, accept_encoding)
+
+
+class CompresionMiddlewareTests(TestCase):
+    """CompresionMiddleware comprime respuestas JSON y exportaciones según Accept-Encoding."""
+
+    def setUp(self):
+        self.cliente = crear_usuario('admin', ADMINISTRADOR)
+        sala = crear_ubicacion('Sala 101')
+        for numero in range(20):
+            nuevo_activo(f'SN-{numero:03d}', sala).save()
+
+    def test_listado_json(self):
+        sin_comprimir = self.cliente.get('/api/activos/', HTTP_ACCEPT_ENCODING='identity')
+        self.assertFalse(sin_comprimir.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', sin_comprimir['Vary'])
+
+        comprimida = self.cliente.get('/api/activos/', HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0.5')
+        self.assertEqual(comprimida['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(comprimida.content), sin_comprimir.content)
+        self.assertEqual(int(comprimida['Content-Length']), len(comprimida.content))
+
+        rechazada = self.cliente.get('/api/activos/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(rechazada.has_header('Content-Encoding'))
+
+    def test_respuesta_pequena_sin_comprimir(self):
+        respuesta = self.cliente.get('/api/estados-activo/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(respuesta.has_header('Content-Encoding'))
+
+    def test_exportacion_en_streaming(self):
+        url = '/api/activos/exportar/?formato=ndjson'
+        sin_comprimir = b''.join(self.cliente.get(url).streaming_content)
+
+        respuesta = self.cliente.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(respuesta['Content-Encoding'], 'gzip')
+        self.assertFalse(respuesta.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(respuesta.streaming_content)), sin_comprimir)
+
+
+# ==============================================================================
+# PERFIL DEL USUARIO EN CACHÉ (/api/usuarios/me/)
+# ==============================================================================
+
+class PerfilCacheCompartidaTests(TestCase):
+    """Con caché compartida, un perfil vigente autentica y responde /me/ sin consultas."""
+
+    def setUp(self):
+        # FileBasedCache: la ven todos los procesos, como Redis
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        configuracion = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directorio.name
+        }})
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+
+        self.rol = Rol.objects.create(nombre_rol=TECNICO)
+        self.usuario = Usuario.objects.create_user(username='tecnico', password='clave-prueba', rol=self.rol)
+        self.cliente = APIClient()
+        self.cliente.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.usuario).access_token}')
+
+    def test_me_sin_consultas(self):
+        primera = self.cliente.get('/api/usuarios/me/')
+
+        with self.assertNumQueries(0):
+            respuesta = self.cliente.get('/api/usuarios/me/')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json(), primera.json())
+        self.assertEqual(respuesta.data['rol']['nombre_rol'], TECNICO)
+
+    def test_permisos_sin_consultas_de_identidad(self):
+        self.cliente.get('/api/activos/')
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(self.cliente.get('/api/activos/').status_code, 200)
+            self.assertEqual(self.cliente.get('/api/roles/').status_code, 403)
+
+        self.assertEqual(consultas_de_identidad(consultas), [])
+
+    def test_editar_un_rol_descarta_los_perfiles(self):
+        self.cliente.get('/api/usuarios/me/')
+
+        self.rol.nombre_rol = 'Técnico de Terreno'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rol.save()
+
+        self.assertEqual(self.cliente.get('/api/usuarios/me/').data['rol']['nombre_rol'], 'Técnico de Terreno')
+        # La tabla de permisos también se recompila: el rol ya no se llama Técnico
+        self.assertEqual(self.cliente.get('/api/activos/').status_code, 403)
+
+    def test_cambios_del_usuario(self):
+        self.cliente.get('/api/usuarios/me/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.rol = Rol.objects.create(nombre_rol=JEFE)
+            self.usuario.save()
+        self.assertEqual(self.cliente.get('/api/usuarios/me/').data['rol']['nombre_rol'], JEFE)
+        self.assertEqual(self.cliente.post('/api/activos/movilizar-lote/', {}, format='json').status_code, 403)
+
+        self.usuario.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.usuario.save()
+        self.assertEqual(self.cliente.get('/api/usuarios/me/').status_code, 401)
@@ -17,8 +17,12 @@ Rutas generadas automáticamente:
 - /api/ubicaciones/              (Core)
 - /api/usuarios/                 (Core)
 - /api/activos/                  (Core - CRÍTICO)
+- /api/scan/{codigo}/            (Core - escaneo QR)
 - /api/historial-movimientos/    (Trazabilidad)
 - /api/auditoria-logs/           (Auditoría - SOLO LECTURA)
+- /api/reportes/                 (Reportes - SOLO LECTURA)
+- /api/dashboard/                (Reportes - SOLO LECTURA)
+- /api/bootstrap/                (Core - catálogos de inicio, SOLO LECTURA)
 """
 
 from django.urls import path, include
@@ -33,7 +37,11 @@ from .views import (
     EstadoActivoViewSet,
     ActivoViewSet,
     HistorialMovimientoViewSet,
-    AuditoriaLogViewSet
+    AuditoriaLogViewSet,
+    ReporteViewSet,
+    DashboardViewSet,
+    EscaneoViewSet,
+    BootstrapViewSet
 )
 
 # ==============================================================================
@@ -67,10 +75,20 @@ router.register(r'usuarios', UsuarioViewSet, basename='usuario')
 # Activos (entidad central)
 router.register(r'activos', ActivoViewSet, basename='activo')
 
+# Escaneo de etiquetas QR (búsqueda exacta por código)
+router.register(r'scan', EscaneoViewSet, basename='scan')
+
 # Trazabilidad y auditoría
 router.register(r'historial-movimientos', HistorialMovimientoViewSet, basename='historialmovimiento')
 router.register(r'auditoria-logs', AuditoriaLogViewSet, basename='auditorialog')
 
+# Reportes agregados (sin modelo propio)
+router.register(r'reportes', ReporteViewSet, basename='reporte')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+
+# Catálogos de referencia en una sola respuesta (carga inicial del frontend)
+router.register(r'bootstrap', BootstrapViewSet, basename='bootstrap')
+
 # ==============================================================================
 # URLS
 # ==============================================================================
@@ -140,6 +158,13 @@ ACTIVOS (CRÍTICO):
 - PUT    /api/activos/{id}/      - Actualizar un activo completo
 - PATCH  /api/activos/{id}/      - Actualizar parcialmente un activo
 - DELETE /api/activos/{id}/      - Eliminar un activo
+- POST   /api/activos/{id}/movilizar/  - Movilizar un activo a otra ubicación
+- POST   /api/activos/movilizar-lote/  - Movilizar varios activos en una transacción
+- POST   /api/activos/lote/            - Registrar varios activos en una transacción
+- PATCH  /api/activos/lote/            - Cambiar estado, tipo o notas de varios activos (un UPDATE)
+
+ESCANEO QR:
+- GET    /api/scan/{codigo}/     - Resolver LOC-XXXXXX (ubicación + activos) o INV-YY-XXXXXX (activo)
 
 HISTORIAL DE MOVIMIENTOS:
 - GET    /api/historial-movimientos/           - Listar todos los movimientos
@@ -152,5 +177,12 @@ HISTORIAL DE MOVIMIENTOS:
 AUDITORÍA (SOLO LECTURA):
 - GET    /api/auditoria-logs/           - Listar todos los logs de auditoría
 - GET    /api/auditoria-logs/{id}/      - Obtener un log específico
+
+REPORTES (SOLO LECTURA):
+- GET    /api/reportes/?reporte=<tipo>  - Generar un reporte agregado (JSON, CSV o XLSX)
+- GET    /api/dashboard/                - Resumen de los dashboards de inicio (en caché)
+
+CARGA INICIAL (SOLO LECTURA):
+- GET    /api/bootstrap/                - Catálogos visibles para el rol (un solo ETag)
 """
 
@@ -0,0 +1,232 @@
+"""
+Marcas de cambio por modelo para el SCA Hospital.
+
+Cada modelo registrado tiene una marca con el instante (en nanosegundos) de
+su último cambio, que sirve para saber si algo cambió desde la última lectura:
+- Catálogos en memoria (core.catalogos): recargar si la marca es otra
+- GET condicional (ETag / Last-Modified): responder 304 si ninguna marca cambió
+- Datos derivados en la caché (obtener_derivado): recalcular si la marca es otra
+
+Las marcas viven en la base de datos (Tbl_Versiones_Modelo), no en la caché:
+sin REDIS_URL la caché es local a cada worker de gunicorn y una marca guardada
+ahí solo la vería el worker que atendió la escritura. Así todos los workers ven
+el cambio en su siguiente petición.
+
+Leerlas cuesta una consulta por petición: las marcas leídas se recuerdan
+hasta el final de la petición (señales request_started / request_finished).
+Fuera de una petición (comandos, shell) cada lectura consulta la base.
+
+Con caché compartida (REDIS_URL) registrar_cambio() deja también una marca
+en la caché (marcas_en_cache): los datos que se leen en cada petición (perfil
+del usuario, tabla de permisos) se validan con ella sin consultar la base.
+
+Las marcas se actualizan con las señales post_save / post_delete (core.signals).
+QuerySet.update() y bulk_create() no disparan señales: el código que los use
+debe llamar a registrar_cambio() explícitamente.
+
+Uso:
+    version = version_modelo(Activo)
+    versiones = versiones_modelos([Activo, TipoEquipo])
+    valor, versiones = leer_con_versiones('mi:clave', [Ubicacion, Departamento])
+    datos = obtener_derivado('mi:clave', [Ubicacion, Departamento], calcular)
+    valores, versiones = marcas_en_cache([Rol], claves=['mi:clave'])   # solo caché compartida
+    registrar_cambio(Activo)
+"""
+
+import time
+
+from asgiref.local import Local
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.signals import request_started, request_finished
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from .models import VersionModelo
+
+
+# Marcas ya leídas en la petición en curso (None fuera de una petición)
+_peticion = Local()
+
+
+def _iniciar_peticion(**kwargs):
+    _peticion.marcas = {}
+    _peticion.marcas_cache = {}
+
+
+def _terminar_peticion(**kwargs):
+    _peticion.marcas = None
+    _peticion.marcas_cache = None
+
+
+request_started.connect(_iniciar_peticion, dispatch_uid='versiones_iniciar_peticion')
+request_finished.connect(_terminar_peticion, dispatch_uid='versiones_terminar_peticion')
+
+
+def _marcas_leidas(atributo='marcas'):
+    """Marcas recordadas en esta petición (un dict vacío y descartable fuera de una)."""
+    marcas = getattr(_peticion, atributo, None)
+    return marcas if marcas is not None else {}
+
+
+def _clave_marca_cache(etiqueta):
+    return f'versiones:marca:{etiqueta}'
+
+
+def versiones_modelos(modelos):
+    """
+    Lee las marcas de varios modelos (una consulta, solo por las no leídas en esta petición).
+
+    Si una marca no existe (primer arranque) se crea con la hora actual: nunca
+    coincide con una marca anterior, así que los datos guardados con ella se
+    consideran desactualizados.
+
+    Returns:
+        dict: modelo -> marca (int, nanosegundos)
+    """
+    etiquetas = {modelo._meta.label_lower: modelo for modelo in modelos}
+    marcas = _marcas_leidas()
+    faltantes = [etiqueta for etiqueta in etiquetas if etiqueta not in marcas]
+    if faltantes:
+        leidas = dict(
+            VersionModelo.objects.filter(modelo__in=faltantes).values_list('modelo', 'version')
+        )
+        sin_fila = [etiqueta for etiqueta in faltantes if etiqueta not in leidas]
+        if sin_fila:
+            ahora = time.time_ns()
+            # ignore_conflicts: si otro worker la creó a la vez, vale la suya
+            VersionModelo.objects.bulk_create(
+                [VersionModelo(modelo=etiqueta, version=ahora) for etiqueta in sin_fila],
+                ignore_conflicts=True
+            )
+            leidas.update(
+                VersionModelo.objects.filter(modelo__in=sin_fila).values_list('modelo', 'version')
+            )
+        marcas.update(leidas)
+    return {modelo: marcas[etiqueta] for etiqueta, modelo in etiquetas.items()}
+
+
+def leer_con_versiones(clave, modelos):
+    """
+    Lee una clave de la caché junto con las marcas de los modelos.
+
+    Sirve para datos derivados que dependen de esos modelos: se guardan junto
+    con las marcas vigentes y, al leerlos, se comparan con las actuales.
+
+    Args:
+        clave (str|None): Clave adicional a leer (None para leer solo las marcas)
+        modelos: Modelos cuyas marcas se necesitan
+
+    Returns:
+        tuple: (valor de la clave o None, {modelo: marca})
+    """
+    valor = cache.get(clave) if clave is not None else None
+    return valor, versiones_modelos(modelos)
+
+
+def obtener_derivado(clave, modelos, calcular, timeout=DEFAULT_TIMEOUT):
+    """
+    Retorna un dato derivado de los modelos desde la caché, recalculándolo si quedó viejo.
+
+    El dato se guarda junto con las marcas leídas antes de calcularlo: si un
+    cambio se confirma mientras se calcula, la marca nueva no coincide con la
+    guardada y la próxima lectura lo recalcula.
+
+    Args:
+        clave (str): Clave del dato en la caché
+        modelos: Modelos de los que depende el dato
+        calcular (callable): Función sin argumentos que arma el dato desde la base
+        timeout (int): Vida máxima en la caché, para datos que también dependen
+            de la hora (por defecto, la de CACHES)
+    """
+    guardado, versiones = leer_con_versiones(clave, modelos)
+    versiones = {modelo._meta.label_lower: marca for modelo, marca in versiones.items()}
+    if guardado is not None and guardado['versiones'] == versiones:
+        return guardado['valor']
+
+    valor = calcular()
+    cache.set(clave, {'versiones': versiones, 'valor': valor}, timeout)
+    return valor
+
+
+def version_modelo(modelo):
+    """Marca de cambio de un modelo (ver versiones_modelos)."""
+    return versiones_modelos([modelo])[modelo]
+
+
+def marcas_en_cache(modelos, claves=()):
+    """
+    Lee de la caché compartida las marcas de los modelos, sin consultar la base.
+
+    Las renueva registrar_cambio() junto con las de la base. Solo sirven con
+    caché compartida (con LocMemCache cada worker vería solo sus propios
+    cambios): usar versiones_modelos() si cache_compartida() es False.
+
+    Si una marca no está (primer arranque o la caché la descartó) se crea con
+    la hora actual, así que los datos guardados con la anterior se consideran
+    desactualizados.
+
+    Args:
+        modelos: Modelos cuyas marcas se necesitan
+        claves: Claves adicionales a leer en el mismo acceso a la caché
+
+    Returns:
+        tuple: ({clave: valor} de las claves encontradas, {modelo: marca})
+    """
+    etiquetas = {modelo._meta.label_lower: modelo for modelo in modelos}
+    marcas = _marcas_leidas('marcas_cache')
+    faltantes = [etiqueta for etiqueta in etiquetas if etiqueta not in marcas]
+    claves = list(claves)
+    leidos = cache.get_many(claves + [_clave_marca_cache(etiqueta) for etiqueta in faltantes])
+    for etiqueta in faltantes:
+        clave = _clave_marca_cache(etiqueta)
+        marca = leidos.get(clave)
+        if marca is None:
+            # add(): si otro worker la creó a la vez, vale la suya
+            ahora = time.time_ns()
+            cache.add(clave, ahora, None)
+            marca = cache.get(clave, ahora)
+        marcas[etiqueta] = marca
+    valores = {clave: leidos[clave] for clave in claves if clave in leidos}
+    return valores, {modelo: marcas[etiqueta] for etiqueta, modelo in etiquetas.items()}
+
+
+def cache_compartida():
+    """
+    True si la caché por defecto la ven todos los workers (Redis, Memcached, base de datos).
+
+    Con LocMemCache cada proceso tiene su copia: borrar una clave (invalidar)
+    solo afecta al worker que lo hace, así que los datos que se invalidan por
+    clave, sin marca de cambio, no deben guardarse ahí.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def registrar_cambio(*modelos):
+    """
+    Actualiza la marca de los modelos dados con la hora actual.
+
+    La marca nunca retrocede (GREATEST con la anterior + 1), aunque los relojes
+    de dos servidores no coincidan.
+    """
+    ahora = time.time_ns()
+    etiquetas = [modelo._meta.label_lower for modelo in modelos]
+    actualizadas = VersionModelo.objects.filter(modelo__in=etiquetas).update(
+        version=Greatest(F('version') + 1, Value(ahora))
+    )
+    if actualizadas < len(etiquetas):
+        existentes = set(VersionModelo.objects.filter(modelo__in=etiquetas).values_list('modelo', flat=True))
+        VersionModelo.objects.bulk_create(
+            [VersionModelo(modelo=etiqueta, version=ahora) for etiqueta in etiquetas if etiqueta not in existentes],
+            ignore_conflicts=True
+        )
+
+    if cache_compartida():
+        cache.set_many({_clave_marca_cache(etiqueta): ahora for etiqueta in etiquetas}, None)
+
+    # La petición en curso vuelve a leer las marcas que acaba de cambiar
+    for marcas in (_marcas_leidas(), _marcas_leidas('marcas_cache')):
+        for etiqueta in etiquetas:
+            marcas.pop(etiqueta, None)
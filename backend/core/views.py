@@ -5,8 +5,8 @@ Este módulo define los ViewSets de Django REST Framework que exponen
 los endpoints de la API.
 
 Características:
-- Autenticación JWT requerida en todos los endpoints (IsAuthenticated)
-- Control de acceso basado en roles (RBAC) con permisos personalizados
+- Autenticación JWT requerida en todos los endpoints (PoliticaAcceso)
+- Control de acceso basado en roles (RBAC): tabla compilada de core.permissions.POLITICA_ACCESO
 - Documentación automática con drf-spectacular (@extend_schema_view)
 - Optimización SQL con select_related() para evitar N+1 queries
 - CRUD completo para todos los modelos (excepto AuditoriaLog que es read-only)
@@ -18,23 +18,32 @@ Sistema de Permisos por Rol:
 - Jefe de Departamento: Solo lectura en activos, historial y auditoría
 """
 
+import hashlib
+import re
+from operator import itemgetter
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
-from django.db import transaction
+from rest_framework.exceptions import ValidationError as DRFValidationError, NotFound
+from rest_framework.generics import get_object_or_404
+from rest_framework.settings import api_settings
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 
-# Importar permisos personalizados RBAC
-from .permissions import (
-    IsAdminUser,
-    IsJefeOrAdminReadOnly,
-    IsTecnicoOperativo,
-    CanDeleteActivo,
-    IsAdminOrReadOnly
-)
+# Permiso RBAC único: tabla compilada de la matriz de permisos
+from .permissions import PoliticaAcceso, permite, tabla_politica
 
 from .models import (
     Rol,
@@ -58,9 +67,375 @@ from .serializers import (
     ActivoSerializer,
     HistorialMovimientoSerializer,
     AuditoriaLogSerializer,
-    MovilizacionInputSerializer
+    MovilizacionInputSerializer,
+    MovilizacionLoteInputSerializer,
+    ActivoLoteInputSerializer,
+    ActivoActualizacionLoteInputSerializer,
+    MAX_ACTIVOS_LOTE,
+    ReporteParametrosSerializer,
+    ACTIVO_CAMPOS_LECTURA_RAPIDA,
+    serializar_activos_rapido,
+    serializar_historial_rapido
+)
+
+from .pagination import HistorialCursorPagination, AuditoriaCursorPagination
+
+from .proyecciones import (
+    PROYECCION_ACTIVO,
+    PROYECCION_UBICACION,
+    PROYECCION_HISTORIAL,
+    PROYECCION_AUDITORIA,
+    formatear_fecha
 )
 
+from .exportacion import FORMATOS_EXPORTACION, respuesta_exportacion, respuesta_archivo
+
+from .reportes import REPORTES, resolver_filtros, generar_reporte
+
+from .dashboard import obtener_resumen_dashboard
+
+from .catalogos import obtener_catalogo
+
+from .versiones import cache_compartida, versiones_modelos, obtener_derivado
+
+from .esquema import obtener_esquema
+
+from .middleware import elegir_codificacion
+
+from .inventario import obtener_inventario_ubicacion
+
+from .perfil import obtener_usuario_con_perfil
+
+from .altas import registrar_activos
+
+from .movimientos import MOVIDO, OMITIDO, NO_ENCONTRADO, movilizar_activos, resumen_ubicacion
+
+from .ediciones import ACTUALIZADO, SIN_CAMBIOS, CAMPOS_EDITABLES_LOTE, actualizar_activos
+
+
+# ==============================================================================
+# UTILIDADES COMUNES
+# ==============================================================================
+
+def subconsulta_total_activos(ref_ubicacion):
+    """
+    Subconsulta SQL con el total de activos de una ubicación.
+
+    Se usa como anotación (una sola query para toda la página). Al ser una
+    subconsulta y no un JOIN + GROUP BY, desaparece del SQL cuando la respuesta
+    no incluye el total (ej: ?fields=id,nombre_ubicacion).
+
+    Args:
+        ref_ubicacion (str): Ruta a la ubicación desde el modelo anotado
+            (ej: 'pk' en Ubicacion, 'ubicacion_actual' en Activo)
+    """
+    return Coalesce(
+        Subquery(
+            Activo.objects.filter(ubicacion_actual=OuterRef(ref_ubicacion))
+            .order_by()
+            .values('ubicacion_actual')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        0
+    )
+
+
+# Parámetros de documentación OpenAPI para campos dispersos y expansión selectiva
+PARAMETROS_CAMPOS_DINAMICOS = [
+    OpenApiParameter(
+        name='fields',
+        description="Campos a incluir, separados por coma (ej: id,codigo_inventario,marca,modelo)",
+        required=False,
+        type=str
+    ),
+    OpenApiParameter(
+        name='expand',
+        description=(
+            "Relaciones a devolver como objeto anidado, separadas por coma. "
+            "Las relaciones no incluidas se devuelven como ID. Sin este parámetro se expanden todas."
+        ),
+        required=False,
+        type=str
+    ),
+]
+
+
+class CamposDinamicosMixin:
+    """
+    Mixin para ViewSets: campos dispersos (?fields=) y expansión selectiva (?expand=).
+
+    Cuando el cliente envía alguno de los dos parámetros, list y retrieve se
+    resuelven con la Proyeccion del recurso: solo se consultan las columnas
+    (y JOINs) necesarias y no se instancian modelos ni serializers.
+
+    Sin parámetros, el comportamiento es el mismo de siempre.
+
+    Atributos:
+    - proyeccion: Proyeccion del recurso (core.proyecciones)
+    - serializar_completo: Función opcional optimizada para la forma completa
+    """
+
+    proyeccion = None
+    serializar_completo = None
+
+    def _leer_lista_parametro(self, nombre):
+        """Convierte '?nombre=a,b' en {'a', 'b'} (None si el parámetro no viene)."""
+        valor = self.request.query_params.get(nombre)
+        if valor is None:
+            return None
+        return {parte.strip() for parte in valor.split(',') if parte.strip()}
+
+    def obtener_seleccion_campos(self):
+        """
+        Retorna (campos, expandir) solicitados por el cliente.
+
+        - '?fields=' vacío equivale a todos los campos
+        - '?expand=' vacío equivale a no expandir ninguna relación (solo IDs)
+
+        Raises:
+            ValidationError (DRF): Si se piden campos o relaciones inexistentes (400)
+        """
+        campos = self._leer_lista_parametro('fields') or None
+        expandir = self._leer_lista_parametro('expand')
+        errores = self.proyeccion.validar(campos, expandir)
+        if errores:
+            raise DRFValidationError(errores)
+        return campos, expandir
+
+    def seleccion_campos_solicitada(self):
+        """True si el cliente pidió ?fields= o ?expand=."""
+        params = self.request.query_params
+        return 'fields' in params or 'expand' in params
+
+    def usar_proyeccion(self):
+        """Indica si el listado se arma con la proyección. Los ViewSets pueden extenderlo."""
+        return self.seleccion_campos_solicitada()
+
+    def columnas_proyeccion(self, queryset, campos, expandir):
+        """
+        Columnas de .values() para la selección, más las que necesite el paginador.
+
+        La paginación por cursor lee el campo de ordenamiento de cada fila, aunque
+        el cliente no lo haya pedido en ?fields=.
+        """
+        columnas = self.proyeccion.columnas(campos, expandir)
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'columnas_ordenamiento'):
+            for columna in paginator.columnas_ordenamiento(self.request, queryset, self):
+                if columna not in columnas:
+                    columnas.append(columna)
+        return columnas
+
+    def serializar_proyectado(self, filas, campos, expandir):
+        """Serializa filas .values() con la función completa o con la proyección."""
+        if campos is None and expandir is None and self.serializar_completo is not None:
+            return self.serializar_completo(filas)
+        return self.proyeccion.serializar(filas, campos, expandir)
+
+    def list(self, request, *args, **kwargs):
+        if not self.usar_proyeccion():
+            return super().list(request, *args, **kwargs)
+
+        campos, expandir = self.obtener_seleccion_campos()
+        queryset = self.filter_queryset(self.get_queryset())
+        filas = queryset.values(*self.columnas_proyeccion(queryset, campos, expandir))
+
+        page = self.paginate_queryset(filas)
+        if page is not None:
+            return self.get_paginated_response(self.serializar_proyectado(page, campos, expandir))
+
+        return Response(self.serializar_proyectado(filas, campos, expandir))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.seleccion_campos_solicitada():
+            return super().retrieve(request, *args, **kwargs)
+
+        campos, expandir = self.obtener_seleccion_campos()
+        filas = self.filter_queryset(self.get_queryset()).values(
+            *self.proyeccion.columnas(campos, expandir)
+        )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        fila = get_object_or_404(filas, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, fila)
+
+        return Response(self.proyeccion.serializar([fila], campos, expandir)[0])
+
+
+# Parámetros de documentación OpenAPI de la acción 'exportar'
+PARAMETROS_EXPORTACION = [
+    OpenApiParameter(
+        name='formato',
+        description="Formato del archivo: csv (por defecto), ndjson o xlsx",
+        required=False,
+        type=str,
+        enum=list(FORMATOS_EXPORTACION)
+    ),
+    *PARAMETROS_CAMPOS_DINAMICOS
+]
+
+
+class ExportacionMixin:
+    """
+    Mixin para ViewSets con CamposDinamicosMixin: acción GET .../exportar/.
+
+    Descarga TODAS las filas del listado (sin paginar) en CSV, NDJSON o XLSX,
+    respetando los mismos filtros, búsqueda, ordenamiento y ?fields= / ?expand=.
+
+    La respuesta es un StreamingHttpResponse: las filas se leen por bloques con
+    QuerySet.iterator() y se escriben a medida que llegan, por lo que la memoria
+    no depende del tamaño de la exportación (core.exportacion).
+
+    Atributos:
+    - nombre_exportacion: Prefijo del archivo descargado (ej: 'activos')
+    """
+
+    nombre_exportacion = 'exportacion'
+
+    @action(detail=False, methods=['get'], url_path='exportar')
+    def exportar(self, request):
+        formato = request.query_params.get('formato', 'csv').lower()
+        if formato not in FORMATOS_EXPORTACION:
+            raise DRFValidationError({
+                'formato': [f"Formato no soportado. Opciones: {', '.join(FORMATOS_EXPORTACION)}"]
+            })
+
+        campos, expandir = self.obtener_seleccion_campos()
+        queryset = self.filter_queryset(self.get_queryset())
+        filas = queryset.values(*self.proyeccion.columnas(campos, expandir))
+
+        # Registrar en auditoría (los filtros aplicados quedan en el detalle)
+        AuditoriaLog.registrar_accion(
+            usuario=request.user,
+            accion='EXPORT',
+            detalle={
+                'recurso': self.nombre_exportacion,
+                'formato': formato,
+                'parametros': {
+                    clave: valor for clave, valor in request.query_params.items() if clave != 'formato'
+                },
+            }
+        )
+
+        return respuesta_exportacion(filas, self.proyeccion, campos, expandir, formato, self.nombre_exportacion)
+
+
+class CatalogoCacheMixin:
+    """
+    Mixin para ViewSets de catálogos maestros: list y retrieve desde memoria.
+
+    Los datos salen de core.catalogos, que recarga el catálogo solo cuando
+    cambia su versión (al guardar o eliminar un registro). Con ?search= u
+    ?ordering= el listado se resuelve en la base de datos como siempre.
+    Las escrituras no cambian.
+    """
+
+    def usar_catalogo(self):
+        """True si el listado se puede servir tal cual desde la caché."""
+        params = self.request.query_params
+        return api_settings.SEARCH_PARAM not in params and api_settings.ORDERING_PARAM not in params
+
+    def datos_catalogo(self):
+        """Retorna (lista, por_pk) serializados del catálogo vigente."""
+        catalogo = obtener_catalogo(self.queryset.model)
+        return catalogo, catalogo.representacion(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        if not self.usar_catalogo():
+            return super().list(request, *args, **kwargs)
+
+        _, (datos, _) = self.datos_catalogo()
+        page = self.paginate_queryset(datos)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(datos)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            pk = int(self.kwargs[lookup_url_kwarg])
+        except (TypeError, ValueError):
+            raise NotFound()
+
+        catalogo, (_, por_pk) = self.datos_catalogo()
+        if pk not in por_pk:
+            raise NotFound()
+        self.check_object_permissions(request, catalogo.por_pk[pk])
+        return Response(por_pk[pk])
+
+
+class ValidadoresCondicionalesMixin:
+    """
+    Mixin para ViewSets: GET condicional (ETag / Last-Modified) en las acciones
+    que envuelvan su respuesta con respuesta_condicional().
+
+    Los validadores salen de las marcas de cambio de los modelos que forman la
+    respuesta (core.versiones), no del cuerpo: si el cliente envía
+    If-None-Match o If-Modified-Since y nada cambió, se responde 304 con una
+    sola consulta (la de las marcas) y sin serializar. Las marcas viven en la
+    base de datos, así que todos los workers calculan el mismo ETag y una
+    escritura en cualquiera de ellos lo cambia para todos.
+
+    El ETag combina la URL completa (filtros, página, ?fields=), el formato de
+    salida y las marcas, por lo que cualquier escritura en esos modelos cambia
+    todos los ETags del recurso. Last-Modified tiene resolución de segundos;
+    cuando el cliente envía ambos, manda If-None-Match.
+
+    Atributos:
+    - modelos_version: Modelos cuyos cambios afectan la respuesta
+      (por defecto, solo el modelo del queryset)
+    """
+
+    modelos_version = None
+
+    def obtener_modelos_version(self):
+        """Modelos cuyas marcas forman el ETag (ver modelos_version)."""
+        return self.modelos_version or (self.queryset.model,)
+
+    def variante_respuesta(self, request):
+        """Parte del ETag para respuestas que, con la misma URL, cambian según el usuario."""
+        return ''
+
+    def validadores_condicionales(self, request):
+        """Retorna (etag, last_modified en segundos) de la petición actual."""
+        versiones = versiones_modelos(self.obtener_modelos_version())
+        firma = '|'.join([
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            self.variante_respuesta(request),
+            *(f'{modelo._meta.label_lower}:{version}' for modelo, version in versiones.items()),
+        ])
+        etag = f'W/"{hashlib.md5(firma.encode(), usedforsecurity=False).hexdigest()}"'
+        return etag, max(versiones.values()) // 1_000_000_000
+
+    def respuesta_condicional(self, request, generar_respuesta):
+        """Responde 304 si el cliente ya tiene la versión vigente; si no, llama a generar_respuesta()."""
+        etag, ultima_modificacion = self.validadores_condicionales(request)
+        respuesta = get_conditional_response(request, etag=etag, last_modified=ultima_modificacion)
+        if respuesta is None:
+            respuesta = generar_respuesta()
+            if respuesta.status_code != status.HTTP_200_OK:
+                return respuesta
+
+        respuesta['ETag'] = etag
+        respuesta['Last-Modified'] = http_date(ultima_modificacion)
+        # Datos por usuario autenticado: el navegador puede guardarlos, pero revalidando siempre
+        patch_cache_control(respuesta, private=True, no_cache=True)
+        patch_vary_headers(respuesta, ('Authorization',))
+        return respuesta
+
+
+class RespuestaCondicionalMixin(ValidadoresCondicionalesMixin):
+    """Mixin para ViewSets de modelos: GET condicional en list y retrieve (ver ValidadoresCondicionalesMixin)."""
+
+    def list(self, request, *args, **kwargs):
+        generar = super().list
+        return self.respuesta_condicional(request, lambda: generar(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        generar = super().retrieve
+        return self.respuesta_condicional(request, lambda: generar(request, *args, **kwargs))
+
 
 # ==============================================================================
 # VIEWSETS BÁSICOS (MAESTROS)
@@ -74,7 +449,7 @@ from .serializers import (
     partial_update=extend_schema(summary="Actualizar parcialmente un rol", tags=["Maestros"]),
     destroy=extend_schema(summary="Eliminar un rol", tags=["Maestros"])
 )
-class RolViewSet(viewsets.ModelViewSet):
+class RolViewSet(RespuestaCondicionalMixin, CatalogoCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Roles de usuario.
 
@@ -95,7 +470,8 @@ class RolViewSet(viewsets.ModelViewSet):
     """
     queryset = Rol.objects.all()
     serializer_class = RolSerializer
-    permission_classes = [IsAuthenticated, IsAdminUser]
+    permission_classes = [PoliticaAcceso]
+    politica = 'RolViewSet'
 
 
 @extend_schema_view(
@@ -106,7 +482,7 @@ class RolViewSet(viewsets.ModelViewSet):
     partial_update=extend_schema(summary="Actualizar parcialmente un departamento", tags=["Maestros"]),
     destroy=extend_schema(summary="Eliminar un departamento", tags=["Maestros"])
 )
-class DepartamentoViewSet(viewsets.ModelViewSet):
+class DepartamentoViewSet(RespuestaCondicionalMixin, CatalogoCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Departamentos del hospital.
 
@@ -127,16 +503,8 @@ class DepartamentoViewSet(viewsets.ModelViewSet):
     """
     queryset = Departamento.objects.all()
     serializer_class = DepartamentoSerializer
-    def get_permissions(self):
-        """
-        Permite a Técnicos ver la lista de departamentos (necesario para filtros).
-        Solo Admin puede crear/borrar departamentos.
-        """
-        if self.action in ['list', 'retrieve']:
-            permission_classes = [IsAuthenticated]
-        else:
-            permission_classes = [IsAdminUser]
-        return [permission() for permission in permission_classes]
+    permission_classes = [PoliticaAcceso]
+    politica = 'DepartamentoViewSet'
 
 @extend_schema_view(
     list=extend_schema(summary="Listar todos los tipos de equipo", tags=["Maestros"]),
@@ -146,7 +514,7 @@ class DepartamentoViewSet(viewsets.ModelViewSet):
     partial_update=extend_schema(summary="Actualizar parcialmente un tipo de equipo", tags=["Maestros"]),
     destroy=extend_schema(summary="Eliminar un tipo de equipo", tags=["Maestros"])
 )
-class TipoEquipoViewSet(viewsets.ModelViewSet):
+class TipoEquipoViewSet(RespuestaCondicionalMixin, CatalogoCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Tipos de Equipo.
 
@@ -171,7 +539,8 @@ class TipoEquipoViewSet(viewsets.ModelViewSet):
     """
     queryset = TipoEquipo.objects.all()
     serializer_class = TipoEquipoSerializer
-    permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    permission_classes = [PoliticaAcceso]
+    politica = 'TipoEquipoViewSet'
 
 
 @extend_schema_view(
@@ -182,7 +551,7 @@ class TipoEquipoViewSet(viewsets.ModelViewSet):
     partial_update=extend_schema(summary="Actualizar parcialmente un estado de activo", tags=["Maestros"]),
     destroy=extend_schema(summary="Eliminar un estado de activo", tags=["Maestros"])
 )
-class EstadoActivoViewSet(viewsets.ModelViewSet):
+class EstadoActivoViewSet(RespuestaCondicionalMixin, CatalogoCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Estados de Activo.
 
@@ -207,7 +576,8 @@ class EstadoActivoViewSet(viewsets.ModelViewSet):
     """
     queryset = EstadoActivo.objects.all()
     serializer_class = EstadoActivoSerializer
-    permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    permission_classes = [PoliticaAcceso]
+    politica = 'EstadoActivoViewSet'
 
 
 
@@ -216,14 +586,14 @@ class EstadoActivoViewSet(viewsets.ModelViewSet):
 # ==============================================================================
 
 @extend_schema_view(
-    list=extend_schema(summary="Listar todas las ubicaciones", tags=["Core"]),
-    retrieve=extend_schema(summary="Obtener una ubicación específica", tags=["Core"]),
+    list=extend_schema(summary="Listar todas las ubicaciones", tags=["Core"], parameters=PARAMETROS_CAMPOS_DINAMICOS),
+    retrieve=extend_schema(summary="Obtener una ubicación específica", tags=["Core"], parameters=PARAMETROS_CAMPOS_DINAMICOS),
     create=extend_schema(summary="Crear una nueva ubicación", tags=["Core"]),
     update=extend_schema(summary="Actualizar una ubicación completa", tags=["Core"]),
     partial_update=extend_schema(summary="Actualizar parcialmente una ubicación", tags=["Core"]),
     destroy=extend_schema(summary="Eliminar una ubicación", tags=["Core"])
 )
-class UbicacionViewSet(viewsets.ModelViewSet):
+class UbicacionViewSet(RespuestaCondicionalMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Ubicaciones.
 
@@ -238,7 +608,10 @@ class UbicacionViewSet(viewsets.ModelViewSet):
     - Los Técnicos NECESITAN ver ubicaciones para poder movilizar activos entre ellas
     - Solo Admin puede modificar maestros (integridad de datos)
 
-    OPTIMIZACIÓN: Usa select_related('departamento') para evitar N+1 queries.
+    OPTIMIZACIÓN:
+    - Usa select_related('departamento') para evitar N+1 queries.
+    - Anota 'total_activos' con una subconsulta en la misma query SQL (sin un COUNT por fila).
+    - Soporta ?fields= y ?expand= (ej: ?fields=id,nombre_ubicacion,codigo_qr&expand=).
 
     Endpoints:
     - GET /api/ubicaciones/ - Listar todas las ubicaciones (Admin, Técnico, Jefe)
@@ -248,21 +621,14 @@ class UbicacionViewSet(viewsets.ModelViewSet):
     - PATCH /api/ubicaciones/{id}/ - Actualizar parcialmente una ubicación (solo Admin)
     - DELETE /api/ubicaciones/{id}/ - Eliminar una ubicación (solo Admin)
     """
-    queryset = Ubicacion.objects.select_related('departamento').all()
+    queryset = Ubicacion.objects.select_related('departamento').annotate(
+        total_activos=subconsulta_total_activos('pk')
+    )
     serializer_class = UbicacionSerializer
-    def get_permissions(self):
-        """
-        Permite a cualquier usuario autenticado (Técnicos incluidos) ver la lista.
-        Solo Administradores pueden crear, editar o borrar.
-        """
-        if self.action in ['list', 'retrieve']:
-            # Para ver (GET), solo necesitas estar logueado
-            permission_classes = [IsAuthenticated]
-        else:
-            # Para todo lo demás (POST, PUT, DELETE), necesitas ser Admin
-            permission_classes = [IsAdminUser]
-        
-        return [permission() for permission in permission_classes]
+    proyeccion = PROYECCION_UBICACION
+    modelos_version = (Ubicacion, Departamento, Activo)
+    permission_classes = [PoliticaAcceso]
+    politica = 'UbicacionViewSet'
 
     # FILTROS Y BÚSQUEDA
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -280,7 +646,7 @@ class UbicacionViewSet(viewsets.ModelViewSet):
     partial_update=extend_schema(summary="Actualizar parcialmente un usuario", tags=["Core"]),
     destroy=extend_schema(summary="Eliminar un usuario", tags=["Core"])
 )
-class UsuarioViewSet(viewsets.ModelViewSet):
+class UsuarioViewSet(RespuestaCondicionalMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Usuarios.
 
@@ -306,7 +672,9 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     """
     queryset = Usuario.objects.select_related('rol').all()
     serializer_class = UsuarioSerializer
-    permission_classes = [IsAuthenticated, IsAdminUser]
+    modelos_version = (Usuario, Rol)
+    permission_classes = [PoliticaAcceso]
+    politica = 'UsuarioViewSet'
 
     @extend_schema(
         summary="Obtener información del usuario autenticado",
@@ -320,7 +688,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         - Mostrar información del perfil
 
         SEGURIDAD:
-        - Solo requiere autenticación (IsAuthenticated)
+        - Solo requiere autenticación (POLITICA_ACCESO: 'me' abierto a cualquier autenticado)
         - NO requiere ser Admin (cualquier usuario autenticado puede ver su propia info)
         - El password NUNCA se devuelve (write_only en serializer)
 
@@ -350,8 +718,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     @action(
         detail=False,
         methods=['get'],
-        url_path='me',
-        permission_classes=[IsAuthenticated]  # Solo requiere autenticación, NO admin
+        url_path='me'
     )
     def me(self, request):
         """
@@ -387,12 +754,15 @@ class UsuarioViewSet(viewsets.ModelViewSet):
                 "last_login": "2025-01-20T09:15:00Z"
             }
         """
-        # Obtener el usuario autenticado con su rol (optimización)
-        user = Usuario.objects.select_related('rol').get(pk=request.user.pk)
-
-        # Serializar y retornar
-        serializer = self.get_serializer(user)
-        return Response(serializer.data)
+        # Respuesta ya serializada en el perfil en caché (core.perfil), el mismo que
+        # usó la autenticación: sin consultas mientras el perfil siga vigente.
+        # Sin caché compartida no hay perfil: se serializa request.user (ya cargado con su rol)
+        if not cache_compartida():
+            return Response(self.get_serializer(request.user).data)
+        _, perfil = obtener_usuario_con_perfil(request.user.pk)
+        if perfil is None:
+            return Response(self.get_serializer(request.user).data)
+        return Response(perfil['datos'])
 
 
 # ==============================================================================
@@ -403,12 +773,26 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     list=extend_schema(
         summary="Listar todos los activos",
         description="Obtiene el listado completo de activos con información anidada de tipo, estado y ubicación",
-        tags=["Core"]
+        tags=["Core"],
+        parameters=[
+            OpenApiParameter(
+                name='modo',
+                description=(
+                    "Modo de lectura. 'rapido' arma la misma respuesta desde una proyección "
+                    ".values() sin instanciar modelos ni serializers (solo lectura)."
+                ),
+                required=False,
+                type=str,
+                enum=['rapido']
+            ),
+            *PARAMETROS_CAMPOS_DINAMICOS
+        ]
     ),
     retrieve=extend_schema(
         summary="Obtener un activo específico",
         description="Obtiene los detalles completos de un activo incluyendo tipo, estado y ubicación con departamento",
-        tags=["Core"]
+        tags=["Core"],
+        parameters=PARAMETROS_CAMPOS_DINAMICOS
     ),
     create=extend_schema(
         summary="Crear un nuevo activo",
@@ -429,19 +813,26 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         summary="Eliminar un activo",
         description="Elimina un activo del sistema (requiere que no tenga historial asociado)",
         tags=["Core"]
+    ),
+    exportar=extend_schema(
+        summary="Exportar activos (CSV / NDJSON / XLSX)",
+        description="Descarga en streaming todos los activos que cumplen los filtros del listado, sin paginar",
+        tags=["Core"],
+        parameters=PARAMETROS_EXPORTACION,
+        responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY}
     )
 )
-class ActivoViewSet(viewsets.ModelViewSet):
+class ActivoViewSet(RespuestaCondicionalMixin, ExportacionMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Activos (ENTIDAD CENTRAL DEL SISTEMA).
 
     SEGURIDAD - CONTROL DE ACCESO BASADO EN ROLES (RBAC):
 
-    Permisos aplicados:
-    - IsAuthenticated: Todos los usuarios deben estar autenticados
-    - IsTecnicoOperativo: Permite a Técnicos y Admins crear/editar (GET, POST, PUT, PATCH)
-    - IsJefeOrAdminReadOnly: Permite a Jefes consultar activos (GET)
-    - CanDeleteActivo: Solo Administradores pueden eliminar (DELETE)
+    Permisos aplicados (core.permissions.POLITICA_ACCESO['ActivoViewSet']):
+    - Todos los usuarios deben estar autenticados
+    - Técnicos y Admins pueden crear/editar (GET, POST, PUT, PATCH)
+    - Jefes solo pueden consultar activos (GET)
+    - Solo Administradores pueden eliminar (DELETE)
 
     Matriz de permisos por rol:
     ┌─────────────────┬───────┬─────────┬──────┐
@@ -461,10 +852,16 @@ class ActivoViewSet(viewsets.ModelViewSet):
       en una sola query SQL (evita el problema N+1 queries).
     - Sin esta optimización, listar 100 activos generaría 301 queries SQL.
     - Con esta optimización, listar 100 activos genera solo 1 query SQL.
+    - El total de activos de la ubicación anidada se calcula con una subconsulta
+      SQL en la misma query (no un COUNT adicional por cada activo listado).
 
     RESPUESTA:
     - Los objetos relacionados (tipo, estado, ubicacion_actual) se devuelven
       completos gracias al método to_representation() del serializer.
+    - Con ?modo=rapido el listado se arma desde una proyección .values() sobre los
+      mismos JOINs (misma forma JSON, sin instanciar modelos ni serializers).
+    - Con ?fields= y ?expand= se eligen los campos y relaciones anidadas; la query
+      solo lee esas columnas (ej: ?fields=id,codigo_inventario,marca,modelo no hace JOINs).
 
     Endpoints:
     - GET /api/activos/ - Listar todos los activos con información completa
@@ -473,20 +870,29 @@ class ActivoViewSet(viewsets.ModelViewSet):
     - PUT /api/activos/{id}/ - Actualizar un activo completo
     - PATCH /api/activos/{id}/ - Actualizar parcialmente un activo
     - DELETE /api/activos/{id}/ - Eliminar un activo
+    - GET /api/activos/exportar/?formato=csv|ndjson|xlsx - Exportar en streaming (sin paginar)
+    - POST /api/activos/lote/ - Registrar varios activos
+    - PATCH /api/activos/lote/ - Cambiar estado, tipo o notas de varios activos
+    - POST /api/activos/movilizar-lote/ - Movilizar varios activos a una ubicación
     """
     queryset = Activo.objects.select_related(
         'tipo',
         'estado',
         'ubicacion_actual',
         'ubicacion_actual__departamento'
-    ).all()
+    ).annotate(
+        # Total de activos en la ubicación actual, calculado en SQL para toda la página
+        ubicacion_total_activos=subconsulta_total_activos('ubicacion_actual')
+    )
     serializer_class = ActivoSerializer
+    proyeccion = PROYECCION_ACTIVO
+    serializar_completo = staticmethod(serializar_activos_rapido)
+    modelos_version = (Activo, TipoEquipo, EstadoActivo, Ubicacion, Departamento)
+    nombre_exportacion = 'activos'
 
-    # RBAC: Combinación de permisos para control granular
-    # - IsTecnicoOperativo: Permite GET/POST/PUT/PATCH a Técnicos y Admins
-    # - IsJefeOrAdminReadOnly: Permite GET a Jefes
-    # - CanDeleteActivo: Bloquea DELETE excepto para Admins
-    permission_classes = [IsAuthenticated, IsTecnicoOperativo | IsJefeOrAdminReadOnly, CanDeleteActivo]
+    # RBAC: matriz de permisos en core.permissions.POLITICA_ACCESO['ActivoViewSet']
+    permission_classes = [PoliticaAcceso]
+    politica = 'ActivoViewSet'
 
     # FILTROS Y BÚSQUEDA
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -495,6 +901,16 @@ class ActivoViewSet(viewsets.ModelViewSet):
     ordering_fields = ['fecha_alta', 'codigo_inventario', 'marca']
     ordering = ['-fecha_alta']
 
+    def usar_proyeccion(self):
+        """
+        Con ?modo=rapido (o ?fields= / ?expand=) el listado usa la ruta de lectura rápida.
+
+        La ruta rápida respeta los mismos filtros, búsqueda, ordenamiento y
+        paginación, pero lee columnas con .values() y arma el JSON con
+        serializar_activos_rapido() en lugar de ActivoSerializer.
+        """
+        return self.request.query_params.get('modo') == 'rapido' or super().usar_proyeccion()
+
     @extend_schema(
         request=MovilizacionInputSerializer,
         responses={
@@ -513,15 +929,22 @@ class ActivoViewSet(viewsets.ModelViewSet):
         Esta operación es atómica. Si alguna parte falla, toda la operación se revierte.
 
         PASOS EJECUTADOS:
-        1. Valida que la ubicación destino exista
-        2. Actualiza la ubicación actual del activo
-        3. Registra el movimiento en el historial (trazabilidad)
+        1. Valida que la ubicación destino (y el nuevo estado, si se indica) exista
+        2. Actualiza la ubicación actual del activo (y su estado)
+        3. Registra el movimiento en el historial con su tipo (trazabilidad)
         4. Crea un log de auditoría en PostgreSQL (seguridad)
 
+        Traslado, cambio de estado e historial en una sola petición: la respuesta
+        incluye el activo actualizado en data.activo (misma forma que GET /api/activos/{id}/).
+        Si el destino es la ubicación actual, se requiere un estado_id distinto del
+        actual: se registra el cambio de estado (historial y auditoría) sin traslado.
+
         EJEMPLO DE REQUEST:
         ```json
         {
             "id_ubicacion_destino": 5,
+            "tipo_movimiento": "MANTENIMIENTO",
+            "estado_id": 3,
             "notas": "Traslado por mantenimiento preventivo"
         }
         ```
@@ -531,8 +954,7 @@ class ActivoViewSet(viewsets.ModelViewSet):
     @action(
         detail=True,
         methods=['post'],
-        url_path='movilizar',
-        permission_classes=[IsAuthenticated, IsTecnicoOperativo]  # Solo Técnicos y Admins
+        url_path='movilizar'  # Solo Técnicos y Admins (POLITICA_ACCESO)
     )
     def movilizar(self, request, pk=None):
         """
@@ -580,6 +1002,8 @@ class ActivoViewSet(viewsets.ModelViewSet):
         # Extraer datos validados
         id_ubicacion_destino = input_serializer.validated_data['id_ubicacion_destino']
         notas = input_serializer.validated_data.get('notas', '')
+        tipo_movimiento = input_serializer.validated_data['tipo_movimiento']
+        nuevo_estado = input_serializer.validated_data.get('estado')
 
         # ======================================================================
         # PASO 2: OBTENCIÓN DEL ACTIVO Y VALIDACIONES
@@ -603,8 +1027,11 @@ class ActivoViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Validar que no sea la misma ubicación
-            if activo.ubicacion_actual.id == ubicacion_destino.id:
+            # Misma ubicación: solo se admite si cambia el estado (ej: pasa a
+            # 'En Reparación' sin salir de la sala); queda igual en historial y auditoría
+            cambia_estado = nuevo_estado is not None and nuevo_estado.pk != activo.estado_id
+            misma_ubicacion = activo.ubicacion_actual_id == ubicacion_destino.id
+            if misma_ubicacion and not cambia_estado:
                 return Response(
                     {
                         'status': 'error',
@@ -613,8 +1040,9 @@ class ActivoViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Guardar la ubicación origen antes de cambiarla
+            # Guardar la ubicación origen y el estado antes de cambiarlos
             ubicacion_origen = activo.ubicacion_actual
+            estado_anterior = activo.estado
 
             # ======================================================================
             # PASO 3: TRANSACCIÓN ATÓMICA (ACID)
@@ -634,10 +1062,16 @@ class ActivoViewSet(viewsets.ModelViewSet):
                 """
 
                 # ----------------------------------------------------------
-                # 3.1: ACTUALIZAR UBICACIÓN DEL ACTIVO
+                # 3.1: ACTUALIZAR UBICACIÓN (Y ESTADO) DEL ACTIVO
                 # ----------------------------------------------------------
-                activo.ubicacion_actual = ubicacion_destino
-                activo.save()
+                campos_modificados = []
+                if not misma_ubicacion:
+                    activo.ubicacion_actual = ubicacion_destino
+                    campos_modificados.append('ubicacion_actual')
+                if cambia_estado:
+                    activo.estado = nuevo_estado
+                    campos_modificados.append('estado')
+                activo.save(update_fields=campos_modificados)
 
                 # ----------------------------------------------------------
                 # 3.2: REGISTRAR EN HISTORIAL (TRAZABILIDAD)
@@ -647,7 +1081,7 @@ class ActivoViewSet(viewsets.ModelViewSet):
                     usuario_registra=request.user,
                     ubicacion_origen=ubicacion_origen,
                     ubicacion_destino=ubicacion_destino,
-                    tipo_movimiento='TRASLADO',  # Tipo de movimiento según HU2
+                    tipo_movimiento=tipo_movimiento,  # TRASLADO por defecto (HU2)
                     comentarios=notas
                 )
 
@@ -671,6 +1105,9 @@ class ActivoViewSet(viewsets.ModelViewSet):
                         'destino_nombre': ubicacion_destino.nombre_ubicacion,
                         'destino_departamento': ubicacion_destino.departamento.nombre_departamento,
                         'notas': notas,
+                        'tipo_movimiento': tipo_movimiento,
+                        'estado_anterior': estado_anterior.nombre_estado,
+                        'estado_nuevo': activo.estado.nombre_estado,
                         'historial_id': historial.id
                     }
                 )
@@ -679,6 +1116,9 @@ class ActivoViewSet(viewsets.ModelViewSet):
             # PASO 4: RESPUESTA EXITOSA
             # ======================================================================
 
+            # Activo actualizado (misma forma que GET /api/activos/{id}/) en una consulta
+            fila_activo = self.queryset.filter(pk=activo.pk).values(*ACTIVO_CAMPOS_LECTURA_RAPIDA).get()
+
             return Response(
                 {
                     'status': 'success',
@@ -695,8 +1135,15 @@ class ActivoViewSet(viewsets.ModelViewSet):
                             'nombre': ubicacion_destino.nombre_ubicacion,
                             'departamento': ubicacion_destino.departamento.nombre_departamento
                         },
+                        'tipo_movimiento': tipo_movimiento,
+                        'estado': {
+                            'anterior': estado_anterior.nombre_estado,
+                            'nuevo': activo.estado.nombre_estado
+                        },
+                        'historial_id': historial.id,
                         'fecha_movimiento': historial.fecha_movimiento.isoformat(),
-                        'usuario': request.user.username
+                        'usuario': request.user.username,
+                        'activo': serializar_activos_rapido([fila_activo])[0]
                     }
                 },
                 status=status.HTTP_200_OK
@@ -718,6 +1165,294 @@ class ActivoViewSet(viewsets.ModelViewSet):
             )
 
 
+    @extend_schema(
+        request=ActivoLoteInputSerializer,
+        responses={
+            201: OpenApiResponse(description="Activos creados en 'data' (misma forma que GET /api/activos/)"),
+            400: OpenApiResponse(description="Errores de validación: una entrada por fila ({} si la fila es válida)"),
+            403: OpenApiResponse(description="Permiso denegado - Solo Técnicos y Administradores"),
+            409: OpenApiResponse(description="Conflicto con un alta simultánea; reintentar")
+        },
+        description="""
+        Registra varios activos en una sola petición (ej: recepción de una compra).
+
+        SEGURIDAD: Mismos permisos que el alta individual (Técnicos y Administradores).
+
+        OPERACIÓN TRANSACCIONAL (ACID):
+        Todo el lote se valida antes de escribir (numero_serie único y ubicaciones
+        con una consulta cada uno). Si alguna fila tiene errores no se crea ninguna.
+        Los códigos de inventario se asignan para todo el lote a la vez y los
+        activos se insertan con una sola sentencia.
+
+        EJEMPLO DE REQUEST:
+        ```json
+        {
+            "activos": [
+                {"numero_serie": "SN-001", "marca": "Dell", "modelo": "P2422H",
+                 "tipo_id": 3, "estado_id": 1, "ubicacion_actual_id": 7}
+            ]
+        }
+        ```
+        """,
+        tags=["Core"]
+    )
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='lote'  # Solo Técnicos y Admins (POLITICA_ACCESO)
+    )
+    def lote(self, request):
+        """
+        Alta de activos en lote: validación de todo el lote y un solo INSERT.
+
+        Returns:
+            Response: 201 Created con los activos creados (misma forma que GET /api/activos/)
+            Response: 400 Bad Request con los errores de cada fila
+            Response: 409 Conflict si otra petición registró el mismo número de serie a la vez
+        """
+        input_serializer = ActivoLoteInputSerializer(data=request.data)
+        if not input_serializer.is_valid():
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Datos de entrada inválidos',
+                    'errors': input_serializer.errors
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            activos = registrar_activos(input_serializer.validated_data['activos'])
+        except IntegrityError:
+            # Un alta simultánea tomó un número de serie (o código) entre la validación y el INSERT
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Otro registro simultáneo entró en conflicto con el lote. Reintente la operación.'
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+
+        ids = [activo.id for activo in activos]
+        filas = {
+            fila['id']: fila
+            for fila in self.queryset.filter(pk__in=ids).values(*ACTIVO_CAMPOS_LECTURA_RAPIDA)
+        }
+        return Response(
+            {
+                'status': 'success',
+                'message': f'{len(activos)} activos registrados',
+                'data': serializar_activos_rapido([filas[id_activo] for id_activo in ids])
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+    # Parámetros del listado con que PATCH /api/activos/lote/ selecciona activos sin ids_activos
+    parametros_seleccion_lote = ('ubicacion_actual', 'tipo', 'estado', 'search')
+
+    @extend_schema(
+        request=ActivoActualizacionLoteInputSerializer,
+        parameters=[
+            OpenApiParameter(name='ubicacion_actual', description="Seleccionar los activos de esta ubicación (sin ids_activos)", required=False, type=int),
+            OpenApiParameter(name='tipo', description="Seleccionar los activos de este tipo (sin ids_activos)", required=False, type=int),
+            OpenApiParameter(name='estado', description="Seleccionar los activos en este estado (sin ids_activos)", required=False, type=int),
+            OpenApiParameter(name='search', description="Seleccionar por código, serie, marca o modelo (sin ids_activos)", required=False, type=str),
+        ],
+        responses={
+            200: OpenApiResponse(description="Lote procesado: resultado por activo (actualizado, sin_cambios o no_encontrado)"),
+            400: OpenApiResponse(description="Error de validación, sin selección o selección demasiado grande"),
+            403: OpenApiResponse(description="Permiso denegado - Solo Técnicos y Administradores")
+        },
+        description=f"""
+        Cambia estado, tipo y/o notas de varios activos en una sola petición
+        (ej: dar de baja o enviar a reparación un grupo de equipos).
+
+        SEGURIDAD: Mismos permisos que PATCH /api/activos/{{id}}/ (Técnicos y Administradores).
+
+        SELECCIÓN DE ACTIVOS:
+        - ids_activos en el cuerpo, o
+        - los filtros del listado en la URL (?estado=, ?tipo=, ?ubicacion_actual=, ?search=);
+          se exige al menos uno y como máximo {MAX_ACTIVOS_LOTE} activos seleccionados.
+
+        OPERACIÓN TRANSACCIONAL (ACID):
+        Bloquea las filas (SELECT ... FOR UPDATE), aplica los cambios con un solo
+        UPDATE y registra un log de auditoría por activo modificado con una
+        inserción masiva. Los activos que ya tenían esos valores no se tocan.
+
+        EJEMPLO DE REQUEST (PATCH /api/activos/lote/?ubicacion_actual=7&estado=1):
+        ```json
+        {{
+            "estado_id": 3,
+            "notas": "Enviados a reparación por falla eléctrica"
+        }}
+        ```
+        """,
+        tags=["Core"]
+    )
+    @lote.mapping.patch
+    def actualizar_lote(self, request):
+        """
+        Edición en lote: mismos cambios para varios activos, un UPDATE, una transacción.
+
+        Returns:
+            Response: 200 OK con el resultado de cada activo (core.ediciones)
+            Response: 400 Bad Request si hay errores de validación o la selección no es válida
+        """
+        input_serializer = ActivoActualizacionLoteInputSerializer(data=request.data)
+        if not input_serializer.is_valid():
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Datos de entrada inválidos',
+                    'errors': input_serializer.errors
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        datos = input_serializer.validated_data
+        if 'ids_activos' in datos:
+            ids_activos = datos['ids_activos']
+        else:
+            # Sin filtros la selección sería todo el inventario
+            if not any(request.query_params.get(parametro) for parametro in self.parametros_seleccion_lote):
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': (
+                            'Indique ids_activos o al menos un filtro '
+                            f"({', '.join(self.parametros_seleccion_lote)})"
+                        )
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ids_activos = list(
+                self.filter_queryset(Activo.objects.all())
+                .order_by('pk')
+                .values_list('pk', flat=True)[:MAX_ACTIVOS_LOTE + 1]
+            )
+            if len(ids_activos) > MAX_ACTIVOS_LOTE:
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': f'Los filtros seleccionan más de {MAX_ACTIVOS_LOTE} activos. Refine la selección.'
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        cambios = {campo: datos[campo] for campo in CAMPOS_EDITABLES_LOTE if campo in datos}
+        resultados = actualizar_activos(ids_activos, cambios, request.user)
+
+        totales = {estado: 0 for estado in (ACTUALIZADO, SIN_CAMBIOS, NO_ENCONTRADO)}
+        for resultado in resultados:
+            totales[resultado['estado']] += 1
+
+        return Response(
+            {
+                'status': 'success',
+                'message': f"{totales[ACTUALIZADO]} de {len(resultados)} activos actualizados",
+                'data': {
+                    'usuario': request.user.username,
+                    'totales': totales,
+                    'resultados': resultados
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
+    @extend_schema(
+        request=MovilizacionLoteInputSerializer,
+        responses={
+            200: OpenApiResponse(description="Lote procesado: resultado por activo (movido, omitido o no_encontrado)"),
+            400: OpenApiResponse(description="Error de validación o ubicación no encontrada"),
+            403: OpenApiResponse(description="Permiso denegado - Solo Técnicos y Administradores")
+        },
+        description="""
+        Moviliza varios activos a la misma ubicación en una sola petición.
+
+        SEGURIDAD: Mismos permisos que la movilización individual (Técnicos y Administradores).
+
+        OPERACIÓN TRANSACCIONAL (ACID):
+        Bloquea las filas de los activos (SELECT ... FOR UPDATE), actualiza su
+        ubicación con un solo UPDATE y registra historial y auditoría con
+        inserciones masivas, todo en una transacción.
+
+        Los activos inexistentes o que ya están en el destino no detienen el lote:
+        se informan en su resultado y el resto se moviliza.
+
+        EJEMPLO DE REQUEST:
+        ```json
+        {
+            "ids_activos": [12, 15, 18],
+            "id_ubicacion_destino": 5,
+            "notas": "Traslado de equipos por remodelación de la sala"
+        }
+        ```
+        """,
+        tags=["Core"]
+    )
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='movilizar-lote'  # Solo Técnicos y Admins (POLITICA_ACCESO)
+    )
+    def movilizar_lote(self, request):
+        """
+        Movilización en lote: varios activos, un destino, una transacción.
+
+        Returns:
+            Response: 200 OK con el resultado de cada activo (core.movimientos)
+            Response: 400 Bad Request si hay errores de validación o el destino no existe
+        """
+        input_serializer = MovilizacionLoteInputSerializer(data=request.data)
+        if not input_serializer.is_valid():
+            return Response(
+                {
+                    'status': 'error',
+                    'message': 'Datos de entrada inválidos',
+                    'errors': input_serializer.errors
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        datos = input_serializer.validated_data
+        ubicacion_destino = Ubicacion.objects.select_related('departamento').filter(
+            id=datos['id_ubicacion_destino']
+        ).first()
+        if ubicacion_destino is None:
+            return Response(
+                {
+                    'status': 'error',
+                    'message': f"La ubicación con ID {datos['id_ubicacion_destino']} no existe"
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resultados = movilizar_activos(
+            datos['ids_activos'],
+            ubicacion_destino,
+            request.user,
+            notas=datos.get('notas', '')
+        )
+
+        totales = {estado: 0 for estado in (MOVIDO, OMITIDO, NO_ENCONTRADO)}
+        for resultado in resultados:
+            totales[resultado['estado']] += 1
+
+        return Response(
+            {
+                'status': 'success',
+                'message': f"{totales[MOVIDO]} de {len(resultados)} activos movilizados",
+                'data': {
+                    'ubicacion_destino': resumen_ubicacion(ubicacion_destino),
+                    'usuario': request.user.username,
+                    'totales': totales,
+                    'resultados': resultados
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
+
 # ==============================================================================
 # VIEWSETS DE TRAZABILIDAD Y AUDITORÍA
 # ==============================================================================
@@ -726,12 +1461,14 @@ class ActivoViewSet(viewsets.ModelViewSet):
     list=extend_schema(
         summary="Listar historial de movimientos",
         description="Obtiene el historial completo de movimientos de activos con trazabilidad",
-        tags=["Trazabilidad"]
+        tags=["Trazabilidad"],
+        parameters=PARAMETROS_CAMPOS_DINAMICOS
     ),
     retrieve=extend_schema(
         summary="Obtener un movimiento específico",
         description="Obtiene los detalles completos de un movimiento de activo",
-        tags=["Trazabilidad"]
+        tags=["Trazabilidad"],
+        parameters=PARAMETROS_CAMPOS_DINAMICOS
     ),
     create=extend_schema(
         summary="Registrar un nuevo movimiento",
@@ -752,9 +1489,16 @@ class ActivoViewSet(viewsets.ModelViewSet):
         summary="Eliminar un movimiento",
         description="Elimina un registro de movimiento del historial",
         tags=["Trazabilidad"]
+    ),
+    exportar=extend_schema(
+        summary="Exportar historial de movimientos (CSV / NDJSON / XLSX)",
+        description="Descarga en streaming todos los movimientos que cumplen los filtros del listado, sin paginar",
+        tags=["Trazabilidad"],
+        parameters=PARAMETROS_EXPORTACION,
+        responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY}
     )
 )
-class HistorialMovimientoViewSet(viewsets.ModelViewSet):
+class HistorialMovimientoViewSet(RespuestaCondicionalMixin, ExportacionMixin, CamposDinamicosMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión de Historial de Movimientos.
 
@@ -770,6 +1514,15 @@ class HistorialMovimientoViewSet(viewsets.ModelViewSet):
 
     OPTIMIZACIÓN:
     - Usa select_related() para cargar todas las relaciones en una sola query.
+    - El listado (GET) proyecta solo las columnas necesarias con .values() y arma
+      el JSON en una sola pasada (serializar_historial_rapido), con la misma salida
+      que HistorialMovimientoSerializer.
+    - Soporta ?fields= y ?expand= (ej: ?fields=id,codigo_activo,fecha_movimiento).
+
+    PAGINACIÓN:
+    - Por cursor sobre -fecha_movimiento (sin COUNT(*) ni OFFSET): seguir el enlace 'next'.
+    - Los clientes que envían ?page= o ?ordering= sobre otro campo (ej: tipo_movimiento)
+      reciben paginación numerada.
 
     TRAZABILIDAD:
     - Cada movimiento registra activo, usuario, ubicaciones origen/destino.
@@ -781,6 +1534,7 @@ class HistorialMovimientoViewSet(viewsets.ModelViewSet):
     - PUT /api/historial-movimientos/{id}/ - Actualizar un movimiento completo (solo Admin)
     - PATCH /api/historial-movimientos/{id}/ - Actualizar parcialmente un movimiento (solo Admin)
     - DELETE /api/historial-movimientos/{id}/ - Eliminar un movimiento (solo Admin)
+    - GET /api/historial-movimientos/exportar/?formato=csv|ndjson|xlsx - Exportar en streaming
     """
     queryset = HistorialMovimiento.objects.select_related(
         'activo',
@@ -791,9 +1545,15 @@ class HistorialMovimientoViewSet(viewsets.ModelViewSet):
         'ubicacion_destino__departamento'
     ).all()
     serializer_class = HistorialMovimientoSerializer
+    proyeccion = PROYECCION_HISTORIAL
+    serializar_completo = staticmethod(serializar_historial_rapido)
+    nombre_exportacion = 'historial_movimientos'
+    modelos_version = (HistorialMovimiento, Activo, Usuario, Ubicacion, Departamento)
+    pagination_class = HistorialCursorPagination
 
     # RBAC: Jefes y Técnicos pueden consultar, solo Admin puede modificar
-    permission_classes = [IsAuthenticated, IsTecnicoOperativo | IsJefeOrAdminReadOnly]
+    permission_classes = [PoliticaAcceso]
+    politica = 'HistorialMovimientoViewSet'
 
     # FILTROS Y BÚSQUEDA
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -802,20 +1562,37 @@ class HistorialMovimientoViewSet(viewsets.ModelViewSet):
     ordering_fields = ['fecha_movimiento', 'tipo_movimiento']
     ordering = ['-fecha_movimiento']
 
+    def usar_proyeccion(self):
+        """
+        El listado siempre usa la proyección .values() serializada en una sola pasada.
+
+        Respeta filtros, búsqueda, ordenamiento y paginación del ViewSet.
+        """
+        return True
+
 
 @extend_schema_view(
     list=extend_schema(
         summary="Listar logs de auditoría",
         description="Obtiene el historial completo de acciones del sistema",
-        tags=["Auditoría"]
+        tags=["Auditoría"],
+        parameters=PARAMETROS_CAMPOS_DINAMICOS
     ),
     retrieve=extend_schema(
         summary="Obtener un log específico",
         description="Obtiene los detalles completos de un log de auditoría",
-        tags=["Auditoría"]
+        tags=["Auditoría"],
+        parameters=PARAMETROS_CAMPOS_DINAMICOS
+    ),
+    exportar=extend_schema(
+        summary="Exportar logs de auditoría (CSV / NDJSON / XLSX)",
+        description="Descarga en streaming todos los logs que cumplen los filtros del listado, sin paginar",
+        tags=["Auditoría"],
+        parameters=PARAMETROS_EXPORTACION,
+        responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY}
     )
 )
-class AuditoriaLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditoriaLogViewSet(ExportacionMixin, CamposDinamicosMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para consulta de Logs de Auditoría (SOLO LECTURA).
 
@@ -838,13 +1615,409 @@ class AuditoriaLogViewSet(viewsets.ReadOnlyModelViewSet):
 
     OPTIMIZACIÓN:
     - Usa select_related('usuario') para evitar N+1 queries.
+    - Paginación por cursor sobre -timestamp (sin COUNT(*) ni OFFSET): seguir el enlace 'next'.
+      Los clientes que envían ?page= o ?ordering= sobre otro campo (ej: accion)
+      reciben paginación numerada.
 
     Endpoints:
     - GET /api/auditoria-logs/ - Listar todos los logs de auditoría
     - GET /api/auditoria-logs/{id}/ - Obtener un log específico
+    - GET /api/auditoria-logs/exportar/?formato=csv|ndjson|xlsx - Exportar en streaming
     """
     queryset = AuditoriaLog.objects.select_related('usuario').all()
     serializer_class = AuditoriaLogSerializer
+    proyeccion = PROYECCION_AUDITORIA
+    nombre_exportacion = 'auditoria_logs'
+    pagination_class = AuditoriaCursorPagination
 
     # RBAC: Solo Administradores y Jefes pueden consultar auditoría
-    permission_classes = [IsAuthenticated, IsJefeOrAdminReadOnly]
+    permission_classes = [PoliticaAcceso]
+    politica = 'AuditoriaLogViewSet'
+
+
+# ==============================================================================
+# REPORTES
+# ==============================================================================
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Generar un reporte",
+        description=(
+            "Ejecuta un reporte agregado en SQL (GROUP BY y funciones de ventana) y "
+            "devuelve solo el resultado resumido. Con formato=csv|xlsx se descarga como archivo."
+        ),
+        tags=["Reportes"],
+        parameters=[ReporteParametrosSerializer],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            400: OpenApiResponse(description="Parámetros inválidos")
+        }
+    )
+)
+class ReporteViewSet(viewsets.ViewSet):
+    """
+    ViewSet para reportes del sistema (SOLO LECTURA).
+
+    Reemplaza el filtrado en el navegador de ReportesView.vue: en lugar de
+    descargar catálogos y activos completos, el cliente envía la configuración
+    del reporte y recibe solo las filas agregadas (core.reportes).
+
+    SEGURIDAD - CONTROL DE ACCESO:
+    - Administrador, Jefe de Departamento y Técnico: consulta (GET)
+
+    FORMATO DE RESPUESTA (JSON):
+    {
+        "reporte": "por_estado",
+        "nombre": "Activos por Estado",
+        "filtros": {"periodo": "30dias", "desde": "...", "hasta": null, ...},
+        "generado_en": "2025-11-20T10:30:00-03:00",
+        "total_filas": 4,
+        "resultados": [
+            {"id_estado": 1, "nombre_estado": "Operativo", "total": 120, "ranking": 1, "porcentaje": 60.0},
+            ...
+        ]
+    }
+
+    Endpoints:
+    - GET /api/reportes/?reporte=<tipo>&... - Generar un reporte
+    """
+
+    # RBAC: Lectura para todos los roles operativos, sin escritura
+    permission_classes = [PoliticaAcceso]
+    politica = 'ReporteViewSet'
+
+    def list(self, request):
+        parametros = ReporteParametrosSerializer(data=request.query_params)
+        parametros.is_valid(raise_exception=True)
+
+        datos = parametros.validated_data
+        reporte = datos['reporte']
+        formato = datos['formato']
+        filtros = resolver_filtros(datos)
+        filas = generar_reporte(reporte, filtros)
+
+        if formato != 'json':
+            AuditoriaLog.registrar_accion(
+                usuario=request.user,
+                accion='EXPORT',
+                detalle={'recurso': 'reportes', 'reporte': reporte, 'formato': formato}
+            )
+            lectores = [(clave, itemgetter(clave)) for clave in (filas[0] if filas else {})]
+            return respuesta_archivo(filas, lectores, formato, f'reporte_{reporte}')
+
+        return Response({
+            'reporte': reporte,
+            'nombre': REPORTES[reporte][0],
+            'filtros': {
+                clave: valor for clave, valor in parametros.data.items()
+                if clave not in ('reporte', 'formato')
+            } | {
+                'desde': formatear_fecha(filtros['desde']),
+                'hasta': formatear_fecha(filtros['hasta']),
+            },
+            'generado_en': formatear_fecha(timezone.now()),
+            'total_filas': len(filas),
+            'resultados': filas,
+        })
+
+
+# ==============================================================================
+# DASHBOARD
+# ==============================================================================
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Resumen para los dashboards de inicio",
+        description=(
+            "Totales de activos por estado, tipo y departamento y volumen reciente de "
+            "movimientos. El resultado se guarda en caché por unos segundos y se invalida "
+            "al modificar activos o movimientos."
+        ),
+        tags=["Reportes"],
+        responses={200: OpenApiTypes.OBJECT}
+    )
+)
+class DashboardViewSet(viewsets.ViewSet):
+    """
+    ViewSet con el resumen de AdminHome, JefeHome y TecnicoHome (SOLO LECTURA).
+
+    OPTIMIZACIÓN:
+    - 4 consultas agrupadas en lugar de listar activos y movimientos
+    - Caché con TTL corto (DASHBOARD_CACHE_TTL), recalculada cuando cambia la
+      marca de Activo, HistorialMovimiento o sus catálogos (core.versiones)
+
+    FORMATO DE RESPUESTA:
+    {
+        "activos": {
+            "total": 200,
+            "por_estado": [{"id_estado": 1, "nombre_estado": "Operativo", "total": 120}, ...],
+            "por_tipo": [{"id_tipo": 2, "nombre_tipo": "Notebook", "total": 40}, ...],
+            "por_departamento": [{"id_departamento": 3, "nombre_departamento": "Urgencias", "total": 25}, ...]
+        },
+        "movimientos": {
+            "ultimas_24_horas": 4,
+            "ultimos_7_dias": 31,
+            "ultimos_30_dias": 118,
+            "por_tipo_30_dias": {"TRASLADO": 60, "MANTENIMIENTO": 20, ...}
+        },
+        "generado_en": "2025-11-20T10:30:00-03:00"
+    }
+
+    Endpoints:
+    - GET /api/dashboard/ - Resumen de activos y movimientos
+    """
+
+    # RBAC: Todos los roles operativos pueden consultar el resumen
+    permission_classes = [PoliticaAcceso]
+    politica = 'DashboardViewSet'
+
+    def list(self, request):
+        return Response(obtener_resumen_dashboard())
+
+
+# ==============================================================================
+# CARGA INICIAL (BOOTSTRAP)
+# ==============================================================================
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Datos de referencia para iniciar el frontend",
+        description=(
+            "Todos los catálogos que el rol del usuario puede listar (estados, tipos, "
+            "departamentos, ubicaciones y, para el Administrador, roles y usuarios) en una "
+            "sola respuesta. Las secciones no permitidas se omiten. Soporta If-None-Match: "
+            "si ningún catálogo cambió responde 304."
+        ),
+        tags=["Core"],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            304: OpenApiResponse(description="Ningún catálogo cambió desde el ETag enviado")
+        }
+    )
+)
+class BootstrapViewSet(ValidadoresCondicionalesMixin, viewsets.ViewSet):
+    """
+    ViewSet con los datos de referencia que cada pantalla carga al iniciar
+    (ReportesView, GestionActivos, AssetListView).
+
+    En lugar de una petición por catálogo (cada una con su autenticación,
+    permisos y paginación), el frontend hace una sola.
+
+    SEGURIDAD - CONTROL DE ACCESO:
+    - Cualquier usuario autenticado puede consultarlo
+    - Cada sección se incluye solo si POLITICA_ACCESO permite al rol listar
+      el recurso equivalente (ej: 'usuarios' solo para el Administrador)
+
+    OPTIMIZACIÓN:
+    - Catálogos maestros desde memoria (core.catalogos)
+    - Ubicaciones y usuarios desde la caché de Django, recalculados solo cuando
+      cambia la marca de alguno de sus modelos (core.versiones)
+    - Un único ETag con las marcas de todas las secciones: el 304 solo lee
+      las marcas, no los catálogos
+
+    FORMATO DE RESPUESTA (misma forma que cada listado):
+    {
+        "estados_activo": [{"id": 1, "nombre_estado": "Operativo"}, ...],
+        "tipos_equipo": [...],
+        "departamentos": [...],
+        "ubicaciones": [{"id": 1, "nombre_ubicacion": "...", "departamento": {...}, ...}, ...],
+        "roles": [...],
+        "usuarios": [...]
+    }
+
+    Endpoints:
+    - GET /api/bootstrap/ - Catálogos visibles para el rol del usuario
+    """
+
+    # Secciones de la respuesta: clave -> ViewSet del listado equivalente
+    # (sus permisos, serializer y modelos_version se reutilizan)
+    secciones = {
+        'estados_activo': EstadoActivoViewSet,
+        'tipos_equipo': TipoEquipoViewSet,
+        'departamentos': DepartamentoViewSet,
+        'ubicaciones': UbicacionViewSet,
+        'roles': RolViewSet,
+        'usuarios': UsuarioViewSet,
+    }
+
+    # RBAC: Abierto a cualquier autenticado; las secciones se filtran por rol
+    permission_classes = [PoliticaAcceso]
+    politica = 'BootstrapViewSet'
+
+    def secciones_visibles(self):
+        """Claves de las secciones que el rol del usuario puede listar (se calcula una vez por petición)."""
+        if not hasattr(self, '_secciones_visibles'):
+            tabla = tabla_politica()
+            rol_id = getattr(self.request.user, 'rol_id', None)
+            self._secciones_visibles = [
+                clave for clave, vista in self.secciones.items()
+                if permite(tabla, rol_id, vista.politica, 'list', 'GET')
+            ]
+        return self._secciones_visibles
+
+    def obtener_modelos_version(self):
+        modelos = []
+        for clave in self.secciones_visibles():
+            vista = self.secciones[clave]
+            for modelo in vista.modelos_version or (vista.queryset.model,):
+                if modelo not in modelos:
+                    modelos.append(modelo)
+        return modelos
+
+    def variante_respuesta(self, request):
+        return ','.join(self.secciones_visibles())
+
+    def datos_seccion(self, clave):
+        """Lista serializada de una sección, con la misma forma que su listado."""
+        vista = self.secciones[clave]
+        if issubclass(vista, CatalogoCacheMixin):
+            lista, _ = obtener_catalogo(vista.queryset.model).representacion(vista.serializer_class)
+            return lista
+        calcular = getattr(self, f'calcular_{clave}')
+        return obtener_derivado(f'bootstrap:{clave}', vista.modelos_version, calcular)
+
+    def calcular_ubicaciones(self):
+        """Ubicaciones con departamento y total de activos (1 consulta)."""
+        filas = UbicacionViewSet.queryset.order_by(*UbicacionViewSet.ordering).values(
+            *PROYECCION_UBICACION.columnas()
+        )
+        return PROYECCION_UBICACION.serializar(filas)
+
+    def calcular_usuarios(self):
+        """Usuarios con su rol (1 consulta)."""
+        # .all(): iterar el queryset de la clase guardaría sus filas para siempre en el proceso
+        return list(UsuarioSerializer(UsuarioViewSet.queryset.all(), many=True).data)
+
+    def list(self, request):
+        return self.respuesta_condicional(
+            request,
+            lambda: Response({clave: self.datos_seccion(clave) for clave in self.secciones_visibles()})
+        )
+
+
+# ==============================================================================
+# ESCANEO DE CÓDIGOS QR
+# ==============================================================================
+
+# Formatos de las etiquetas impresas (ver core.codigos)
+PATRON_CODIGO_UBICACION = re.compile(r'^LOC-[0-9A-F]+$')
+PATRON_CODIGO_ACTIVO = re.compile(r'^INV-\d{2}-[0-9A-F]+$')
+
+
+@extend_schema_view(
+    retrieve=extend_schema(
+        summary="Resolver un código escaneado",
+        description=(
+            "Reconoce el formato del código (LOC-XXXXXX o INV-YY-XXXXXX) y lo busca por "
+            "igualdad exacta sobre el índice único. Una ubicación se devuelve con sus "
+            "activos actuales; un activo, con su ubicación."
+        ),
+        tags=["Core"],
+        responses={
+            200: OpenApiTypes.OBJECT,
+            400: OpenApiResponse(description="Formato de código no reconocido"),
+            404: OpenApiResponse(description="Código no encontrado")
+        }
+    )
+)
+class EscaneoViewSet(viewsets.ViewSet):
+    """
+    ViewSet para resolver los códigos QR escaneados (QRScanner.vue / ScannerView.vue).
+
+    En lugar de ?search= (icontains sobre varias columnas, sin índice), busca
+    el código por igualdad exacta sobre codigo_qr o codigo_inventario, que
+    tienen índice único.
+
+    SEGURIDAD - CONTROL DE ACCESO:
+    - Mismos permisos de lectura que activos (Admin, Técnico y Jefe)
+
+    FORMATO DE RESPUESTA:
+    - Ubicación (LOC-XXXXXX), una lectura de caché (2 consultas si la foto no está):
+      {"tipo": "ubicacion", "codigo": "LOC-F8A1B2", "ubicacion": {...}, "activos": [...]}
+    - Activo (INV-YY-XXXXXX), 1 consulta:
+      {"tipo": "activo", "codigo": "INV-25-A1B2C3", "activo": {...}}
+
+    Los objetos tienen la misma forma que /api/ubicaciones/ y /api/activos/.
+
+    Endpoints:
+    - GET /api/scan/{codigo}/ - Resolver un código escaneado
+    """
+
+    lookup_field = 'codigo'
+    lookup_value_regex = '[^/]+'
+
+    # RBAC: Mismos permisos de lectura que ActivoViewSet
+    permission_classes = [PoliticaAcceso]
+    politica = 'EscaneoViewSet'
+
+    def retrieve(self, request, codigo=None):
+        codigo = codigo.strip().upper()
+
+        if PATRON_CODIGO_UBICACION.match(codigo):
+            return Response({'tipo': 'ubicacion', 'codigo': codigo, **self._resolver_ubicacion(codigo)})
+
+        if PATRON_CODIGO_ACTIVO.match(codigo):
+            return Response({'tipo': 'activo', 'codigo': codigo, 'activo': self._resolver_activo(codigo)})
+
+        raise DRFValidationError({
+            'codigo': ["Formato no reconocido. Se espera LOC-XXXXXX (ubicación) o INV-YY-XXXXXX (activo)."]
+        })
+
+    def _resolver_ubicacion(self, codigo):
+        """Ubicación por codigo_qr y sus activos actuales, desde la foto en caché (core.inventario)."""
+        inventario = obtener_inventario_ubicacion(codigo)
+        if inventario is None:
+            raise NotFound(f"No se encontró la ubicación con código {codigo}")
+        return inventario
+
+    def _resolver_activo(self, codigo):
+        """Activo por codigo_inventario con su ubicación (mismo queryset que ActivoViewSet)."""
+        fila = ActivoViewSet.queryset.filter(codigo_inventario=codigo).values(*ACTIVO_CAMPOS_LECTURA_RAPIDA).first()
+        if fila is None:
+            raise NotFound(f"No se encontró el activo con código {codigo}")
+        return serializar_activos_rapido([fila])[0]
+
+
+# ==============================================================================
+# DOCUMENTACIÓN OPENAPI
+# ==============================================================================
+
+class EsquemaAPIView(SpectacularAPIView):
+    """
+    /api/schema/ servido desde el archivo pregenerado (core.esquema).
+
+    Misma negociación de formato que SpectacularAPIView (YAML por defecto,
+    JSON con ?format=json o Accept: application/vnd.oai.openapi+json), pero sin
+    introspección por petición:
+    - Cuerpo comprimido con gzip si el cliente lo acepta
+    - ETag del contenido (distinto para el cuerpo gzip): Swagger UI y ReDoc
+      revalidan con 304
+    - ?lang= se resuelve con la generación dinámica (traducciones)
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang'):
+            return super().get(request, *args, **kwargs)
+
+        formato = 'json' if isinstance(request.accepted_renderer, OpenApiJsonRenderer) else 'yaml'
+        esquema = obtener_esquema(formato)
+
+        # Misma negociación que CompresionMiddleware (valores q, 'gzip;q=0' no lo acepta).
+        # Si el cliente prefiere brotli, el middleware comprime el cuerpo sin comprimir
+        comprimido = elegir_codificacion(request.META.get('HTTP_ACCEPT_ENCODING', '')) == 'gzip'
+        etag = esquema.etag_gzip if comprimido else esquema.etag
+
+        respuesta = get_conditional_response(request, etag=etag)
+        if respuesta is None:
+            if comprimido:
+                respuesta = HttpResponse(esquema.contenido_gzip, content_type=esquema.content_type)
+                respuesta['Content-Encoding'] = 'gzip'
+            else:
+                respuesta = HttpResponse(esquema.contenido, content_type=esquema.content_type)
+            respuesta['Content-Disposition'] = f'inline; filename="schema.{formato}"'
+
+        respuesta['ETag'] = etag
+        patch_cache_control(respuesta, no_cache=True)
+        patch_vary_headers(respuesta, ('Accept', 'Accept-Encoding'))
+        return respuesta
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Benchmark de la compresión de respuestas: bytes ahorrados en páginas típicas de la API.
+
+Genera las respuestas de los listados más usados por el frontend (mismos
+ViewSets, permisos y paginación) y las pasa por CompresionMiddleware con cada
+codificación disponible (gzip y, si está instalado, brotli). Informa el
+tamaño original, el comprimido, el ahorro y el tiempo de compresión.
+
+Además verifica que el cuerpo descomprimido sea idéntico al original,
+incluidas las exportaciones en streaming (comprimidas bloque a bloque).
+
+Uso:
+    python scripts/benchmark_compresion.py
+    python scripts/benchmark_compresion.py --usuario admin --repeticiones 5
+"""
+
+import os
+import sys
+import time
+import zlib
+import argparse
+import django
+
+# Configurar Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.middleware import CompresionMiddleware, brotli, codificaciones_disponibles
+from core.models import Usuario
+from core.views import (
+    ActivoViewSet,
+    HistorialMovimientoViewSet,
+    UbicacionViewSet,
+    BootstrapViewSet
+)
+
+
+# (nombre, vista, acción, parámetros)
+PAGINAS = [
+    ('activos (página por defecto)', ActivoViewSet, 'list', {}),
+    ('activos ?page_size=100', ActivoViewSet, 'list', {'page_size': 100}),
+    ('activos ?page_size=1000', ActivoViewSet, 'list', {'page_size': 1000}),
+    ('historial (página por defecto)', HistorialMovimientoViewSet, 'list', {}),
+    ('historial ?page_size=100', HistorialMovimientoViewSet, 'list', {'page_size': 100}),
+    ('ubicaciones ?page_size=1000', UbicacionViewSet, 'list', {'page_size': 1000}),
+    ('bootstrap', BootstrapViewSet, 'list', {}),
+    ('exportar activos CSV (streaming)', ActivoViewSet, 'exportar', {'formato': 'csv'}),
+    ('exportar historial NDJSON (streaming)', HistorialMovimientoViewSet, 'exportar', {'formato': 'ndjson'}),
+]
+
+factory = APIRequestFactory()
+
+
+def descomprimir(cuerpo, codificacion):
+    if codificacion == 'br':
+        return brotli.decompress(cuerpo)
+    return zlib.decompress(cuerpo, 16 + zlib.MAX_WBITS)
+
+
+def obtener_respuesta(usuario, vista, accion, parametros, codificacion=None):
+    """Ejecuta la vista y el middleware; retorna (respuesta, cuerpo en bytes)."""
+    extra = {'HTTP_ACCEPT_ENCODING': codificacion} if codificacion else {}
+    request = factory.get('/', parametros, **extra)
+    force_authenticate(request, user=usuario)
+
+    def ejecutar_vista(request):
+        respuesta = vista.as_view({'get': accion})(request)
+        if hasattr(respuesta, 'render'):
+            respuesta.render()
+        return respuesta
+
+    respuesta = CompresionMiddleware(ejecutar_vista)(request)
+    if respuesta.streaming:
+        return respuesta, b''.join(respuesta.streaming_content)
+    return respuesta, respuesta.content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--usuario', default='admin', help='Usuario con que se piden las páginas (default: admin)')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por página (default: 3)')
+    args = parser.parse_args()
+
+    usuario = Usuario.objects.select_related('rol').get(username=args.usuario)
+    codificaciones = codificaciones_disponibles()
+
+    print("=" * 100)
+    print("  BENCHMARK COMPRESIÓN DE RESPUESTAS")
+    print("=" * 100)
+    if brotli is None:
+        print("   (brotli no está instalado: solo gzip. Instalar con `pip install brotli`)")
+    print(f"\n   {'Página':<40} {'Original':>10} " + ''.join(
+        f"{codificacion:>10} {'ahorro':>7} {'ms':>6} " for codificacion in codificaciones
+    ))
+
+    total_original = 0
+    total_comprimido = {codificacion: 0 for codificacion in codificaciones}
+    for nombre, vista, accion, parametros in PAGINAS:
+        _, original = obtener_respuesta(usuario, vista, accion, parametros)
+        total_original += len(original)
+        columnas = ''
+        for codificacion in codificaciones:
+            mejor = None
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                respuesta, cuerpo = obtener_respuesta(usuario, vista, accion, parametros, codificacion)
+                duracion = time.perf_counter() - inicio
+                mejor = duracion if mejor is None else min(mejor, duracion)
+
+            if respuesta.get('Content-Encoding') == codificacion:
+                # Las exportaciones incluyen la fecha en el nombre, no en el cuerpo: deben coincidir
+                if descomprimir(cuerpo, codificacion) != original:
+                    print(f"❌ {nombre}: el cuerpo {codificacion} descomprimido no coincide con el original")
+                    sys.exit(1)
+            total_comprimido[codificacion] += len(cuerpo)
+            ahorro = 1 - len(cuerpo) / len(original) if original else 0
+            # Tiempo total de la petición (vista + compresión)
+            columnas += f"{len(cuerpo):>10,} {ahorro:>7.0%} {mejor * 1000:>6.1f} "
+        print(f"   {nombre:<40} {len(original):>10,} {columnas}")
+
+    print(f"\n   {'TOTAL':<40} {total_original:>10,} " + ''.join(
+        f"{total:>10,} {1 - total / total_original if total_original else 0:>7.0%} {'':>6} "
+        for total in total_comprimido.values()
+    ))
+    print("\n✅ Los cuerpos descomprimidos coinciden con los originales")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark de la lectura de activos: ActivoSerializer vs ruta rápida (?modo=rapido).
+
+Compara las filas por segundo de ambas rutas sobre el mismo queryset que usa
+ActivoViewSet (mismos JOINs y anotaciones), sin pasar por HTTP, para medir
+solo el costo de lectura + serialización.
+
+Además verifica que ambas rutas produzcan exactamente el mismo JSON.
+
+Uso:
+    python scripts/benchmark_lectura_activos.py
+    python scripts/benchmark_lectura_activos.py --filas 1000 --repeticiones 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import django
+
+# Configurar Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from core.views import ActivoViewSet
+from core.serializers import (
+    ActivoSerializer,
+    ACTIVO_CAMPOS_LECTURA_RAPIDA,
+    serializar_activos_rapido
+)
+
+
+def ruta_serializer(queryset):
+    """Ruta actual: instancia modelos y serializers anidados."""
+    return ActivoSerializer(list(queryset), many=True).data
+
+
+def ruta_rapida(queryset):
+    """Ruta rápida: proyección .values() + armado directo de diccionarios."""
+    return serializar_activos_rapido(queryset.values(*ACTIVO_CAMPOS_LECTURA_RAPIDA))
+
+
+def medir(nombre, funcion, queryset, repeticiones):
+    """Ejecuta la función varias veces y retorna (mejor_tiempo, filas)."""
+    mejor = None
+    filas = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        datos = funcion(queryset)
+        duracion = time.perf_counter() - inicio
+        filas = len(datos)
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    por_segundo = filas / mejor if mejor else 0
+    print(f"   {nombre:<22} {filas:>7} filas  {mejor * 1000:>9.1f} ms  {por_segundo:>12,.0f} filas/s")
+    return mejor, filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--filas', type=int, default=1000, help='Cantidad de activos a leer (default: 1000)')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Repeticiones por ruta (default: 5)')
+    args = parser.parse_args()
+
+    queryset = ActivoViewSet.queryset.order_by('-fecha_alta')[:args.filas]
+
+    print("=" * 80)
+    print("  BENCHMARK LECTURA DE ACTIVOS")
+    print("=" * 80)
+
+    # Verificar que ambas rutas generan el mismo JSON
+    if list(ruta_serializer(queryset)) != ruta_rapida(queryset):
+        print("❌ Las rutas generan respuestas distintas")
+        sys.exit(1)
+    print("✅ Ambas rutas generan la misma respuesta\n")
+
+    tiempo_serializer, _ = medir('ActivoSerializer', ruta_serializer, queryset, args.repeticiones)
+    tiempo_rapido, _ = medir('modo=rapido', ruta_rapida, queryset, args.repeticiones)
+
+    if tiempo_rapido:
+        print(f"\n   Aceleración: {tiempo_serializer / tiempo_rapido:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark del listado de historial: HistorialMovimientoSerializer vs proyección en una pasada.
+
+Compara las filas por segundo de ambas rutas sobre el mismo queryset que usa
+HistorialMovimientoViewSet, sin pasar por HTTP, para medir solo el costo de
+lectura + serialización. Además verifica que ambas rutas produzcan
+exactamente el mismo JSON.
+
+Uso:
+    python scripts/benchmark_lectura_historial.py
+    python scripts/benchmark_lectura_historial.py --filas 1000 --repeticiones 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import django
+
+# Configurar Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from core.views import HistorialMovimientoViewSet
+from core.serializers import (
+    HistorialMovimientoSerializer,
+    HISTORIAL_CAMPOS_LECTURA_RAPIDA,
+    serializar_historial_rapido
+)
+
+
+def ruta_serializer(queryset):
+    """Ruta anterior: SerializerMethodFields + CharFields con source punteado."""
+    return HistorialMovimientoSerializer(list(queryset), many=True).data
+
+
+def ruta_proyeccion(queryset):
+    """Ruta actual del listado: proyección .values() serializada en una pasada."""
+    return serializar_historial_rapido(queryset.values(*HISTORIAL_CAMPOS_LECTURA_RAPIDA))
+
+
+def medir(nombre, funcion, queryset, repeticiones):
+    """Ejecuta la función varias veces y retorna (mejor_tiempo, filas)."""
+    mejor = None
+    filas = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        datos = funcion(queryset)
+        duracion = time.perf_counter() - inicio
+        filas = len(datos)
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    por_segundo = filas / mejor if mejor else 0
+    print(f"   {nombre:<30} {filas:>7} filas  {mejor * 1000:>9.1f} ms  {por_segundo:>12,.0f} filas/s")
+    return mejor, filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--filas', type=int, default=1000, help='Cantidad de movimientos a leer (default: 1000)')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Repeticiones por ruta (default: 5)')
+    args = parser.parse_args()
+
+    queryset = HistorialMovimientoViewSet.queryset.order_by('-fecha_movimiento')[:args.filas]
+
+    print("=" * 80)
+    print("  BENCHMARK LECTURA DE HISTORIAL DE MOVIMIENTOS")
+    print("=" * 80)
+
+    # Verificar que ambas rutas generan el mismo JSON (incluido el orden de claves)
+    esperado = json.dumps(ruta_serializer(queryset))
+    if esperado != json.dumps(ruta_proyeccion(queryset)):
+        print("❌ Las rutas generan respuestas distintas")
+        sys.exit(1)
+    print("✅ Ambas rutas generan la misma respuesta\n")
+
+    tiempo_serializer, _ = medir('HistorialMovimientoSerializer', ruta_serializer, queryset, args.repeticiones)
+    tiempo_proyeccion, _ = medir('Proyección en una pasada', ruta_proyeccion, queryset, args.repeticiones)
+
+    if tiempo_proyeccion:
+        print(f"\n   Aceleración: {tiempo_serializer / tiempo_proyeccion:.1f}x")
+
+
+if __name__ == '__main__':
+    main()